@@ -9,7 +9,8 @@ import numpy as np
 
 sys.path.insert(0, "src")
 
-from lamprop import fiber, lamina, laminate, resin
+from lamprop import cached_lamina, fiber, laminate, resin
+from lamprop.io.db import write_db
 
 
 def main():
@@ -21,7 +22,11 @@ def main():
         default="test",
         help="directory where the lamprop test files are",
     )
-    parser.add_argument("--output", default="__matdb.json")
+    parser.add_argument(
+        "--output",
+        default="__matdb.json",
+        help="output file; .npz or .parquet selects the column-wise format",
+    )
     args = parser.parse_args()
 
     lp_testdir = Path(args.lp_testdir)
@@ -48,18 +53,7 @@ def main():
 
     # check later if there should also be a loop over different ply thicknesses
     fiber_weight = 200.0
-    angles = [90, -90, 45, -45, 30, -30, 15, -15, 10, -10, 0]
     vfs = np.arange(0.50, 0.85, 0.05)
-    laminae = {}
-    for angle in angles:
-        for vf in vfs:
-            for fb in fibers:
-                for rs in resins:
-                    key = (fb, rs, fiber_weight, angle, vf)
-                    laminae[key] = lamina(
-                        fibers[fb], resins[rs], fiber_weight, angle, vf
-                    )
-
     stacks = {
         "ud": [0, 0],
         "hoop": [90, 90],
@@ -77,6 +71,7 @@ def main():
         sub["abd"] = sub["abd"].tolist()
         sub["H"] = sub["H"].tolist()
         sub["h"] = sub["h"].tolist()
+        sub["Nt"] = sub["Nt"].tolist()
         sub["C"] = sub["C"].tolist()
         sub["S"] = sub["S"].tolist()
         sub["layers"] = [vars(i) for i in sub["layers"]]
@@ -90,21 +85,26 @@ def main():
         return sub
 
     all_laminates = {}
+    columnar = Path(args.output).suffix in (".npz", ".parquet")
 
     for s in stacks:
         for vf in vfs:
             for fb in fibers:
                 for rs in resins:
                     this_stack = [
-                        laminae[(fb, rs, fiber_weight, ang, vf)] for ang in stacks[s]
+                        cached_lamina(fibers[fb], resins[rs], fiber_weight, ang, vf)
+                        for ang in stacks[s]
                     ]
                     try:
                         lam = laminate(f"{s}_{fb}_{rs}_{int(100 * vf)}", this_stack)
-                        all_laminates[lam.name] = todict(lam)
+                        all_laminates[lam.name] = lam if columnar else todict(lam)
                     except (ValueError, TypeError, ZeroDivisionError):
                         pass
 
-    Path(args.output).write_text(json.dumps(all_laminates, indent=4))
+    if columnar:
+        write_db(all_laminates.values(), args.output)
+    else:
+        Path(args.output).write_text(json.dumps(all_laminates, indent=4))
 
 
 if __name__ == "__main__":
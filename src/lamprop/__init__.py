@@ -1,8 +1,22 @@
 """Module for calculating fiber reinforced composites properties."""
 
+from importlib.metadata import PackageNotFoundError, version
+
+try:
+    __version__ = version("lamprop")
+except PackageNotFoundError:
+    # Running from a source tree that is not installed.
+    __version__ = "unknown"
+
+from .core.batch import lamina_batch, laminate_batch  # noqa: F401
+from .core.cache import cached_lamina, lamina_cache  # noqa: F401
+from .core.failure import first_ply_failure  # noqa: F401
 from .core.fiber import fiber  # noqa: F401
 from .core.lamina import lamina  # noqa: F401
 from .core.laminate import laminate  # noqa: F401
+from .core.ply import ply_material  # noqa: F401
+from .core.progressive import progressive_failure  # noqa: F401
 from .core.resin import resin  # noqa: F401
-from .io.parser import info, parse, warn  # noqa: F401
+from .core.strength import strength  # noqa: F401
+from .io.parser import info, parse, parse_file, warn  # noqa: F401
 from .io.text import text_output  # noqa: F401
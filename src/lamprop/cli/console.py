@@ -1,56 +1,237 @@
 #!/usr/bin/env python3
 """Console CLI for lamprop."""
 
+import argparse
+import os
 import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
 
+import numpy as np
 from loguru import logger
 from rich.console import Console
-from treeparse import argument, cli, command, option
+from treeparse import argument, cli, command, group, option
 
-from lamprop.io.parser import info, parse, warn
-from lamprop.io.text import text_output
+from lamprop.core.polar import principal_directions
+from lamprop.io.diskcache import ResultCache
+from lamprop.io.parser import DEFINITION_ERRORS, parse_file
+from lamprop.io.text import polar_output, text_output
+from lamprop.io.watch import Watcher
+from lamprop.sweep import load_spec, run_sweep
 
 console = Console()
 
 
-def process_files(files, *, eng, mat, fea):
+def process_files(files, *, eng, mat, fea, jobs=1, cache=None):
     """Process the files and output results."""
     logger.add(sys.stderr, level="INFO")
-    out = text_output
-    for f in files:
-        logger.info(f"processing file '{f}'")
-        laminates = parse(f)
+    results = _map_files(files, jobs, cache, eng=eng, mat=mat, fea=fea)
+    for f, warn, lines in results:
+        logger.info(f"processed file '{f}'")
         if warn:
             console.print(f'[red]Warnings for "{f}":[/red]')
             for ln in warn:
                 console.print(ln)
             console.print()
-        if not laminates:
+        if lines is None:
             console.print(f"No laminates found in '{f}'.")
             continue
-        for curlam in laminates:
-            for line in out(curlam, eng=eng, mat=mat, fea=fea):
-                console.print(line)
+        for line in lines:
+            console.print(line)
+
+
+def _file_lines(f, *, eng, mat, fea, lazy=False):
+    """Parse a file and format its laminates; this runs in the workers.
+
+    Returns the warnings and the output lines, or None instead of the lines
+    if the file has no laminates. Errors in the laminate definitions are
+    returned as warnings, so that one bad file does not stop the others.
+    """
+    try:
+        result = parse_file(f, lazy=lazy)
+        lines = [
+            line
+            for curlam in result.laminates
+            for line in text_output(curlam, eng=eng, mat=mat, fea=fea)
+        ]
+    except DEFINITION_ERRORS as e:
+        return [f"Cannot process file: {type(e).__name__}: {e}"], None
+    return result.warn, lines if result.laminates else None
+
+
+def _map_files(files, jobs, cache=None, **kwargs):
+    """Yield the name, warnings and output lines of the files in order.
+
+    With more than one job, the files are processed in a pool of that many
+    processes; at most two files per process are in progress. A jobs of
+    0 uses a process for every CPU. Files found in the cache are not
+    processed again.
+    """
+    if jobs < 0:
+        msg = "jobs must not be negative"
+        raise ValueError(msg)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        for f in files:
+            key, result = _lookup(cache, f, kwargs)
+            if result is None:
+                result = _file_lines(f, **kwargs)
+                if cache:
+                    cache.put(key, result)
+            yield f, *result
+        return
+    with _FilePool(jobs, kwargs) as pool:
+        pending = deque()
+        for k, f in enumerate(files):
+            key, result = _lookup(cache, f, kwargs)
+            if result is None:
+                pool.submit(k, f)
+            pending.append((k, f, key, result))
+            if len(pending) >= 2 * jobs:
+                yield _collect(pool, cache, *pending.popleft())
+        while pending:
+            yield _collect(pool, cache, *pending.popleft())
+
+
+def _lookup(cache, f, options):
+    """Cache key and cached result of a file; both are None without a cache."""
+    if cache is None:
+        return None, None
+    key = cache.key(f, **options)
+    return key, cache.get(key)
+
+
+def _collect(pool, cache, k, f, key, result):
+    """Result of a file, from the pool if it was not cached.
+
+    A worker that died while processing the file is a warning.
+    """
+    if result is not None:
+        return f, *result
+    try:
+        result = pool.result(k)
+    except BrokenProcessPool as e:
+        return f, [f"Cannot process file: {type(e).__name__}: {e}"], None
+    if cache:
+        cache.put(key, result)
+    return f, *result
+
+
+class _FilePool:
+    """Process files with _file_lines in a pool that survives dying workers.
+
+    When a worker dies, the pool is broken and every file in progress
+    fails. The pool is then replaced and the files are submitted again.
+    Since the file that killed the worker is not known, a file that failed
+    this way is first run on its own; only if that kills the worker too,
+    its result is the BrokenProcessPool exception.
+    """
+
+    def __init__(self, jobs: int, options: dict):
+        """Start a pool of jobs processes; options are for _file_lines."""
+        self._jobs = jobs
+        self._options = options
+        self._pool = ProcessPoolExecutor(jobs)
+        self._futures = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._pool.shutdown()
 
+    def submit(self, k: int, f: str):
+        """Start processing file f, which is number k."""
+        try:
+            future = self._start(f)
+        except BrokenProcessPool:
+            self._restart()
+            future = self._start(f)
+        self._futures[k] = (f, future)
 
-def eng_callback(files):
+    def result(self, k: int):
+        """Wait for the result of file number k."""
+        f, future = self._futures.pop(k)
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            pass
+        # Run the file on its own before the others are submitted again.
+        self._restart(resubmit=False)
+        try:
+            return self._start(f).result()
+        except BrokenProcessPool:
+            self._restart(resubmit=False)
+            raise
+        finally:
+            self._resubmit()
+
+    def _start(self, f: str):
+        """Submit file f to the pool."""
+        return self._pool.submit(_file_lines, f, **self._options)
+
+    def _restart(self, *, resubmit: bool = True):
+        """Replace a broken pool, optionally submitting the failed files again."""
+        # Waiting for the old pool ensures all its futures are finished.
+        self._pool.shutdown()
+        self._pool = ProcessPoolExecutor(self._jobs)
+        if resubmit:
+            self._resubmit()
+
+    def _resubmit(self):
+        """Submit the files that failed because the pool broke again."""
+        for k, (f, future) in self._futures.items():
+            if future.done() and isinstance(future.exception(), BrokenProcessPool):
+                self._futures[k] = (f, self._start(f))
+
+
+def non_negative_int(text: str) -> int:
+    """Convert an option value to an integer that is 0 or more."""
+    value = int(text)
+    if value < 0:
+        msg = f"{value} is negative"
+        raise argparse.ArgumentTypeError(msg)
+    return value
+
+
+def _open_cache(cache, cache_dir):
+    """The result cache if it is enabled, else None."""
+    if not (cache or cache_dir):
+        return None
+    return ResultCache(cache_dir)
+
+
+def eng_callback(files, *, jobs=1, cache=False, cache_dir=None):
     """Output engineering properties."""
-    process_files(files, eng=True, mat=False, fea=False)
+    cache = _open_cache(cache, cache_dir)
+    process_files(files, eng=True, mat=False, fea=False, jobs=jobs, cache=cache)
 
 
-def mat_callback(files):
+def mat_callback(files, *, jobs=1, cache=False, cache_dir=None):
     """Output ABD matrix and stiffness tensor."""
-    process_files(files, eng=False, mat=True, fea=False)
+    cache = _open_cache(cache, cache_dir)
+    process_files(files, eng=False, mat=True, fea=False, jobs=jobs, cache=cache)
 
 
-def fea_callback(files, output=None):
+def fea_callback(files, *, output=None, jobs=1, cache=False, cache_dir=None):
     """Output material data for FEA."""
     logger.add(sys.stderr, level="INFO")
-    out = text_output
     all_lines = []
-    for f in files:
-        logger.info(f"processing file '{f}'")
-        laminates = parse(f)
+    # FEA output only needs the stiffness tensor, not the inverses.
+    results = _map_files(
+        files,
+        jobs,
+        _open_cache(cache, cache_dir),
+        eng=False,
+        mat=False,
+        fea=True,
+        lazy=True,
+    )
+    for f, warn, lines in results:
+        logger.info(f"processed file '{f}'")
         if warn:
             if output:
                 all_lines.extend(
@@ -61,28 +242,40 @@ def fea_callback(files, output=None):
                 for ln in warn:
                     console.print(ln)
                 console.print()
-        if not laminates:
+        if lines is None:
             if output:
                 all_lines.append(f"** No laminates found in '{f}'.")
             else:
                 console.print(f"No laminates found in '{f}'.")
             continue
-        for curlam in laminates:
-            lines = out(curlam, eng=False, mat=False, fea=True)
-            all_lines.extend(lines)
+        all_lines.extend(lines)
     if output:
-        from pathlib import Path
-
         Path(output).write_text("\n".join(all_lines) + "\n", encoding="utf-8")
     else:
         for line in all_lines:
             console.print(line)
 
 
-def tex_callback(files):
+def tex_callback(files, *, jobs=1, cache=False, cache_dir=None):
     """Generate LaTeX output."""
     console.print("LaTeX output not implemented, falling back to text.")
-    process_files(files, eng=True, mat=True, fea=True)
+    cache = _open_cache(cache, cache_dir)
+    process_files(files, eng=True, mat=True, fea=True, jobs=jobs, cache=cache)
+
+
+def cache_stats_callback(cache_dir=None):
+    """Show the location, number of entries and size of the result cache."""
+    stats = ResultCache(cache_dir).stats()
+    console.print(f"directory: {stats['directory']}")
+    console.print(f"entries: {stats['entries']}")
+    console.print(f"size: {stats['size'] / 2**20:.2f} MiB")
+    console.print(f"maximum size: {stats['max_size'] / 2**20:.2f} MiB")
+
+
+def cache_purge_callback(cache_dir=None, keep=0.0):
+    """Remove entries from the result cache."""
+    removed = ResultCache(cache_dir).purge(int(keep * 2**20))
+    console.print(f"removed {removed} entries")
 
 
 def info_callback(files):
@@ -90,24 +283,143 @@ def info_callback(files):
     logger.add(sys.stderr, level="INFO")
     for f in files:
         logger.info(f"processing file '{f}'")
-        laminates = parse(f)
-        if info and info:
+        result = parse_file(f)
+        if result.info:
             console.print(f'Information for "{f}":')
-            for ln in info:
+            for ln in result.info:
                 console.print(ln)
             console.print()
-        if warn:
+        if result.warn:
             console.print(f'[red]Warnings for "{f}":[/red]')
-            for ln in warn:
+            for ln in result.warn:
                 console.print(ln)
             console.print()
-        if not laminates:
+        if not result.laminates:
             console.print(f"No laminates found in '{f}'.")
 
 
+def polar_callback(files, step=1.0, output=None):
+    """Output the in-plane properties as a function of the direction."""
+    logger.add(sys.stderr, level="INFO")
+    all_lines = []
+    for f in files:
+        logger.info(f"processing file '{f}'")
+        result = parse_file(f)
+        for ln in result.warn:
+            logger.warning(f"{f}: {ln}")
+        if not result.laminates:
+            logger.warning(f"no laminates found in '{f}'")
+            continue
+        for curlam in result.laminates:
+            stiff, soft = principal_directions(curlam)
+            if np.isnan(stiff):
+                logger.info(f"{curlam.name}: Ex is the same in all directions")
+            else:
+                logger.info(
+                    f"{curlam.name}: largest Ex at {stiff:.1f}°, "
+                    f"smallest at {soft:.1f}°"
+                )
+            all_lines.extend(polar_output(curlam, step, header=not all_lines))
+    if output:
+        Path(output).write_text("\n".join(all_lines) + "\n", encoding="utf-8")
+    elif all_lines:
+        sys.stdout.write("\n".join(all_lines) + "\n")
+
+
+def watch_callback(files, mode="eng", interval=1.0, output=None):
+    """Output the laminates of files again whenever they change."""
+    logger.add(sys.stderr, level="INFO")
+    modes = {
+        "eng": {"eng": True, "mat": False, "fea": False},
+        "mat": {"eng": False, "mat": True, "fea": False},
+        "fea": {"eng": False, "mat": False, "fea": True},
+        "all": {"eng": True, "mat": True, "fea": True},
+    }
+    watcher = Watcher(files, **modes[mode])
+    logger.info(f"watching {len(watcher.files)} files, press Ctrl-C to stop")
+    try:
+        while True:
+            events = watcher.poll()
+            for event in events:
+                _report_event(event, lines=not output)
+            if events and output:
+                Path(output).write_text(
+                    "\n".join(watcher.lines()) + "\n", encoding="utf-8"
+                )
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
+def _report_event(event, *, lines):
+    """Show the warnings and changes of a watched file, and optionally its lines."""
+    f = event.filename
+    if event.warn:
+        console.print(f'[red]Warnings for "{f}":[/red]')
+        for ln in event.warn:
+            console.print(ln)
+        console.print()
+    for name in event.removed:
+        logger.info(f"'{f}': laminate '{name}' was removed")
+    if event.changed:
+        logger.info(f"'{f}': updated {', '.join(event.changed)}")
+    if lines:
+        for line in event.lines:
+            console.print(line)
+
+
+def sweep_callback(spec, output="-", jobs=1, chunk_size=0):
+    """Run a parameter sweep and write the results as JSON lines."""
+    logger.add(sys.stderr, level="INFO")
+    logger.info(f"processing sweep '{spec}'")
+    jobs = jobs or os.cpu_count() or 1
+    count = run_sweep(
+        load_spec(spec), output, workers=jobs, chunk_size=chunk_size or None
+    )
+    logger.info(f"wrote {count} laminates to '{output}'")
+
+
 app = cli(
     name="lamprop",
     help="Calculate the elastic properties of a fibrous composite laminate. See the manual (lamprop-manual.pdf) for more in-depth information.",
+    subgroups=[
+        group(
+            name="cache",
+            help="Inspect or empty the result cache",
+            commands=[
+                command(
+                    name="stats",
+                    help="Show the size of the result cache",
+                    callback=cache_stats_callback,
+                    options=[
+                        option(
+                            flags=["--cache-dir"],
+                            arg_type=str,
+                            help="directory of the result cache",
+                        ),
+                    ],
+                ),
+                command(
+                    name="purge",
+                    help="Remove the least recently used entries of the result cache",
+                    callback=cache_purge_callback,
+                    options=[
+                        option(
+                            flags=["--cache-dir"],
+                            arg_type=str,
+                            help="directory of the result cache",
+                        ),
+                        option(
+                            flags=["--keep"],
+                            arg_type=float,
+                            default=0.0,
+                            help="MiB of entries to keep, none by default",
+                        ),
+                    ],
+                ),
+            ],
+        ),
+    ],
     commands=[
         command(
             name="eng",
@@ -121,6 +433,24 @@ app = cli(
                     help="one or more files to process",
                 )
             ],
+            options=[
+                option(
+                    flags=["--jobs"],
+                    arg_type=non_negative_int,
+                    default=1,
+                    help="number of worker processes, 0 for one per CPU",
+                ),
+                option(
+                    flags=["--cache"],
+                    flag=True,
+                    help="reuse the output of unchanged files from the result cache",
+                ),
+                option(
+                    flags=["--cache-dir"],
+                    arg_type=str,
+                    help="directory of the result cache; implies --cache",
+                ),
+            ],
         ),
         command(
             name="mat",
@@ -134,6 +464,24 @@ app = cli(
                     help="one or more files to process",
                 )
             ],
+            options=[
+                option(
+                    flags=["--jobs"],
+                    arg_type=non_negative_int,
+                    default=1,
+                    help="number of worker processes, 0 for one per CPU",
+                ),
+                option(
+                    flags=["--cache"],
+                    flag=True,
+                    help="reuse the output of unchanged files from the result cache",
+                ),
+                option(
+                    flags=["--cache-dir"],
+                    arg_type=str,
+                    help="directory of the result cache; implies --cache",
+                ),
+            ],
         ),
         command(
             name="fea",
@@ -153,6 +501,22 @@ app = cli(
                     arg_type=str,
                     help="output file for FEA data",
                 ),
+                option(
+                    flags=["--jobs"],
+                    arg_type=non_negative_int,
+                    default=1,
+                    help="number of worker processes, 0 for one per CPU",
+                ),
+                option(
+                    flags=["--cache"],
+                    flag=True,
+                    help="reuse the output of unchanged files from the result cache",
+                ),
+                option(
+                    flags=["--cache-dir"],
+                    arg_type=str,
+                    help="directory of the result cache; implies --cache",
+                ),
             ],
         ),
         command(
@@ -167,6 +531,115 @@ app = cli(
                     help="one or more files to process",
                 )
             ],
+            options=[
+                option(
+                    flags=["--jobs"],
+                    arg_type=non_negative_int,
+                    default=1,
+                    help="number of worker processes, 0 for one per CPU",
+                ),
+                option(
+                    flags=["--cache"],
+                    flag=True,
+                    help="reuse the output of unchanged files from the result cache",
+                ),
+                option(
+                    flags=["--cache-dir"],
+                    arg_type=str,
+                    help="directory of the result cache; implies --cache",
+                ),
+            ],
+        ),
+        command(
+            name="polar",
+            help="Output the in-plane properties in every direction as CSV",
+            callback=polar_callback,
+            arguments=[
+                argument(
+                    name="files",
+                    nargs="+",
+                    arg_type=str,
+                    help="one or more files to process",
+                )
+            ],
+            options=[
+                option(
+                    flags=["--step", "-s"],
+                    arg_type=float,
+                    default=1.0,
+                    help="angle between the directions in degrees",
+                ),
+                option(
+                    flags=["--output", "-o"],
+                    arg_type=str,
+                    help="output file for the CSV data",
+                ),
+            ],
+        ),
+        command(
+            name="watch",
+            help="Output the laminates of files again whenever they change",
+            callback=watch_callback,
+            arguments=[
+                argument(
+                    name="files",
+                    nargs="+",
+                    arg_type=str,
+                    help="one or more files to watch",
+                )
+            ],
+            options=[
+                option(
+                    flags=["--mode", "-m"],
+                    arg_type=str,
+                    default="eng",
+                    choices=["eng", "mat", "fea", "all"],
+                    help="which output to produce",
+                ),
+                option(
+                    flags=["--interval", "-i"],
+                    arg_type=float,
+                    default=1.0,
+                    help="seconds between checks of the files",
+                ),
+                option(
+                    flags=["--output", "-o"],
+                    arg_type=str,
+                    help="file that is rewritten with all output after a change",
+                ),
+            ],
+        ),
+        command(
+            name="sweep",
+            help="Calculate the properties of all laminates in a parameter sweep",
+            callback=sweep_callback,
+            arguments=[
+                argument(
+                    name="spec",
+                    arg_type=str,
+                    help="YAML file with the sweep specification",
+                )
+            ],
+            options=[
+                option(
+                    flags=["--output", "-o"],
+                    arg_type=str,
+                    default="-",
+                    help="JSON lines output file, standard output by default",
+                ),
+                option(
+                    flags=["--jobs"],
+                    arg_type=non_negative_int,
+                    default=1,
+                    help="number of worker processes, 0 for one per CPU",
+                ),
+                option(
+                    flags=["--chunk-size"],
+                    arg_type=int,
+                    default=0,
+                    help="laminates per chunk, overrides the specification",
+                ),
+            ],
         ),
         command(
             name="info",
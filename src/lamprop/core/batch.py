@@ -0,0 +1,399 @@
+"""Vectorized lamina and laminate calculations over arrays."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict
+
+from .fiber import Fiber
+from .laminate import _qmatrix, _sums
+from .resin import Resin
+from .utils import clean, tbars
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .lamina import Lamina
+
+_FIBER_FIELDS = ("E1", "nu12", "alpha1", "rho")
+_RESIN_FIELDS = ("E", "nu", "alpha", "rho")
+
+
+class LaminaBatch(BaseModel):
+    """Struct-of-arrays with the properties of N laminae.
+
+    Every field is an array of shape (N,), except C which is (N, 6, 6).
+    The names are the same as those of the Lamina fields.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    fiber_weight: np.ndarray
+    angle: np.ndarray
+    vf: np.ndarray
+    thickness: np.ndarray
+    resin_weight: np.ndarray
+    E1: np.ndarray
+    E2: np.ndarray
+    E3: np.ndarray
+    G12: np.ndarray
+    G13: np.ndarray
+    G23: np.ndarray
+    nu12: np.ndarray
+    nu13: np.ndarray
+    nu23: np.ndarray
+    alpha_x: np.ndarray
+    alpha_y: np.ndarray
+    alpha_xy: np.ndarray
+    Q11_bar: np.ndarray
+    Q12_bar: np.ndarray
+    Q16_bar: np.ndarray
+    Q22_bar: np.ndarray
+    Q26_bar: np.ndarray
+    Q66_bar: np.ndarray
+    Q44_bar_s: np.ndarray
+    Q55_bar_s: np.ndarray
+    Q45_bar_s: np.ndarray
+    rho: np.ndarray
+    C: np.ndarray
+
+    def __len__(self) -> int:
+        """Return the number of laminae."""
+        return len(self.thickness)
+
+    @classmethod
+    def from_laminae(cls, laminae: Sequence[Lamina]) -> LaminaBatch:
+        """Gather the properties of existing Lamina objects."""
+        data = {
+            name: np.array([getattr(la, name) for la in laminae], dtype=float)
+            for name in cls.model_fields
+        }
+        data["C"] = data["C"].reshape(-1, 6, 6)
+        return cls(**data)
+
+
+class LaminateBatch(BaseModel):
+    """Struct-of-arrays with the properties of N laminates.
+
+    Matrices have shape (N, 6, 6) or (N, 2, 2), all other fields are arrays
+    of shape (N,). The names are the same as those of the Laminate fields.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    thickness: np.ndarray
+    fiber_weight: np.ndarray
+    rho: np.ndarray
+    vf: np.ndarray
+    resin_weight: np.ndarray
+    ABD: np.ndarray
+    abd: np.ndarray
+    H: np.ndarray
+    h: np.ndarray
+    Ex: np.ndarray
+    Ey: np.ndarray
+    Ez: np.ndarray
+    Gxy: np.ndarray
+    Gyz: np.ndarray
+    Gxz: np.ndarray
+    nu_xy: np.ndarray
+    nu_yx: np.ndarray
+    alpha_x: np.ndarray
+    alpha_y: np.ndarray
+    wf: np.ndarray
+    C: np.ndarray
+    S: np.ndarray
+    tEx: np.ndarray
+    tEy: np.ndarray
+    tEz: np.ndarray
+    tGxy: np.ndarray
+    tGyz: np.ndarray
+    tGxz: np.ndarray
+    t_nu_xy: np.ndarray
+    t_nu_xz: np.ndarray
+    t_nu_yz: np.ndarray
+
+    def __len__(self) -> int:
+        """Return the number of laminates."""
+        return len(self.thickness)
+
+
+def lamina_batch(
+    fibers: Fiber | Sequence[Fiber],
+    resins: Resin | Sequence[Resin],
+    weights: float | np.ndarray,
+    angles: float | np.ndarray,
+    vfs: float | np.ndarray,
+) -> LaminaBatch:
+    """Create N laminae of unidirectional fibers in resin in one pass.
+
+    A single Fiber or Resin or a scalar argument is used for all laminae,
+    otherwise the arguments must have the same length N. The weights and
+    fiber volume fractions are checked like those of lamina().
+    """
+    fE1, fnu12, falpha1, frho = _material_arrays(fibers, Fiber, _FIBER_FIELDS)
+    rE, rnu, ralpha, rrho = _material_arrays(resins, Resin, _RESIN_FIELDS)
+    arrays = np.broadcast_arrays(
+        fE1, fnu12, falpha1, frho, rE, rnu, ralpha, rrho, weights, angles, vfs
+    )
+    arrays = [np.asarray(a, dtype=float).ravel() for a in arrays]
+    _check_plies(arrays[8], arrays[10])
+    return _lamina_arrays(*arrays)
+
+
+def _check_plies(weights: np.ndarray, vfs: np.ndarray):
+    """Check all fiber weights and fiber volume fractions like check_ply."""
+    bad = np.flatnonzero(~(weights > 0))
+    if len(bad):
+        msg = f"fiber weight must be > 0, not {weights[bad[0]]} (lamina {bad[0]})"
+        raise ValueError(msg)
+    bad = np.flatnonzero(~((vfs > 0) & (vfs <= 1)))
+    if len(bad):
+        msg = (
+            "fiber volume fraction must be between 0 and 1, "
+            f"not {vfs[bad[0]]} (lamina {bad[0]})"
+        )
+        raise ValueError(msg)
+
+
+def _material_arrays(materials, model, names) -> tuple[np.ndarray, ...]:
+    """Return the numerical properties of one or more materials as arrays."""
+    if isinstance(materials, model):
+        return tuple(np.float64(getattr(materials, n)) for n in names)
+    # Look up the properties only once for every distinct material object.
+    unique = {}
+    index = [unique.setdefault(id(m), (len(unique), m))[0] for m in materials]
+    table = np.array([[getattr(m, n) for n in names] for _, m in unique.values()])
+    table = table.reshape(-1, len(names))[np.asarray(index, dtype=np.intp)]
+    return tuple(table.T)
+
+
+def _micromechanics(fE1, fnu12, falpha1, frho, rE, rnu, ralpha, rrho, weight, vf):
+    """On-axis ply properties; works on scalars as well as on arrays.
+
+    The equations are the same as those in lamina().
+    """
+    vm = 1.0 - vf
+    fiber_thickness = weight / (frho * 1000)
+    thickness = fiber_thickness * (1 + vm / vf)
+    resin_weight = thickness * vm * rrho * 1000
+    E1 = vf * fE1 + rE * vm
+    xi = 1.5
+    eta = (fE1 / rE - 1) / (fE1 / rE + xi)
+    E2 = rE * ((1 + xi * eta * vf) / (1 - eta * vf))
+    nu12 = fnu12 * vf + rnu * vm
+    Gm = rE / (2 * (1 + rnu))
+    G12 = Gm * (1 + vf) / (1 - vf)
+    nu21 = nu12 * E2 / E1
+    Kf = fE1 / (3 * (1 - 2 * fnu12))
+    Km = rE / (3 * (1 - 2 * rnu))
+    K = 1 / (vf / Kf + vm / Km)
+    nu23 = 1 - nu21 - E2 / (3 * K)
+    G23 = E2 / (2 * (1 + nu23))
+    alpha1 = (falpha1 * fE1 * vf + ralpha * rE * vm) / E1
+    alpha2 = vf * ralpha
+    rho = frho * vf + rrho * vm
+    return {
+        "thickness": thickness,
+        "resin_weight": resin_weight,
+        "E1": E1,
+        "E2": E2,
+        "G12": G12,
+        "G23": G23,
+        "nu12": nu12,
+        "nu21": nu21,
+        "nu23": nu23,
+        "alpha1": alpha1,
+        "alpha2": alpha2,
+        "rho": rho,
+    }
+
+
+def _onaxis_C(E1, E2, G12, G23, nu12, nu23) -> np.ndarray:
+    """On-axis 3D stiffness matrices, shape (N, 6, 6)."""
+    E1, E2, G12, G23, nu12, nu23 = np.broadcast_arrays(E1, E2, G12, G23, nu12, nu23)
+    Sn = np.empty((*E1.shape, 3, 3))
+    Sn[..., 0, 0] = 1 / E1
+    Sn[..., 0, 1] = Sn[..., 1, 0] = -nu12 / E1
+    Sn[..., 0, 2] = Sn[..., 2, 0] = -nu12 / E1
+    Sn[..., 1, 1] = Sn[..., 2, 2] = 1 / E2
+    Sn[..., 1, 2] = Sn[..., 2, 1] = -nu23 / E2
+    Cp = np.zeros((*E1.shape, 6, 6))
+    Cp[..., :3, :3] = np.linalg.inv(Sn)
+    Cp[..., 3, 3] = G23
+    Cp[..., 4, 4] = G12
+    Cp[..., 5, 5] = G12
+    return Cp
+
+
+def _lamina_arrays(
+    fE1, fnu12, falpha1, frho, rE, rnu, ralpha, rrho, weight, angle, vf
+) -> LaminaBatch:
+    """Create a LaminaBatch from flat arrays of equal length."""
+    p = _micromechanics(fE1, fnu12, falpha1, frho, rE, rnu, ralpha, rrho, weight, vf)
+    E1, E2, G12, G23 = p["E1"], p["E2"], p["G12"], p["G23"]
+    nu12, nu21, nu23 = p["nu12"], p["nu21"], p["nu23"]
+    alpha1, alpha2 = p["alpha1"], p["alpha2"]
+    Cp = _onaxis_C(E1, E2, G12, G23, nu12, nu23)
+    T = tbars(angle)
+    C = np.matmul(np.matmul(np.swapaxes(T, -1, -2), Cp), T)
+    a = np.radians(angle)
+    m, n = np.cos(a), np.sin(a)
+    m2 = m * m
+    m3, m4 = m2 * m, m2 * m2
+    n2 = n * n
+    n3, n4 = n2 * n, n2 * n2
+    denum = 1 - nu12 * nu21
+    Q11, Q12 = E1 / denum, nu12 * E2 / denum
+    Q22, Q66 = E2 / denum, G12
+    QA = Q11 - Q12 - 2 * Q66
+    QB = Q12 - Q22 + 2 * Q66
+    Q44_bar_s = G23 * m2 + G12 * n2
+    Q55_bar_s = G23 * n2 + G12 * m2
+    return LaminaBatch(
+        fiber_weight=weight,
+        angle=angle,
+        vf=vf,
+        thickness=p["thickness"],
+        resin_weight=p["resin_weight"],
+        E1=E1,
+        E2=E2,
+        E3=E2,
+        G12=G12,
+        G13=G12,
+        G23=G23,
+        nu12=nu12,
+        nu13=nu12,
+        nu23=nu23,
+        alpha_x=alpha1 * m2 + alpha2 * n2,
+        alpha_y=alpha1 * n2 + alpha2 * m2,
+        alpha_xy=2 * (alpha1 - alpha2) * m * n,
+        Q11_bar=Q11 * m4 + 2 * (Q12 + 2 * Q66) * n2 * m2 + Q22 * n4,
+        Q12_bar=(Q11 + Q22 - 4 * Q66) * n2 * m2 + Q12 * (n4 + m4),
+        Q16_bar=QA * n * m3 + QB * n3 * m,
+        Q22_bar=Q11 * n4 + 2 * (Q12 + 2 * Q66) * n2 * m2 + Q22 * m4,
+        Q26_bar=QA * n3 * m + QB * n * m3,
+        Q66_bar=(Q11 + Q22 - 2 * Q12 - 2 * Q66) * n2 * m2 + Q66 * (n4 + m4),
+        Q44_bar_s=Q44_bar_s,
+        Q55_bar_s=Q55_bar_s,
+        Q45_bar_s=(Q55_bar_s - Q44_bar_s) * n * m,
+        rho=p["rho"],
+        C=C,
+    )
+
+
+def laminate_batch(
+    plies: LaminaBatch, stacks: Sequence[Sequence[int]] | np.ndarray
+) -> LaminateBatch:
+    """Create N laminates in one pass.
+
+    Arguments:
+        plies: the laminae that the laminates are made of.
+        stacks: for every laminate the indices into plies from bottom to top.
+            This is either a sequence of sequences of different length or an
+            (N, L) integer array padded with -1.
+
+    Raises ValueError if there are no stacks or if a stack has no plies.
+    """
+    index = _padded_index(stacks)
+    valid = index >= 0
+    if not len(index):
+        msg = "no laminates to create"
+        raise ValueError(msg)
+    empty = np.flatnonzero(~np.any(valid, axis=1))
+    if len(empty):
+        msg = f"stack {empty[0]} has no plies"
+        raise ValueError(msg)
+    index = np.where(valid, index, 0)
+    t = np.where(valid, plies.thickness[index], 0.0)
+    table = {
+        "t": t,
+        "E3": np.where(valid, plies.E3[index], 1.0),
+        "Q": _qmatrix(
+            plies.Q11_bar[index],
+            plies.Q12_bar[index],
+            plies.Q16_bar[index],
+            plies.Q22_bar[index],
+            plies.Q26_bar[index],
+            plies.Q66_bar[index],
+        ),
+        "Qs": np.stack(
+            (
+                np.stack((plies.Q44_bar_s[index], plies.Q45_bar_s[index]), axis=-1),
+                np.stack((plies.Q45_bar_s[index], plies.Q55_bar_s[index]), axis=-1),
+            ),
+            axis=-2,
+        ),
+        "alpha": np.stack(
+            (plies.alpha_x[index], plies.alpha_y[index], plies.alpha_xy[index]),
+            axis=-1,
+        ),
+        "C": plies.C[index],
+    }
+    thickness = np.sum(t, axis=-1)
+    fiber_weight = np.sum(np.where(valid, plies.fiber_weight[index], 0.0), axis=-1)
+    resin_weight = np.sum(np.where(valid, plies.resin_weight[index], 0.0), axis=-1)
+    rho = np.sum(t * plies.rho[index], axis=-1) / thickness
+    vf = np.sum(t * plies.vf[index], axis=-1) / thickness
+    ABD, H, Nt, C, c3 = _sums(table)
+    C = clean(C)
+    S = np.linalg.inv(C)
+    ABD = clean(ABD)
+    H = clean(H)
+    abd = np.linalg.inv(ABD)
+    h = np.linalg.inv(H)
+    # The ratios of determinants of minors that laminate() uses are
+    # expressed here in terms of the terms of the inverse.
+    alpha = np.einsum("...ij,...j->...i", abd[:, :3, :3], Nt)
+    return LaminateBatch(
+        thickness=thickness,
+        fiber_weight=fiber_weight,
+        rho=rho,
+        vf=vf,
+        resin_weight=resin_weight,
+        ABD=ABD,
+        abd=abd,
+        H=H,
+        h=h,
+        Ex=1 / (abd[:, 0, 0] * thickness),
+        Ey=1 / (abd[:, 1, 1] * thickness),
+        Ez=thickness / c3,
+        Gxy=1 / (abd[:, 2, 2] * thickness),
+        Gyz=H[:, 0, 0] / thickness,
+        Gxz=H[:, 1, 1] / thickness,
+        nu_xy=-abd[:, 0, 1] / abd[:, 0, 0],
+        nu_yx=-abd[:, 1, 0] / abd[:, 1, 1],
+        alpha_x=alpha[:, 0],
+        alpha_y=alpha[:, 1],
+        wf=fiber_weight / (fiber_weight + resin_weight),
+        C=C,
+        S=S,
+        tEx=1 / S[:, 0, 0],
+        tEy=1 / S[:, 1, 1],
+        tEz=1 / S[:, 2, 2],
+        tGxy=1 / S[:, 5, 5],
+        tGyz=1 / S[:, 3, 3],
+        tGxz=1 / S[:, 4, 4],
+        t_nu_xy=-S[:, 1, 0] / S[:, 0, 0],
+        t_nu_xz=-S[:, 2, 0] / S[:, 0, 0],
+        t_nu_yz=-S[:, 2, 1] / S[:, 1, 1],
+    )
+
+
+def _padded_index(stacks) -> np.ndarray:
+    """Convert ragged stacks of ply indices into an (N, L) array padded with -1."""
+    if isinstance(stacks, np.ndarray):
+        if not stacks.size:
+            return np.empty((len(stacks), 0), dtype=np.intp)
+        return stacks.astype(np.intp).reshape(len(stacks), -1)
+    lengths = np.array([len(s) for s in stacks], dtype=np.intp)
+    if not len(lengths):
+        return np.empty((0, 0), dtype=np.intp)
+    flat = np.concatenate([np.asarray(s, dtype=np.intp) for s in stacks])
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    cols = np.arange(len(flat)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    rv = np.full((len(lengths), lengths.max(initial=0)), -1, dtype=np.intp)
+    rv[rows, cols] = flat
+    return rv
@@ -0,0 +1,132 @@
+"""Bounded LRU cache for lamina creation."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel
+
+from .lamina import Lamina, lamina
+
+if TYPE_CHECKING:
+    from .fiber import Fiber
+    from .resin import Resin
+
+
+class LaminaCache:
+    """Least-recently-used cache of Lamina objects.
+
+    Laminae are keyed on the contents of the fiber and resin and on the
+    fiber weight, angle and fiber volume fraction. So two equal fibers that
+    are different objects share the same cache entries.
+
+    Every caller gets the same Lamina object for equal arguments; Lamina
+    is frozen, so one caller cannot change the laminae of another.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        """Create an empty cache holding at most maxsize laminae."""
+        self._data: OrderedDict[tuple, Lamina] = OrderedDict()
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        """Maximum number of laminae in the cache."""
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value: int):
+        with self._lock:
+            self._maxsize = value
+            self._evict()
+
+    def __len__(self) -> int:
+        """Return the number of cached laminae."""
+        return len(self._data)
+
+    def lamina(
+        self, fiber: Fiber, resin: Resin, fiber_weight: float, angle: float, vf: float
+    ) -> Lamina:
+        """Return a cached Lamina, creating it if necessary."""
+        key = (
+            content_key(fiber),
+            content_key(resin),
+            float(fiber_weight),
+            float(angle),
+            float(vf),
+        )
+        with self._lock:
+            rv = self._data.get(key)
+            if rv is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return rv
+            self.misses += 1
+        rv = lamina(fiber, resin, fiber_weight, angle, vf)
+        if self._maxsize > 0:
+            with self._lock:
+                self._data[key] = rv
+                self._evict()
+        return rv
+
+    def clear(self):
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict[str, int]:
+        """Return the cache statistics."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "maxsize": self._maxsize,
+        }
+
+    def _evict(self):
+        """Remove the least recently used entries beyond maxsize."""
+        while len(self._data) > max(self._maxsize, 0):
+            self._data.popitem(last=False)
+
+
+def content_key(model: BaseModel) -> tuple:
+    """Hashable representation of the contents of a material.
+
+    This is the tuple of the field values; nested models, lists and
+    dictionaries, like strengths and temperature tables, are converted to
+    tuples as well.
+    """
+    values = tuple(model.__dict__.values())
+    try:
+        hash(values)
+    except TypeError:
+        values = tuple(_hashable(v) for v in values)
+    return (type(model).__name__, values)
+
+
+def _hashable(value):
+    """Convert models, lists and dictionaries to nested tuples."""
+    if isinstance(value, BaseModel):
+        return content_key(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _hashable(v)) for k, v in value.items()))
+    return value
+
+
+lamina_cache = LaminaCache()
+
+
+def cached_lamina(
+    fiber: Fiber, resin: Resin, fiber_weight: float, angle: float, vf: float
+) -> Lamina:
+    """Create a Lamina using the process-wide cache."""
+    return lamina_cache.lamina(fiber, resin, fiber_weight, angle, vf)
@@ -0,0 +1,273 @@
+"""First ply failure for many load cases."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Literal
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict
+
+from .lamina import Lamina
+from .strength import Strength
+from .stress import ply_response
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .laminate import Laminate
+
+Criterion = Literal["max_stress", "max_strain", "tsai_wu", "hashin"]
+
+
+class FailureResult(BaseModel):
+    """First ply failure of a laminate for n_cases load cases.
+
+    The reserve factor is the factor by which the mechanical loads can be
+    multiplied before a ply fails; thermal stresses are not scaled. The
+    failure index is its inverse. Both have the shape (n_cases, n_plies)
+    and are the worst of the bottom and top of every ply.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    criterion: Criterion
+    reserve: np.ndarray
+    index: np.ndarray
+    critical_ply: np.ndarray
+    min_reserve: np.ndarray
+
+
+def first_ply_failure(
+    lam: Laminate,
+    loads: np.ndarray,
+    criterion: Criterion = "tsai_wu",
+    dT: float | np.ndarray = 0.0,
+    strengths: Strength | Sequence[Strength] | None = None,
+) -> FailureResult:
+    """Calculate the reserve factors of all plies for the given load cases.
+
+    Arguments:
+        lam: the laminate.
+        loads: (n_cases, 6) array of force and moment resultants
+            Nx, Ny, Nxy [N/mm] and Mx, My, Mxy [N·mm/mm].
+        criterion: max_stress, max_strain, tsai_wu or hashin.
+        dT: temperature difference [K], a scalar or one per load case.
+        strengths: the strength of all plies, or one per ply. By default
+            the strength of the fiber of every ply is used.
+    """
+    loads = np.atleast_2d(np.asarray(loads, dtype=float))
+    layers = [la for la in lam.layers if isinstance(la, Lamina)]
+    allow = ply_strengths(layers, strengths)
+    s = ply_response(lam, loads).stress12
+    dT = np.broadcast_to(np.asarray(dT, dtype=float), loads.shape[:1])
+    if np.any(dT):
+        s0 = ply_response(lam, np.zeros_like(loads), dT).stress12
+    else:
+        s0 = np.zeros_like(s)
+    if criterion == "max_strain":
+        s, s0 = _mechanical_strain(layers, s), _mechanical_strain(layers, s0)
+    reserve = ply_reserve(criterion, s, s0, allow).min(axis=-1)
+    critical = np.argmin(reserve, axis=1)
+    with np.errstate(divide="ignore"):
+        index = 1 / reserve
+    return FailureResult(
+        criterion=criterion,
+        reserve=reserve,
+        index=index,
+        critical_ply=critical,
+        min_reserve=np.take_along_axis(reserve, critical[:, None], axis=1)[:, 0],
+    )
+
+
+def ply_strengths(
+    layers: list[Lamina], strengths: Strength | Sequence[Strength] | None = None
+) -> dict[str, np.ndarray]:
+    """Strength allowables as arrays with one value per ply.
+
+    For the max strain criterion, the strain allowables are derived from
+    the strengths and the ply moduli; e1t, e1c, e2t, e2c and g12.
+    """
+    if strengths is None:
+        strengths = [la.fiber.strength for la in layers]
+    elif isinstance(strengths, Strength):
+        strengths = [strengths] * len(layers)
+    if len(strengths) != len(layers):
+        msg = f"{len(strengths)} strengths given for {len(layers)} plies"
+        raise ValueError(msg)
+    for k, (s, la) in enumerate(zip(strengths, layers)):
+        if s is None:
+            msg = f"no strength for ply {k} with fiber '{la.fiber.name}'"
+            raise ValueError(msg)
+    rv = {
+        name: np.array([getattr(s, name) for s in strengths])
+        for name in ("Xt", "Xc", "Yt", "Yc", "S")
+    }
+    rv["S23"] = np.array([s.S if s.S23 is None else s.S23 for s in strengths])
+    E1 = np.array([la.E1 for la in layers])
+    E2 = np.array([la.E2 for la in layers])
+    G12 = np.array([la.G12 for la in layers])
+    rv.update(
+        e1t=rv["Xt"] / E1,
+        e1c=rv["Xc"] / E1,
+        e2t=rv["Yt"] / E2,
+        e2c=rv["Yc"] / E2,
+        g12=rv["S"] / G12,
+    )
+    return rv
+
+
+def ply_reserve(
+    criterion: Criterion, s: np.ndarray, s0: np.ndarray, allow: dict[str, np.ndarray]
+) -> np.ndarray:
+    """Load factors at which the criterion is reached.
+
+    Arguments:
+        criterion: max_stress, max_strain, tsai_wu or hashin.
+        s: (..., n_plies, n, 3) mechanical stresses in material axes, or
+            for max_strain the mechanical strains.
+        s0: stresses or strains of the same shape that are not scaled.
+        allow: allowables from ply_strengths.
+
+    Returns:
+        The load factors, shape (..., n_plies, n).
+    """
+    try:
+        terms = _CRITERIA[criterion]
+    except KeyError:
+        msg = f"unknown failure criterion '{criterion}'"
+        raise ValueError(msg) from None
+    reserve = np.full(s.shape[:-1], np.inf)
+    for a, b, c in terms(s, s0, allow):
+        np.minimum(reserve, _load_factor(a, b, c), out=reserve)
+    return reserve
+
+
+def _mechanical_strain(layers: list[Lamina], s: np.ndarray) -> np.ndarray:
+    """Strains in material axes caused by the stresses s, (c, p, 2, 3)."""
+    E1 = np.array([la.E1 for la in layers])[:, None]
+    E2 = np.array([la.E2 for la in layers])[:, None]
+    nu12 = np.array([la.nu12 for la in layers])[:, None]
+    G12 = np.array([la.G12 for la in layers])[:, None]
+    s1, s2, t12 = s[..., 0], s[..., 1], s[..., 2]
+    return np.stack(
+        (s1 / E1 - nu12 * s2 / E1, s2 / E2 - nu12 * s1 / E1, t12 / G12), axis=-1
+    )
+
+
+def _load_factor(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """Smallest R >= 0 with a·R² + b·R + c = 1, or inf if there is none.
+
+    The criteria are written such that a >= 0. The root is calculated in
+    the form that is stable for a = 0.
+    """
+    c1 = c - 1
+    root = np.sqrt(np.maximum(b * b - 4 * a * c1, 0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rv = np.where(b + root > 0, -2 * c1 / (b + root), np.inf)
+    return np.where(c1 >= 0, 0.0, rv)
+
+
+def _tension(s: np.ndarray, s0: np.ndarray) -> np.ndarray:
+    """Whether a component is tensile at failure.
+
+    This is decided by the scaled mechanical stress, or by the thermal
+    stress if there is no mechanical stress.
+    """
+    return np.where(s != 0, s > 0, s0 >= 0)
+
+
+def _linear(s, s0, tension, compression):
+    """Terms of |s0 + R·s| / allowable, with allowables per sign."""
+    t = _tension(s, s0)
+    sign = np.where(t, 1.0, -1.0)
+    allowable = np.where(t, tension, compression)
+    return np.zeros_like(s), sign * s / allowable, sign * s0 / allowable
+
+
+def _max_stress(s, s0, allow):
+    """Maximum stress criterion; every component separately."""
+    X = [allow[name][:, None] for name in ("Xt", "Xc", "Yt", "Yc", "S")]
+    return (
+        _linear(s[..., 0], s0[..., 0], X[0], X[1]),
+        _linear(s[..., 1], s0[..., 1], X[2], X[3]),
+        _linear(s[..., 2], s0[..., 2], X[4], X[4]),
+    )
+
+
+def _max_strain(e, e0, allow):
+    """Maximum strain criterion; every component separately."""
+    X = [allow[name][:, None] for name in ("e1t", "e1c", "e2t", "e2c", "g12")]
+    return (
+        _linear(e[..., 0], e0[..., 0], X[0], X[1]),
+        _linear(e[..., 1], e0[..., 1], X[2], X[3]),
+        _linear(e[..., 2], e0[..., 2], X[4], X[4]),
+    )
+
+
+def _tsai_wu(s, s0, allow):
+    """Tsai-Wu criterion with F12 = -½√(F11·F22)."""
+    Xt, Xc, Yt, Yc, S = (allow[name] for name in ("Xt", "Xc", "Yt", "Yc", "S"))
+    F = np.stack((1 / Xt - 1 / Xc, 1 / Yt - 1 / Yc, np.zeros_like(Xt)), axis=-1)
+    F11, F22 = 1 / (Xt * Xc), 1 / (Yt * Yc)
+    F12 = -0.5 * np.sqrt(F11 * F22)
+    zero = np.zeros_like(Xt)
+    Fij = np.stack(
+        (
+            np.stack((F11, F12, zero), axis=-1),
+            np.stack((F12, F22, zero), axis=-1),
+            np.stack((zero, zero, 1 / (S * S)), axis=-1),
+        ),
+        axis=-2,
+    )
+    Fs = np.einsum("pij,...psj->...psi", Fij, s, optimize=True)
+    Fs0 = np.einsum("pij,...psj->...psi", Fij, s0, optimize=True)
+    Fl = F[:, None, :]
+    a = np.sum(s * Fs, axis=-1)
+    b = np.sum(Fl * s, axis=-1) + 2 * np.sum(s0 * Fs, axis=-1)
+    c = np.sum(Fl * s0, axis=-1) + np.sum(s0 * Fs0, axis=-1)
+    return ((a, b, c),)
+
+
+def _quadratic(s, s0, allowable):
+    """Terms of ((s0 + R·s) / allowable)²."""
+    return s * s / allowable**2, 2 * s * s0 / allowable**2, s0 * s0 / allowable**2
+
+
+def _hashin(s, s0, allow):
+    """Hashin's plane stress criterion; the fiber and matrix modes.
+
+    The tension or compression mode is chosen by the sign of the normal
+    stress at failure. The terms of a mode that does not apply are set to
+    zero, which makes its load factor infinite.
+    """
+    Xt, Xc, Yt, Yc, S, S23 = (
+        allow[name][:, None] for name in ("Xt", "Xc", "Yt", "Yc", "S", "S23")
+    )
+    s1, s2, t12 = (s[..., k] for k in range(3))
+    r1, r2, r12 = (s0[..., k] for k in range(3))
+    shear = _quadratic(t12, r12, S)
+    k = ((Yc / (2 * S23)) ** 2 - 1) / Yc
+    matrix_c = _quadratic(s2, r2, 2 * S23)
+    matrix_c = (
+        matrix_c[0] + shear[0],
+        matrix_c[1] + k * s2 + shear[1],
+        matrix_c[2] + k * r2 + shear[2],
+    )
+    fiber_t = tuple(u + v for u, v in zip(_quadratic(s1, r1, Xt), shear))
+    matrix_t = tuple(u + v for u, v in zip(_quadratic(s2, r2, Yt), shear))
+    t1, t2 = _tension(s1, r1), _tension(s2, r2)
+    modes = (
+        (t1, fiber_t),
+        (~t1, _quadratic(s1, r1, Xc)),
+        (t2, matrix_t),
+        (~t2, matrix_c),
+    )
+    return tuple(tuple(np.where(on, u, 0.0) for u in terms) for on, terms in modes)
+
+
+_CRITERIA = {
+    "max_stress": _max_stress,
+    "max_strain": _max_strain,
+    "tsai_wu": _tsai_wu,
+    "hashin": _hashin,
+}
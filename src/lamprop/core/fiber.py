@@ -1,6 +1,13 @@
 """Fiber model and creation function."""
 
-from pydantic import BaseModel, Field
+from __future__ import annotations
+
+from typing import Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+from .strength import Strength
+from .temperature import TemperatureTable, check_table
 
 
 class Fiber(BaseModel):
@@ -11,8 +18,35 @@ class Fiber(BaseModel):
     alpha1: float = Field(..., description="Coefficient of thermal expansion in K^-1")
     rho: float = Field(..., gt=0, description="Fiber density in g/cm^3")
     name: str = Field(..., min_length=1, description="Name of the fiber")
+    strength: Optional[Strength] = Field(
+        None, description="Strength allowables of plies made with this fiber"
+    )
+    temperature: Optional[TemperatureTable] = Field(
+        None, description="Values of E1, nu12 and alpha1 at other temperatures"
+    )
+
+    @field_validator("temperature")
+    @classmethod
+    def _check_temperature(cls, value):
+        return check_table(value, ("E1", "nu12", "alpha1"), "fiber")
 
 
-def fiber(E1: float, nu12: float, alpha1: float, rho: float, name: str) -> Fiber:
+def fiber(
+    E1: float,
+    nu12: float,
+    alpha1: float,
+    rho: float,
+    name: str,
+    strength: Strength | None = None,
+    temperature: TemperatureTable | dict | None = None,
+) -> Fiber:
     """Create a Fiber instance."""
-    return Fiber(E1=E1, nu12=nu12, alpha1=alpha1, rho=rho, name=name)
+    return Fiber(
+        E1=E1,
+        nu12=nu12,
+        alpha1=alpha1,
+        rho=rho,
+        name=name,
+        strength=strength,
+        temperature=temperature,
+    )
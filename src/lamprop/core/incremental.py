@@ -0,0 +1,236 @@
+"""Laminate that can be changed one ply at a time."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .laminate import Laminate, _finish, _qmatrix
+
+if TYPE_CHECKING:
+    from .lamina import Lamina
+
+# For every term of ABD the moment and stiffness term it is made of. The
+# terms are numbered Q11, Q12, Q16, Q22, Q26, Q66.
+_ABD_TERM = np.tile([[0, 1, 2], [1, 3, 4], [2, 4, 5]], (2, 2))
+_ABD_MOMENT = np.repeat(np.repeat([[0, 1], [1, 2]], 3, axis=0), 3, axis=1)
+
+
+class LaminateBuilder:
+    """Mutable laminate for optimizer inner loops.
+
+    The ply contributions are kept as running sums of moments about the
+    bottom of the laminate. Inserting, removing or replacing a ply updates
+    those sums with the change instead of summing all plies again. Only the
+    plies above a changed ply need their position shifted, which is one
+    array operation. Moving the moments to the mid-plane and deriving the
+    laminate properties is done on demand.
+
+    Adding and subtracting contributions accumulates rounding errors, so
+    the sums are calculated again from the plies every resum_interval
+    changes, or when resum() is called.
+    """
+
+    # Number of stiffness terms that are integrated over the thickness with
+    # moments 0, 1 and 2, and of the terms that only need the zeroth moment.
+    _NQ = 9
+    _NG = 44
+    # Number of plies whose data is remembered for inserting them again.
+    _MEMO_SIZE = 64
+    resum_interval = 1000
+
+    def __init__(self, layers: list[Lamina] | None = None):
+        """Create a builder, optionally starting with the given layers."""
+        self._layers: list[Lamina] = []
+        self._t = np.zeros(0)
+        self._z = np.zeros(0)
+        self._q = np.zeros((0, self._NQ))
+        self._gp = np.zeros((0, self._NG))
+        self._m = np.zeros((3, self._NQ))
+        self._g = np.zeros(self._NG)
+        self._result = None
+        self._memo = {}
+        self._changes = 0
+        for la in layers or []:
+            self.append(la)
+
+    def __len__(self) -> int:
+        """Return the number of plies."""
+        return len(self._layers)
+
+    @property
+    def layers(self) -> list[Lamina]:
+        """The plies from bottom to top."""
+        return list(self._layers)
+
+    @property
+    def thickness(self) -> float:
+        """Thickness of the laminate in mm."""
+        return float(np.sum(self._t))
+
+    def append(self, la: Lamina):
+        """Add a ply on top of the laminate."""
+        self.insert(len(self._layers), la)
+
+    def insert(self, index: int, la: Lamina):
+        """Insert a ply before position index, counting from the bottom."""
+        index = range(len(self._layers) + 1)[index]
+        q, g, t = self._ply_data(la)
+        z = self._z[index] if index < len(self._layers) else self.thickness
+        self._shift(index, t)
+        self._layers.insert(index, la)
+        self._t = np.insert(self._t, index, t)
+        self._z = np.insert(self._z, index, z)
+        self._q = np.insert(self._q, index, q, axis=0)
+        self._gp = np.insert(self._gp, index, g, axis=0)
+        self._add(q, g, z, t, 1.0)
+        self._changed()
+
+    def remove(self, index: int) -> Lamina:
+        """Remove the ply at position index and return it."""
+        index = range(len(self._layers))[index]
+        la = self._layers.pop(index)
+        t = self._t[index]
+        self._add(self._q[index], self._gp[index], self._z[index], t, -1.0)
+        self._t = np.delete(self._t, index)
+        self._z = np.delete(self._z, index)
+        self._q = np.delete(self._q, index, axis=0)
+        self._gp = np.delete(self._gp, index, axis=0)
+        self._shift(index, -t)
+        self._changed()
+        return la
+
+    def replace(self, index: int, la: Lamina) -> Lamina:
+        """Replace the ply at position index and return the old ply."""
+        index = range(len(self._layers))[index]
+        old = self._layers[index]
+        if old.thickness != la.thickness:
+            self.remove(index)
+            self.insert(index, la)
+            return old
+        z, t = self._z[index], self._t[index]
+        self._add(self._q[index], self._gp[index], z, t, -1.0)
+        q, g, _ = self._ply_data(la)
+        self._add(q, g, z, t, 1.0)
+        self._q[index] = q
+        self._gp[index] = g
+        self._layers[index] = la
+        self._changed()
+        return old
+
+    def resum(self):
+        """Calculate the positions and the sums again from the plies."""
+        t = self._t
+        self._z = np.concatenate(([0.0], np.cumsum(t)[:-1]))[: len(t)]
+        z, ze = self._z, self._z + t
+        moments = np.stack((t, (ze * ze - z * z) / 2, (ze**3 - z**3) / 3))
+        self._m = moments @ self._q
+        self._g = np.sum(self._gp, axis=0)
+        self._changes = 0
+        self._result = None
+
+    @property
+    def ABD(self) -> np.ndarray:
+        """The ABD matrix, without the cleaning of small terms."""
+        return self._sums()[1][0]
+
+    def laminate(self, name: str) -> Laminate:
+        """Return the current state as a Laminate.
+
+        The result is cached until the next change.
+        """
+        if self._result is None or self._result.name != name:
+            totals, sums = self._sums()
+            self._result = _finish(name, list(self._layers), totals, sums)
+        return self._result
+
+    def _ply_data(self, la: Lamina) -> tuple[np.ndarray, np.ndarray, float]:
+        """Stiffness terms and thickness-weighted other terms of a ply.
+
+        These are remembered for the last few Lamina objects, since
+        optimizers tend to use the same few plies over and over.
+        """
+        entry = self._memo.get(id(la))
+        if entry is not None and entry[0] is la:
+            return entry[1:]
+        t = la.thickness
+        q = np.array(
+            (
+                la.Q11_bar,
+                la.Q12_bar,
+                la.Q16_bar,
+                la.Q22_bar,
+                la.Q26_bar,
+                la.Q66_bar,
+                la.Q44_bar_s,
+                la.Q45_bar_s,
+                la.Q55_bar_s,
+            )
+        )
+        Nt = _qmatrix(*q[:6]) @ (la.alpha_x, la.alpha_y, la.alpha_xy)
+        g = np.concatenate(
+            (
+                Nt * t,
+                la.C.ravel() * t,
+                (
+                    t / la.E3,
+                    la.fiber_weight,
+                    la.resin_weight,
+                    la.rho * t,
+                    la.vf * t,
+                ),
+            )
+        )
+        if len(self._memo) >= self._MEMO_SIZE:
+            del self._memo[next(iter(self._memo))]
+        self._memo[id(la)] = (la, q, g, t)
+        return q, g, t
+
+    def _changed(self):
+        """Count a change, and resum after resum_interval changes."""
+        self._changes += 1
+        if self._changes >= self.resum_interval:
+            self.resum()
+
+    def _add(self, q, g, z, t, sign):
+        """Add (sign=1) or subtract (sign=-1) a ply between z and z+t."""
+        ze = z + t
+        self._m += sign * np.outer((t, (ze * ze - z * z) / 2, (ze**3 - z**3) / 3), q)
+        self._g += sign * g
+        self._result = None
+
+    def _shift(self, index, dz):
+        """Move the plies from index upwards by dz."""
+        t, z, q = self._t[index:], self._z[index:], self._q[index:]
+        m0 = t @ q
+        m1 = (z * t + t * t / 2) @ q
+        self._m[1] += dz * m0
+        self._m[2] += 2 * dz * m1 + dz * dz * m0
+        self._z[index:] += dz
+        self._result = None
+
+    def _sums(self) -> tuple[tuple, tuple]:
+        """Totals and laminate sums with respect to the mid-plane."""
+        if not self._layers:
+            msg = "laminate has no plies"
+            raise ValueError(msg)
+        thickness = self.thickness
+        c = thickness / 2
+        m0, m1, m2 = self._m
+        mid = np.stack((m0, m1 - c * m0, m2 - 2 * c * m1 + c * c * m0))
+        ABD = mid[_ABD_MOMENT, _ABD_TERM]
+        s0, s2 = mid[0, 6:], mid[2, 6:]
+        sb = 5 / 4 * (s0 - 4 * s2 / thickness**2)
+        H = np.array([[sb[0], sb[1]], [sb[1], sb[2]]])
+        g = self._g
+        Nt, C = g[:3], g[3:39].reshape(6, 6) / thickness
+        c3, fiber_weight, resin_weight, rhot, vft = g[39:]
+        totals = (
+            thickness,
+            fiber_weight,
+            rhot / thickness,
+            vft / thickness,
+            resin_weight,
+        )
+        return totals, (ABD, H, Nt, C, c3)
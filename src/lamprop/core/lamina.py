@@ -11,9 +11,13 @@ from .utils import tbar
 
 
 class Lamina(BaseModel):
-    """Represents a lamina layer."""
+    """Represents a lamina layer.
 
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    Laminae are frozen, because the same object is shared by all laminates
+    made with the lamina cache.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True, frozen=True)
 
     fiber: Fiber
     resin: Resin
@@ -47,10 +51,21 @@ class Lamina(BaseModel):
     C: np.ndarray
 
 
+def check_ply(fiber_weight: float, vf: float):
+    """Check the fiber weight and fiber volume fraction of a ply."""
+    if not fiber_weight > 0:
+        msg = f"fiber weight must be > 0, not {fiber_weight}"
+        raise ValueError(msg)
+    if not 0 < vf <= 1:
+        msg = f"fiber volume fraction must be between 0 and 1, not {vf}"
+        raise ValueError(msg)
+
+
 def lamina(
     fiber: Fiber, resin: Resin, fiber_weight: float, angle: float, vf: float
 ) -> Lamina:
     """Create a Lamina of unidirectional fibers in resin."""
+    check_ply(fiber_weight, vf)
     vm = 1.0 - vf
     fiber_thickness = fiber_weight / (fiber.rho * 1000)
     thickness = fiber_thickness * (1 + vm / vf)
@@ -2,189 +2,324 @@
 
 from __future__ import annotations
 
+from functools import cached_property
+from typing import TYPE_CHECKING, List, Union
+
 import numpy as np
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, computed_field
 
 from .lamina import Lamina
 from .utils import clean
 
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .ply import PlyMaterial
+
 
 class Laminate(BaseModel):
-    """Represents a laminate."""
+    """Represents a laminate.
+
+    The properties that require inverting ABD, H or C are cached computed
+    fields. They are calculated by laminate() unless it is called with
+    lazy=True; then they are calculated on first use.
+    """
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     name: str = Field(..., min_length=1)
-    layers: list[Lamina | str]
+    layers: List[Union[Lamina, str]]
     thickness: float
     fiber_weight: float
     rho: float
     vf: float
     resin_weight: float
     ABD: np.ndarray
-    abd: np.ndarray
     H: np.ndarray
-    h: np.ndarray
-    Ex: float
-    Ey: float
+    Nt: np.ndarray = Field(..., description="Thermal force resultants per K")
     Ez: float
-    Gxy: float
     Gyz: float
     Gxz: float
-    nu_xy: float
-    nu_yx: float
-    alpha_x: float
-    alpha_y: float
     wf: float
     C: np.ndarray
-    S: np.ndarray
-    tEx: float
-    tEy: float
-    tEz: float
-    tGxy: float
-    tGyz: float
-    tGxz: float
-    t_nu_xy: float
-    t_nu_xz: float
-    t_nu_yz: float
-
-
-def laminate(name: str, layers: list[Lamina | str]) -> Laminate:
-    """Create a Laminate."""
+
+    @computed_field
+    @cached_property
+    def abd(self) -> np.ndarray:
+        """Inverse of ABD."""
+        return np.linalg.inv(self.ABD)
+
+    @computed_field
+    @cached_property
+    def h(self) -> np.ndarray:
+        """Inverse of H."""
+        return np.linalg.inv(self.H)
+
+    @computed_field
+    @cached_property
+    def S(self) -> np.ndarray:
+        """Inverse of C."""
+        return np.linalg.inv(self.C)
+
+    # The in-plane properties are ratios of determinants of minors of ABD.
+    # Those ratios are the same as the terms of abd used here.
+    @computed_field
+    @cached_property
+    def Ex(self) -> float:
+        """Young's modulus in x direction."""
+        return 1 / (self.abd[0, 0] * self.thickness)
+
+    @computed_field
+    @cached_property
+    def Ey(self) -> float:
+        """Young's modulus in y direction."""
+        return 1 / (self.abd[1, 1] * self.thickness)
+
+    @computed_field
+    @cached_property
+    def Gxy(self) -> float:
+        """In-plane shear modulus."""
+        return 1 / (self.abd[2, 2] * self.thickness)
+
+    @computed_field
+    @cached_property
+    def nu_xy(self) -> float:
+        """Poisson's ratio for load in the x direction."""
+        return -self.abd[0, 1] / self.abd[0, 0]
+
+    @computed_field
+    @cached_property
+    def nu_yx(self) -> float:
+        """Poisson's ratio for load in the y direction."""
+        return -self.abd[1, 0] / self.abd[1, 1]
+
+    @computed_field
+    @cached_property
+    def alpha_x(self) -> float:
+        """Coefficient of thermal expansion in x direction."""
+        return self.abd[0, :3] @ self.Nt
+
+    @computed_field
+    @cached_property
+    def alpha_y(self) -> float:
+        """Coefficient of thermal expansion in y direction."""
+        return self.abd[1, :3] @ self.Nt
+
+    @computed_field
+    @cached_property
+    def tEx(self) -> float:
+        """Young's modulus in x direction from the 3D stiffness."""
+        return 1 / self.S[0, 0]
+
+    @computed_field
+    @cached_property
+    def tEy(self) -> float:
+        """Young's modulus in y direction from the 3D stiffness."""
+        return 1 / self.S[1, 1]
+
+    @computed_field
+    @cached_property
+    def tEz(self) -> float:
+        """Young's modulus in z direction from the 3D stiffness."""
+        return 1 / self.S[2, 2]
+
+    @computed_field
+    @cached_property
+    def tGxy(self) -> float:
+        """Shear modulus in the xy plane from the 3D stiffness."""
+        return 1 / self.S[5, 5]
+
+    @computed_field
+    @cached_property
+    def tGyz(self) -> float:
+        """Shear modulus in the yz plane from the 3D stiffness."""
+        return 1 / self.S[3, 3]
+
+    @computed_field
+    @cached_property
+    def tGxz(self) -> float:
+        """Shear modulus in the xz plane from the 3D stiffness."""
+        return 1 / self.S[4, 4]
+
+    @computed_field
+    @cached_property
+    def t_nu_xy(self) -> float:
+        """Poisson's ratio nu_xy from the 3D stiffness."""
+        return -self.S[1, 0] / self.S[0, 0]
+
+    @computed_field
+    @cached_property
+    def t_nu_xz(self) -> float:
+        """Poisson's ratio nu_xz from the 3D stiffness."""
+        return -self.S[2, 0] / self.S[0, 0]
+
+    @computed_field
+    @cached_property
+    def t_nu_yz(self) -> float:
+        """Poisson's ratio nu_yz from the 3D stiffness."""
+        return -self.S[2, 1] / self.S[1, 1]
+
+
+def laminate(
+    name: str,
+    layers: list[Lamina | str] | PlyMaterial,
+    *,
+    angles: Sequence[float] | None = None,
+    lazy: bool = False,
+) -> Laminate:
+    """Create a Laminate.
+
+    The layers are either a list of laminae and comments, or a PlyMaterial
+    together with the angles of its plies.
+
+    When lazy is True, the inverses and the properties derived from them
+    are only calculated when they are first used.
+    """
+    # Imported here, because ply imports this module.
+    from .ply import PlyMaterial  # noqa: PLC0415
+
+    if isinstance(layers, PlyMaterial):
+        if angles is None:
+            msg = "a PlyMaterial needs the angles of the plies"
+            raise TypeError(msg)
+        layers = layers.laminae(angles)
+    elif angles is not None:
+        msg = "angles can only be given with a PlyMaterial"
+        raise TypeError(msg)
     orig_layers = layers
     layers = [la for la in layers if isinstance(la, Lamina)]
-    thickness = sum(la.thickness for la in layers)
-    fiber_weight = sum(la.fiber_weight for la in layers)
-    rho = sum(la.rho * la.thickness for la in layers) / thickness
-    vf = sum(la.vf * la.thickness for la in layers) / thickness
-    resin_weight = sum(la.resin_weight for la in layers)
-    wf = fiber_weight / (fiber_weight + resin_weight)
-    zs = -thickness / 2
-    lz2, lz3 = [], []
-    C = np.zeros((6, 6))
-    for la in layers:
-        ze = zs + la.thickness
-        lz2.append((ze * ze - zs * zs) / 2)
-        lz3.append((ze * ze * ze - zs * zs * zs) / 3)
-        zs = ze
-        C = C + la.C * la.thickness / thickness
-    C = clean(C)
-    S = np.linalg.inv(C)
-    Ntx, Nty, Ntxy = 0.0, 0.0, 0.0
-    ABD = np.zeros((6, 6))
-    H = np.zeros((2, 2))
-    c3 = 0
-    for la, z2, z3 in zip(layers, lz2, lz3):
-        ABD[0, 0] += la.Q11_bar * la.thickness
-        ABD[0, 1] += la.Q12_bar * la.thickness
-        ABD[0, 2] += la.Q16_bar * la.thickness
-        ABD[0, 3] += la.Q11_bar * z2
-        ABD[0, 4] += la.Q12_bar * z2
-        ABD[0, 5] += la.Q16_bar * z2
-        ABD[1, 0] += la.Q12_bar * la.thickness
-        ABD[1, 1] += la.Q22_bar * la.thickness
-        ABD[1, 2] += la.Q26_bar * la.thickness
-        ABD[1, 3] += la.Q12_bar * z2
-        ABD[1, 4] += la.Q22_bar * z2
-        ABD[1, 5] += la.Q26_bar * z2
-        ABD[2, 0] += la.Q16_bar * la.thickness
-        ABD[2, 1] += la.Q26_bar * la.thickness
-        ABD[2, 2] += la.Q66_bar * la.thickness
-        ABD[2, 3] += la.Q16_bar * z2
-        ABD[2, 4] += la.Q26_bar * z2
-        ABD[2, 5] += la.Q66_bar * z2
-        ABD[3, 0] += la.Q11_bar * z2
-        ABD[3, 1] += la.Q12_bar * z2
-        ABD[3, 2] += la.Q16_bar * z2
-        ABD[3, 3] += la.Q11_bar * z3
-        ABD[3, 4] += la.Q12_bar * z3
-        ABD[3, 5] += la.Q16_bar * z3
-        ABD[4, 0] += la.Q12_bar * z2
-        ABD[4, 1] += la.Q22_bar * z2
-        ABD[4, 2] += la.Q26_bar * z2
-        ABD[4, 3] += la.Q12_bar * z3
-        ABD[4, 4] += la.Q22_bar * z3
-        ABD[4, 5] += la.Q26_bar * z3
-        ABD[5, 0] += la.Q16_bar * z2
-        ABD[5, 1] += la.Q26_bar * z2
-        ABD[5, 2] += la.Q66_bar * z2
-        ABD[5, 3] += la.Q16_bar * z3
-        ABD[5, 4] += la.Q26_bar * z3
-        ABD[5, 5] += la.Q66_bar * z3
-        Ntx += (
-            la.Q11_bar * la.alpha_x + la.Q12_bar * la.alpha_y + la.Q16_bar * la.alpha_xy
-        ) * la.thickness
-        Nty += (
-            la.Q12_bar * la.alpha_x + la.Q22_bar * la.alpha_y + la.Q26_bar * la.alpha_xy
-        ) * la.thickness
-        Ntxy += (
-            la.Q16_bar * la.alpha_x + la.Q26_bar * la.alpha_y + la.Q66_bar * la.alpha_xy
-        ) * la.thickness
-        sb = 5 / 4 * (la.thickness - 4 * z3 / thickness**2)
-        H[0, 0] += la.Q44_bar_s * sb
-        H[0, 1] += la.Q45_bar_s * sb
-        H[1, 0] += la.Q45_bar_s * sb
-        H[1, 1] += la.Q55_bar_s * sb
-        c3 += la.thickness / la.E3
-    ABD = clean(ABD)
-    H = clean(H)
-    abd = np.linalg.inv(ABD)
-    h = np.linalg.inv(H)
-    dABD = np.linalg.det(ABD)
-    dt1 = np.linalg.det(np.delete(np.delete(ABD, 0, 0), 0, 1))
-    Ex = dABD / (dt1 * thickness)
-    dt2 = np.linalg.det(np.delete(np.delete(ABD, 1, 0), 1, 1))
-    Ey = dABD / (dt2 * thickness)
-    dt3 = np.linalg.det(np.delete(np.delete(ABD, 2, 0), 2, 1))
-    Gxy = dABD / (dt3 * thickness)
-    dt4 = np.linalg.det(np.delete(np.delete(ABD, 0, 1), 1, 0))
-    dt5 = np.linalg.det(np.delete(np.delete(ABD, 1, 1), 0, 0))
-    nu_xy = dt4 / dt1
-    nu_yx = dt5 / dt2
-    Gyz = H[0, 0] / thickness
-    Gxz = H[1, 1] / thickness
-    Ez = thickness / c3
-    alpha_x = abd[0, 0] * Ntx + abd[0, 1] * Nty + abd[0, 2] * Ntxy
-    alpha_y = abd[1, 0] * Ntx + abd[1, 1] * Nty + abd[1, 2] * Ntxy
-    tEx, tEy, tEz = 1 / S[0, 0], 1 / S[1, 1], 1 / S[2, 2]
-    tGxy, tGxz, tGyz = 1 / S[5, 5], 1 / S[4, 4], 1 / S[3, 3]
-    t_nu_xy, t_nu_xz, t_nu_yz = (
-        -S[1, 0] / S[0, 0],
-        -S[2, 0] / S[0, 0],
-        -S[2, 1] / S[1, 1],
+    plies = _ply_table(layers)
+    t = plies["t"]
+    thickness = float(np.sum(t))
+    fiber_weight = float(np.sum(plies["fiber_weight"]))
+    rho = float(np.dot(plies["rho"], t)) / thickness
+    vf = float(np.dot(plies["vf"], t)) / thickness
+    resin_weight = float(np.sum(plies["resin_weight"]))
+    ABD, H, Nt, C, c3 = _sums(plies)
+    return _finish(
+        name,
+        orig_layers,
+        (thickness, fiber_weight, rho, vf, resin_weight),
+        (ABD, H, Nt, C, c3),
+        lazy=lazy,
     )
-    return Laminate(
+
+
+def _finish(
+    name: str, layers: list, totals: tuple, sums: tuple, *, lazy: bool = False
+) -> Laminate:
+    """Create a Laminate from the summed ply contributions."""
+    thickness, fiber_weight, rho, vf, resin_weight = totals
+    ABD, H, Nt, C, c3 = sums
+    H = clean(H)
+    rv = Laminate(
         name=name,
-        layers=orig_layers,
+        layers=layers,
         thickness=thickness,
         fiber_weight=fiber_weight,
         rho=rho,
         vf=vf,
         resin_weight=resin_weight,
-        ABD=ABD,
-        abd=abd,
+        ABD=clean(ABD),
         H=H,
-        h=h,
-        Ex=Ex,
-        Ey=Ey,
-        Ez=Ez,
-        Gxy=Gxy,
-        Gyz=Gyz,
-        Gxz=Gxz,
-        nu_xy=nu_xy,
-        nu_yx=nu_yx,
-        alpha_x=alpha_x,
-        alpha_y=alpha_y,
-        wf=wf,
-        C=C,
-        S=S,
-        tEx=tEx,
-        tEy=tEy,
-        tEz=tEz,
-        tGxy=tGxy,
-        tGyz=tGyz,
-        tGxz=tGxz,
-        t_nu_xy=t_nu_xy,
-        t_nu_xz=t_nu_xz,
-        t_nu_yz=t_nu_yz,
+        Nt=Nt,
+        Ez=thickness / c3,
+        Gyz=H[0, 0] / thickness,
+        Gxz=H[1, 1] / thickness,
+        wf=fiber_weight / (fiber_weight + resin_weight),
+        C=clean(C),
+    )
+    if not lazy:
+        for field in Laminate.model_computed_fields:
+            getattr(rv, field)
+    return rv
+
+
+def _ply_table(layers: list[Lamina]) -> dict[str, np.ndarray]:
+    """Gather the ply data needed for the laminate sums into arrays."""
+    data = np.array(
+        [
+            (
+                la.thickness,
+                la.E3,
+                la.Q11_bar,
+                la.Q12_bar,
+                la.Q16_bar,
+                la.Q22_bar,
+                la.Q26_bar,
+                la.Q66_bar,
+                la.Q44_bar_s,
+                la.Q45_bar_s,
+                la.Q55_bar_s,
+                la.alpha_x,
+                la.alpha_y,
+                la.alpha_xy,
+                la.fiber_weight,
+                la.resin_weight,
+                la.rho,
+                la.vf,
+            )
+            for la in layers
+        ]
+    ).reshape(-1, 18)
+    return {
+        "t": data[:, 0],
+        "E3": data[:, 1],
+        "Q": _qmatrix(*data[:, 2:8].T),
+        # Rows (Q44, Q45) and (Q45, Q55) of the transverse shear stiffness.
+        "Qs": np.stack((data[:, 8:10], data[:, 9:11]), axis=-2),
+        "alpha": data[:, 11:14],
+        "fiber_weight": data[:, 14],
+        "resin_weight": data[:, 15],
+        "rho": data[:, 16],
+        "vf": data[:, 17],
+        "C": np.array([la.C for la in layers]).reshape(-1, 6, 6),
+    }
+
+
+def _qmatrix(Q11, Q12, Q16, Q22, Q26, Q66) -> np.ndarray:
+    """Stack the transformed reduced stiffness terms into (..., 3, 3) matrices."""
+    return np.stack(
+        (
+            np.stack((Q11, Q12, Q16), axis=-1),
+            np.stack((Q12, Q22, Q26), axis=-1),
+            np.stack((Q16, Q26, Q66), axis=-1),
+        ),
+        axis=-2,
+    )
+
+
+def _z_moments(t: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """First and second z-moments of the plies w.r.t. the mid-plane.
+
+    The last axis of t runs over the plies from bottom to top.
+    """
+    ze = np.cumsum(t, axis=-1) - np.sum(t, axis=-1, keepdims=True) / 2
+    zs = ze - t
+    return (ze * ze - zs * zs) / 2, (ze * ze * ze - zs * zs * zs) / 3
+
+
+def _sums(plies: dict[str, np.ndarray]):
+    """Sum the ply contributions into ABD, H, the thermal force vector, C and c3.
+
+    Every entry in plies has the ply axis as its first non-batch axis, so
+    this works on a single laminate as well as on a stack of padded
+    laminates.
+    """
+    t, Q = plies["t"], plies["Q"]
+    thickness = np.sum(t, axis=-1)
+    z2, z3 = _z_moments(t)
+    A = np.einsum("...k,...kij->...ij", t, Q)
+    B = np.einsum("...k,...kij->...ij", z2, Q)
+    D = np.einsum("...k,...kij->...ij", z3, Q)
+    ABD = np.concatenate(
+        (np.concatenate((A, B), axis=-1), np.concatenate((B, D), axis=-1)),
+        axis=-2,
     )
+    Nt = np.einsum("...k,...kij,...kj->...i", t, Q, plies["alpha"])
+    sb = 5 / 4 * (t - 4 * z3 / thickness[..., np.newaxis] ** 2)
+    H = np.einsum("...k,...kij->...ij", sb, plies["Qs"])
+    C = np.einsum("...k,...kij->...ij", t, plies["C"])
+    C /= thickness[..., np.newaxis, np.newaxis]
+    c3 = np.sum(t / plies["E3"], axis=-1)
+    return ABD, H, Nt, C, c3
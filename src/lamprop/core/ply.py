@@ -0,0 +1,225 @@
+"""Angle-independent ply material and its rotation by invariants."""
+
+from __future__ import annotations
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict
+
+from .batch import LaminaBatch, _micromechanics, _onaxis_C
+from .fiber import Fiber
+from .lamina import Lamina, check_ply
+from .laminate import Laminate, _qmatrix, laminate
+from .resin import Resin
+from .utils import tbars
+
+
+class PlyMaterial(BaseModel):
+    """On-axis properties of a ply, independent of its angle.
+
+    The micromechanics are evaluated once. The reduced stiffness is kept
+    in the form of the Tsai-Pagano invariants U1-U5, so that rotating the
+    ply to any angle only takes a handful of multiplications.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    fiber: Fiber
+    resin: Resin
+    fiber_weight: float
+    vf: float
+    thickness: float
+    resin_weight: float
+    E1: float
+    E2: float
+    G12: float
+    G23: float
+    nu12: float
+    nu23: float
+    alpha1: float
+    alpha2: float
+    rho: float
+    Q11: float
+    Q12: float
+    Q22: float
+    Q66: float
+    U1: float
+    U2: float
+    U3: float
+    U4: float
+    U5: float
+    Cp: np.ndarray
+
+    def rotated(self, angles: float | np.ndarray) -> dict[str, np.ndarray]:
+        """Angle dependent properties for one or more angles.
+
+        Returns a dictionary with alpha_x, alpha_y, alpha_xy, the Q*_bar
+        terms and the rotated 3D stiffness matrices C, shape (..., 6, 6).
+        """
+        angles = np.asarray(angles, dtype=float)
+        a = np.radians(angles)
+        m, n = np.cos(a), np.sin(a)
+        c2, s2 = np.cos(2 * a), np.sin(2 * a)
+        c4, s4 = np.cos(4 * a), np.sin(4 * a)
+        m2, n2 = m * m, n * n
+        U1, U2, U3, U4, U5 = self.U1, self.U2, self.U3, self.U4, self.U5
+        Q44_bar_s = self.G23 * m2 + self.G12 * n2
+        Q55_bar_s = self.G23 * n2 + self.G12 * m2
+        T = tbars(angles)
+        return {
+            "alpha_x": self.alpha1 * m2 + self.alpha2 * n2,
+            "alpha_y": self.alpha1 * n2 + self.alpha2 * m2,
+            "alpha_xy": 2 * (self.alpha1 - self.alpha2) * m * n,
+            "Q11_bar": U1 + U2 * c2 + U3 * c4,
+            "Q12_bar": U4 - U3 * c4,
+            "Q16_bar": U2 / 2 * s2 + U3 * s4,
+            "Q22_bar": U1 - U2 * c2 + U3 * c4,
+            "Q26_bar": U2 / 2 * s2 - U3 * s4,
+            "Q66_bar": U5 - U3 * c4,
+            "Q44_bar_s": Q44_bar_s,
+            "Q55_bar_s": Q55_bar_s,
+            "Q45_bar_s": (Q55_bar_s - Q44_bar_s) * n * m,
+            "C": np.matmul(np.matmul(np.swapaxes(T, -1, -2), self.Cp), T),
+        }
+
+    def lamina(self, angle: float) -> Lamina:
+        """Create a Lamina of this material at the given angle."""
+        return self.laminae([angle])[0]
+
+    def laminae(self, angles: list[float]) -> list[Lamina]:
+        """Create a Lamina of this material for every angle."""
+        rot = self.rotated(angles)
+        common = {
+            "fiber": self.fiber,
+            "resin": self.resin,
+            "fiber_weight": self.fiber_weight,
+            "vf": self.vf,
+            "thickness": self.thickness,
+            "resin_weight": self.resin_weight,
+            "E1": self.E1,
+            "E2": self.E2,
+            "E3": self.E2,
+            "G12": self.G12,
+            "G13": self.G12,
+            "G23": self.G23,
+            "nu12": self.nu12,
+            "nu13": self.nu12,
+            "nu23": self.nu23,
+            "rho": self.rho,
+        }
+        return [
+            Lamina(
+                angle=angle,
+                **common,
+                **{name: rot[name][k].item() for name in rot if name != "C"},
+                C=rot["C"][k],
+            )
+            for k, angle in enumerate(angles)
+        ]
+
+    def batch(self, angles: np.ndarray) -> LaminaBatch:
+        """Create a LaminaBatch of this material for an array of angles."""
+        angles = np.asarray(angles, dtype=float).ravel()
+        ones = np.ones_like(angles)
+        return LaminaBatch(
+            fiber_weight=self.fiber_weight * ones,
+            angle=angles,
+            vf=self.vf * ones,
+            thickness=self.thickness * ones,
+            resin_weight=self.resin_weight * ones,
+            E1=self.E1 * ones,
+            E2=self.E2 * ones,
+            E3=self.E2 * ones,
+            G12=self.G12 * ones,
+            G13=self.G12 * ones,
+            G23=self.G23 * ones,
+            nu12=self.nu12 * ones,
+            nu13=self.nu12 * ones,
+            nu23=self.nu23 * ones,
+            rho=self.rho * ones,
+            **self.rotated(angles),
+        )
+
+    def laminate(self, name: str, angles: list[float]) -> Laminate:
+        """Create a Laminate from plies of this material at the given angles."""
+        return laminate(name, self, angles=angles)
+
+
+def ply_material(
+    fiber: Fiber, resin: Resin, fiber_weight: float, vf: float
+) -> PlyMaterial:
+    """Create a PlyMaterial of unidirectional fibers in resin."""
+    check_ply(fiber_weight, vf)
+    p = _micromechanics(
+        fiber.E1,
+        fiber.nu12,
+        fiber.alpha1,
+        fiber.rho,
+        resin.E,
+        resin.nu,
+        resin.alpha,
+        resin.rho,
+        fiber_weight,
+        vf,
+    )
+    denum = 1 - p["nu12"] * p["nu21"]
+    Q11, Q12 = p["E1"] / denum, p["nu12"] * p["E2"] / denum
+    Q22, Q66 = p["E2"] / denum, p["G12"]
+    return PlyMaterial(
+        fiber=fiber,
+        resin=resin,
+        fiber_weight=fiber_weight,
+        vf=vf,
+        thickness=p["thickness"],
+        resin_weight=p["resin_weight"],
+        E1=p["E1"],
+        E2=p["E2"],
+        G12=p["G12"],
+        G23=p["G23"],
+        nu12=p["nu12"],
+        nu23=p["nu23"],
+        alpha1=p["alpha1"],
+        alpha2=p["alpha2"],
+        rho=p["rho"],
+        Q11=Q11,
+        Q12=Q12,
+        Q22=Q22,
+        Q66=Q66,
+        U1=(3 * Q11 + 3 * Q22 + 2 * Q12 + 4 * Q66) / 8,
+        U2=(Q11 - Q22) / 2,
+        U3=(Q11 + Q22 - 2 * Q12 - 4 * Q66) / 8,
+        U4=(Q11 + Q22 + 6 * Q12 - 4 * Q66) / 8,
+        U5=(Q11 + Q22 - 2 * Q12 + 4 * Q66) / 8,
+        Cp=_onaxis_C(p["E1"], p["E2"], p["G12"], p["G23"], p["nu12"], p["nu23"]),
+    )
+
+
+def _qbar(Q11, Q12, Q22, Q66, angle) -> tuple[np.ndarray, np.ndarray]:
+    """Transformed reduced stiffness from the on-axis terms via invariants.
+
+    The angle is in radians. Returns Q-bar and its derivative with respect
+    to the angle, both with shape (..., 3, 3).
+    """
+    U1 = (3 * Q11 + 3 * Q22 + 2 * Q12 + 4 * Q66) / 8
+    U2 = (Q11 - Q22) / 2
+    U3 = (Q11 + Q22 - 2 * Q12 - 4 * Q66) / 8
+    U4 = (Q11 + Q22 + 6 * Q12 - 4 * Q66) / 8
+    U5 = (Q11 + Q22 - 2 * Q12 + 4 * Q66) / 8
+    c2, s2 = np.cos(2 * angle), np.sin(2 * angle)
+    c4, s4 = np.cos(4 * angle), np.sin(4 * angle)
+    Q = _qmatrix(
+        U1 + U2 * c2 + U3 * c4,
+        U4 - U3 * c4,
+        U2 / 2 * s2 + U3 * s4,
+        U1 - U2 * c2 + U3 * c4,
+        U2 / 2 * s2 - U3 * s4,
+        U5 - U3 * c4,
+    )
+    dQ = _qmatrix(
+        -2 * U2 * s2 - 4 * U3 * s4,
+        4 * U3 * s4,
+        U2 * c2 + 4 * U3 * c4,
+        2 * U2 * s2 - 4 * U3 * s4,
+        U2 * c2 - 4 * U3 * c4,
+        4 * U3 * s4,
+    )
+    return Q, dQ
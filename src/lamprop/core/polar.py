@@ -0,0 +1,150 @@
+"""Properties of a laminate as a function of the in-plane direction."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict
+
+from .utils import tbars
+
+if TYPE_CHECKING:
+    from .laminate import Laminate
+
+# Rows and columns of the in-plane terms in the 6x6 strain transformation.
+_INPLANE = np.array([0, 1, 5])
+# Distance from the unit circle of roots that are taken as on it.
+_ON_CIRCLE = 1e-6
+
+
+class PolarCurves(BaseModel):
+    """Laminate properties in the directions given by angles.
+
+    The angles are in degrees, counterclockwise from the x-axis of the
+    laminate. The properties in a direction θ are those of the laminate
+    with the x-axis along θ, so that Ex at θ = 0 is the Ex of the laminate.
+    Every property is an array with the shape of angles; the matrices have
+    two extra axes at the end.
+
+    The principal directions are those of the largest and smallest Ex,
+    in degrees in [0, 180); they are NaN when Ex does not depend on the
+    direction.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    angles: np.ndarray
+    ABD: np.ndarray
+    abd: np.ndarray
+    C: np.ndarray
+    S: np.ndarray
+    Ex: np.ndarray
+    Ey: np.ndarray
+    Gxy: np.ndarray
+    nu_xy: np.ndarray
+    nu_yx: np.ndarray
+    alpha_x: np.ndarray
+    alpha_y: np.ndarray
+    tEx: np.ndarray
+    tEy: np.ndarray
+    tGxy: np.ndarray
+    t_nu_xy: np.ndarray
+    principal: np.ndarray
+
+
+def polar(lam: Laminate, angles: float | np.ndarray | None = None) -> PolarCurves:
+    """Calculate the properties of a laminate in many directions at once.
+
+    Instead of recalculating the laminate with rotated plies, the ABD and
+    C matrices of the laminate itself are transformed with the same
+    matrices that are used to rotate the plies.
+
+    Arguments:
+        lam: the laminate.
+        angles: the directions in degrees; every degree from 0 up to 360 by
+            default.
+    """
+    if angles is None:
+        angles = np.arange(360.0)
+    angles = np.asarray(angles, dtype=float)
+    # Strains in the rotated axes are T(θ) times those in the laminate axes.
+    T = tbars(angles)
+    Tinv = tbars(-angles)
+    G, Ginv = _inplane(T), _inplane(Tinv)
+    ABD = _swap(Ginv) @ lam.ABD @ Ginv
+    abd = G @ lam.abd @ _swap(G)
+    C = _swap(Tinv) @ lam.C @ Tinv
+    S = T @ lam.S @ _swap(T)
+    t = lam.thickness
+    # The thermal strains transform like the other strains.
+    alpha = G[..., :3, :3] @ (lam.abd[:3, :3] @ lam.Nt)
+    return PolarCurves(
+        angles=angles,
+        ABD=ABD,
+        abd=abd,
+        C=C,
+        S=S,
+        Ex=1 / (abd[..., 0, 0] * t),
+        Ey=1 / (abd[..., 1, 1] * t),
+        Gxy=1 / (abd[..., 2, 2] * t),
+        nu_xy=-abd[..., 0, 1] / abd[..., 0, 0],
+        nu_yx=-abd[..., 1, 0] / abd[..., 1, 1],
+        alpha_x=alpha[..., 0],
+        alpha_y=alpha[..., 1],
+        tEx=1 / S[..., 0, 0],
+        tEy=1 / S[..., 1, 1],
+        tGxy=1 / S[..., 5, 5],
+        t_nu_xy=-S[..., 1, 0] / S[..., 0, 0],
+        principal=principal_directions(lam),
+    )
+
+
+def principal_directions(lam: Laminate) -> np.ndarray:
+    """Directions of the largest and smallest Ex in degrees, in [0, 180).
+
+    The compliance term abd[0, 0] in the direction θ is a trigonometric
+    polynomial in 2θ of degree 2. Its coefficients follow from five
+    directions; the stationary points are roots of a polynomial of
+    degree 4 on the unit circle.
+    """
+    samples = _compliance(lam, np.arange(5) * 36.0)
+    F = np.fft.rfft(samples) / 5
+    c1, s1 = 2 * F[1].real, -2 * F[1].imag
+    c2, s2 = 2 * F[2].real, -2 * F[2].imag
+    scale = np.max(np.abs(samples))
+    if max(abs(c1), abs(s1), abs(c2), abs(s2)) < 1e-12 * scale:
+        return np.full(2, np.nan)
+    # The derivative to k = 2θ, multiplied by exp(2ik).
+    d1, d2 = (s1 + 1j * c1) / 2, s2 + 1j * c2
+    roots = np.roots([d2, d1, 0, np.conj(d1), np.conj(d2)])
+    roots = roots[np.abs(np.abs(roots) - 1) < _ON_CIRCLE]
+    theta = np.unique(np.mod(np.round(np.degrees(np.angle(roots)) / 2, 9), 180))
+    values = _compliance(lam, theta)
+    # Of directions with equal Ex, the smallest angle is used.
+    tol = 1e-9 * np.max(values)
+    return np.array(
+        [
+            theta[values <= np.min(values) + tol][0],
+            theta[values >= np.max(values) - tol][0],
+        ]
+    )
+
+
+def _compliance(lam: Laminate, angles: np.ndarray) -> np.ndarray:
+    """The term abd[0, 0] of the laminate in the given directions."""
+    G = _inplane(tbars(angles))[..., 0, :]
+    return np.einsum("...i,ij,...j->...", G, lam.abd, G)
+
+
+def _inplane(T: np.ndarray) -> np.ndarray:
+    """Block diagonal transformation of the in-plane strains and curvatures."""
+    R = T[..., _INPLANE[:, None], _INPLANE]
+    rv = np.zeros((*R.shape[:-2], 6, 6))
+    rv[..., :3, :3] = R
+    rv[..., 3:, 3:] = R
+    return rv
+
+
+def _swap(m: np.ndarray) -> np.ndarray:
+    return np.swapaxes(m, -1, -2)
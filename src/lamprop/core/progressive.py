@@ -0,0 +1,162 @@
+"""Progressive ply failure along proportional load paths."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict
+
+from .failure import Criterion, ply_reserve, ply_strengths
+from .lamina import Lamina
+from .ply import _qbar
+from .stress import ply_arrays
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .laminate import Laminate
+    from .strength import Strength
+
+# Degradation levels of a ply.
+INTACT, MATRIX, FAILED = 0, 1, 2
+
+
+class ProgressiveResult(BaseModel):
+    """Failure history of a laminate for n_paths proportional load paths.
+
+    Every step is the failure of one ply. The arrays have the shape
+    (n_paths, n_steps); paths that end early are padded with nan or -1.
+    The load factor multiplies the load direction of the path; the
+    deformation (mid-plane strains and curvatures, shape
+    (n_paths, n_steps, 6)) is the one just before the ply fails.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    directions: np.ndarray
+    load_factor: np.ndarray
+    deformation: np.ndarray
+    failed_ply: np.ndarray
+    level: np.ndarray
+
+    @property
+    def first_ply(self) -> np.ndarray:
+        """Load factor of first ply failure of every path."""
+        return self.load_factor[:, 0]
+
+    @property
+    def last_ply(self) -> np.ndarray:
+        """Highest load factor reached by every path."""
+        return np.nanmax(self.load_factor, axis=1)
+
+
+def progressive_failure(
+    lam: Laminate,
+    directions: np.ndarray,
+    criterion: Criterion = "tsai_wu",
+    *,
+    knockdown: float = 0.01,
+    strengths: Strength | Sequence[Strength] | None = None,
+    max_steps: int | None = None,
+) -> ProgressiveResult:
+    """Follow the failure of the plies until all plies have failed.
+
+    At every step the ply with the lowest reserve factor fails. The first
+    time a ply fails, its E2 and G12 are multiplied by knockdown. When it
+    fails again, E1 is knocked down as well and the ply no longer counts.
+    Only the stiffness of the failed ply changes, so the ABD matrix of
+    every path is updated with that ply's contribution instead of being
+    summed again.
+
+    Arguments:
+        lam: the laminate.
+        directions: (n_paths, 6) load directions Nx, Ny, Nxy, Mx, My, Mxy.
+        criterion: max_stress, max_strain, tsai_wu or hashin.
+        knockdown: the factor for the stiffness of failed plies.
+        strengths: the strength of all plies, or one per ply. By default
+            the strength of the fiber of every ply is used.
+        max_steps: the maximum number of steps, by default two per ply.
+    """
+    if not 0 < knockdown < 1:
+        msg = f"knockdown must be between 0 and 1, not {knockdown}"
+        raise ValueError(msg)
+    directions = np.atleast_2d(np.asarray(directions, dtype=float))
+    layers = [la for la in lam.layers if isinstance(la, Lamina)]
+    allow = ply_strengths(layers, strengths)
+    plies = ply_arrays(lam)
+    nplies, npaths = len(layers), len(directions)
+    if max_steps is None:
+        max_steps = 2 * nplies
+    Q = _degraded_q(layers, knockdown)
+    z = plies["z"]
+    moments = np.stack(
+        (
+            z[:, 1] - z[:, 0],
+            (z[:, 1] ** 2 - z[:, 0] ** 2) / 2,
+            (z[:, 1] ** 3 - z[:, 0] ** 3) / 3,
+        ),
+        axis=-1,
+    )
+    level = np.zeros((npaths, nplies), dtype=int)
+    ABD = np.broadcast_to(lam.ABD, (npaths, 6, 6)).copy()
+    load_factor = np.full((npaths, max_steps), np.nan)
+    deformation = np.full((npaths, max_steps, 6), np.nan)
+    failed_ply = np.full((npaths, max_steps), -1)
+    new_level = np.full((npaths, max_steps), -1)
+    active = np.arange(npaths)
+    for step in range(max_steps):
+        if not len(active):
+            break
+        lv = level[active]
+        unit = np.linalg.solve(ABD[active], directions[active][..., np.newaxis])[..., 0]
+        strain = unit[:, None, None, :3] + z[None, :, :, None] * unit[:, None, None, 3:]
+        if criterion == "max_strain":
+            s = np.einsum("pij,apsj->apsi", plies["Te"], strain, optimize=True)
+        else:
+            Qp = Q[lv, np.arange(nplies)]
+            stress = np.einsum("apij,apsj->apsi", Qp, strain, optimize=True)
+            s = np.einsum("pij,apsj->apsi", plies["Ts"], stress, optimize=True)
+        reserve = ply_reserve(criterion, s, np.zeros_like(s), allow).min(axis=-1)
+        reserve[lv == FAILED] = np.inf
+        ply = np.argmin(reserve, axis=1)
+        factor = reserve[np.arange(len(active)), ply]
+        ok = np.isfinite(factor)
+        active, ply, factor, unit = active[ok], ply[ok], factor[ok], unit[ok]
+        load_factor[active, step] = factor
+        deformation[active, step] = factor[:, None] * unit
+        failed_ply[active, step] = ply
+        old = level[active, ply]
+        level[active, ply] = new_level[active, step] = old + 1
+        # The change of ABD is the Kronecker product of the moments of the
+        # ply, [[m0, m1], [m1, m2]], and its change of stiffness.
+        dQ = Q[old + 1, ply] - Q[old, ply]
+        m = moments[ply]
+        m = np.stack((m[:, :2], m[:, 1:]), axis=1)
+        dABD = m[:, :, np.newaxis, :, np.newaxis] * dQ[:, np.newaxis, :, np.newaxis, :]
+        ABD[active] += dABD.reshape(-1, 6, 6)
+        active = active[np.any(level[active] < FAILED, axis=1)]
+    return ProgressiveResult(
+        directions=directions,
+        load_factor=load_factor,
+        deformation=deformation,
+        failed_ply=failed_ply,
+        level=new_level,
+    )
+
+
+def _degraded_q(layers: list[Lamina], knockdown: float) -> np.ndarray:
+    """Transformed reduced stiffness of the plies per degradation level.
+
+    Returns an array of shape (3, n_plies, 3, 3). The rotation uses the
+    Tsai-Pagano invariants.
+    """
+    E1 = np.array([la.E1 for la in layers])
+    E2 = np.array([la.E2 for la in layers])
+    G12 = np.array([la.G12 for la in layers])
+    nu12 = np.array([la.nu12 for la in layers])
+    a = np.radians([la.angle for la in layers])
+    f = np.array([[1.0, 1.0], [1.0, knockdown], [knockdown, knockdown]])[:, :, None]
+    E1, E2, G12 = f[:, 0] * E1, f[:, 1] * E2, f[:, 1] * G12
+    denum = 1 - nu12 * nu12 * E2 / E1
+    return _qbar(E1 / denum, nu12 * E2 / denum, E2 / denum, G12, a)[0]
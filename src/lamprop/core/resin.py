@@ -1,6 +1,12 @@
 """Resin model and creation function."""
 
-from pydantic import BaseModel, Field
+from __future__ import annotations
+
+from typing import Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+from .temperature import TemperatureTable, check_table
 
 
 class Resin(BaseModel):
@@ -11,8 +17,23 @@ class Resin(BaseModel):
     alpha: float = Field(..., description="CTE in K^-1")
     rho: float = Field(..., gt=0, description="Specific gravity in g/cm^3")
     name: str = Field(..., min_length=1, description="Name of the resin")
+    temperature: Optional[TemperatureTable] = Field(
+        None, description="Values of E, nu and alpha at other temperatures"
+    )
+
+    @field_validator("temperature")
+    @classmethod
+    def _check_temperature(cls, value):
+        return check_table(value, ("E", "nu", "alpha"), "resin")
 
 
-def resin(E: float, nu: float, alpha: float, rho: float, name: str) -> Resin:
+def resin(
+    E: float,
+    nu: float,
+    alpha: float,
+    rho: float,
+    name: str,
+    temperature: TemperatureTable | dict | None = None,
+) -> Resin:
     """Create a Resin instance."""
-    return Resin(E=E, nu=nu, alpha=alpha, rho=rho, name=name)
+    return Resin(E=E, nu=nu, alpha=alpha, rho=rho, name=name, temperature=temperature)
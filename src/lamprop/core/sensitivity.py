@@ -0,0 +1,155 @@
+"""Derivatives of laminate properties with respect to the ply parameters."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict
+
+from .batch import _FIBER_FIELDS, _RESIN_FIELDS, _material_arrays, _micromechanics
+from .fiber import Fiber
+from .lamina import Lamina
+from .ply import _qbar
+from .resin import Resin
+
+if TYPE_CHECKING:
+    from .laminate import Laminate
+
+# Step for the complex-step derivatives of the micromechanics.
+_H = 1e-30
+
+
+class LaminateSensitivity(BaseModel):
+    """Derivatives of laminate properties.
+
+    Every field has a leading axis over the 2·n + 1 parameters: the angle
+    of every ply in degrees, the fiber weight of every ply in g/m², and the
+    fiber volume fraction of all plies together. Use angle(), weight() and
+    vf() to select them.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    n_plies: int
+    thickness: np.ndarray
+    ABD: np.ndarray
+    abd: np.ndarray
+    Nt: np.ndarray
+    Ex: np.ndarray
+    Ey: np.ndarray
+    Gxy: np.ndarray
+    nu_xy: np.ndarray
+    nu_yx: np.ndarray
+    alpha_x: np.ndarray
+    alpha_y: np.ndarray
+
+    def angle(self, name: str) -> np.ndarray:
+        """Derivatives of a property with respect to the ply angles."""
+        return getattr(self, name)[: self.n_plies]
+
+    def weight(self, name: str) -> np.ndarray:
+        """Derivatives of a property with respect to the ply fiber weights."""
+        return getattr(self, name)[self.n_plies : 2 * self.n_plies]
+
+    def vf(self, name: str) -> np.ndarray:
+        """Derivative of a property with respect to the fiber volume fraction."""
+        return getattr(self, name)[-1]
+
+
+def laminate_sensitivity(lam: Laminate) -> LaminateSensitivity:
+    """Calculate the derivatives of the properties of a laminate.
+
+    The derivatives of the ply stiffness to the angle follow from the
+    invariant form of Q-bar. A change of a fiber weight changes the ply
+    thickness and so the position of all plies. The derivatives of the
+    micromechanics to vf are calculated by the complex step method, which
+    is exact to machine precision. The derivatives of the inverse follow
+    from d(abd) = -abd·d(ABD)·abd. Everything is done in one pass over the
+    plies; no laminates are recalculated. The derivatives are those of
+    the ABD matrix before small terms are cleaned.
+    """
+    layers = [la for la in lam.layers if isinstance(la, Lamina)]
+    n = len(layers)
+    fiber = _material_arrays([la.fiber for la in layers], Fiber, _FIBER_FIELDS)
+    resin = _material_arrays([la.resin for la in layers], Resin, _RESIN_FIELDS)
+    weight = np.array([la.fiber_weight for la in layers])
+    a = np.radians([la.angle for la in layers])
+    vf = np.array([la.vf for la in layers]) + 1j * _H
+    p = _micromechanics(*fiber, *resin, weight, vf)
+    denum = 1 - p["nu12"] * p["nu21"]
+    Q, dQa = _qbar(
+        p["E1"] / denum, p["nu12"] * p["E2"] / denum, p["E2"] / denum, p["G12"], a
+    )
+    m, s = np.cos(a), np.sin(a)
+    a1, a2 = p["alpha1"], p["alpha2"]
+    alpha = np.stack(
+        (a1 * m * m + a2 * s * s, a1 * s * s + a2 * m * m, 2 * (a1 - a2) * m * s),
+        axis=-1,
+    )
+    dalpha = np.stack(
+        ((a2 - a1) * 2 * m * s, (a1 - a2) * 2 * m * s, 2 * (a1 - a2) * (m * m - s * s)),
+        axis=-1,
+    ).real
+    t = p["thickness"]
+    # Split the results into values and derivatives to vf.
+    Q, dQv = Q.real, Q.imag / _H
+    dQa = dQa.real
+    alpha, dalv = alpha.real, alpha.imag / _H
+    t, dtv = t.real, t.imag / _H
+    # Moments of the plies about the mid-plane and their derivatives to
+    # the ply thicknesses.
+    z = np.concatenate(([0.0], np.cumsum(t))) - np.sum(t) / 2
+    dz = (np.arange(n)[np.newaxis, :] < np.arange(n + 1)[:, np.newaxis]) - 0.5
+    mom = np.stack([(z[1:] ** (k + 1) - z[:-1] ** (k + 1)) / (k + 1) for k in range(3)])
+    dmom = np.stack(
+        [z[1:, None] ** k * dz[1:] - z[:-1, None] ** k * dz[:-1] for k in range(3)]
+    )
+    deg = np.pi / 180
+    # Angles: only the stiffness of the ply itself changes.
+    dX_angle = deg * np.einsum("kab,pk->pkab", dQa, mom)
+    dNt_angle = (
+        deg
+        * (np.einsum("kab,kb->ka", dQa, alpha) + np.einsum("kab,kb->ka", Q, dalpha))
+        * t[:, None]
+    )
+    # Fiber weights: only the ply thickness changes.
+    dt_weight = t / weight
+    dX_weight = np.einsum("kab,pkj->pjab", Q, dmom) * dt_weight[:, None, None]
+    dNt_weight = np.einsum("kab,kb->ka", Q, alpha) * dt_weight[:, None]
+    # Fiber volume fraction: all plies change.
+    dX_vf = np.einsum("kab,pk->pab", dQv, mom) + np.einsum(
+        "kab,pkj,j->pab", Q, dmom, dtv
+    )
+    dNt_vf = (
+        np.einsum("kab,kb,k->a", dQv, alpha, t)
+        + np.einsum("kab,kb,k->a", Q, dalv, t)
+        + np.einsum("kab,kb,k->a", Q, alpha, dtv)
+    )
+    dX = np.concatenate((dX_angle, dX_weight, dX_vf[:, np.newaxis]), axis=1)
+    dABD = np.concatenate(
+        (
+            np.concatenate((dX[0], dX[1]), axis=-1),
+            np.concatenate((dX[1], dX[2]), axis=-1),
+        ),
+        axis=-2,
+    )
+    dNt = np.concatenate((dNt_angle, dNt_weight, dNt_vf[np.newaxis]))
+    dT = np.concatenate((np.zeros(n), dt_weight, [np.sum(dtv)]))
+    abd = lam.abd
+    dabd = -abd @ dABD @ abd
+    T = lam.thickness
+    return LaminateSensitivity(
+        n_plies=n,
+        thickness=dT,
+        ABD=dABD,
+        abd=dabd,
+        Nt=dNt,
+        Ex=-lam.Ex * (dabd[:, 0, 0] / abd[0, 0] + dT / T),
+        Ey=-lam.Ey * (dabd[:, 1, 1] / abd[1, 1] + dT / T),
+        Gxy=-lam.Gxy * (dabd[:, 2, 2] / abd[2, 2] + dT / T),
+        nu_xy=-(dabd[:, 0, 1] * abd[0, 0] - abd[0, 1] * dabd[:, 0, 0]) / abd[0, 0] ** 2,
+        nu_yx=-(dabd[:, 1, 0] * abd[1, 1] - abd[1, 0] * dabd[:, 1, 1]) / abd[1, 1] ** 2,
+        alpha_x=dabd[:, 0, :3] @ lam.Nt + dNt @ abd[0, :3],
+        alpha_y=dabd[:, 1, :3] @ lam.Nt + dNt @ abd[1, :3],
+    )
@@ -0,0 +1,32 @@
+"""Ply strength model."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class Strength(BaseModel):
+    """Strength allowables of a unidirectional ply.
+
+    Compressive strengths are given as positive numbers.
+    """
+
+    Xt: float = Field(..., gt=0, description="Tensile strength along the fibers in MPa")
+    Xc: float = Field(
+        ..., gt=0, description="Compressive strength along the fibers in MPa"
+    )
+    Yt: float = Field(..., gt=0, description="Transverse tensile strength in MPa")
+    Yc: float = Field(..., gt=0, description="Transverse compressive strength in MPa")
+    S: float = Field(..., gt=0, description="In-plane shear strength in MPa")
+    S23: Optional[float] = Field(
+        None, gt=0, description="Transverse shear strength in MPa, defaults to S"
+    )
+
+
+def strength(
+    Xt: float, Xc: float, Yt: float, Yc: float, S: float, S23: float | None = None
+) -> Strength:
+    """Create a Strength instance."""
+    return Strength(Xt=Xt, Xc=Xc, Yt=Yt, Yc=Yc, S=S, S23=S23)
@@ -0,0 +1,103 @@
+"""Ply strains and stresses for many load cases."""
+
+from __future__ import annotations
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict
+
+from .lamina import Lamina
+from .laminate import Laminate, _ply_table, _z_moments
+
+
+class PlyResponse(BaseModel):
+    """Response of a laminate to n_cases load cases.
+
+    Strains and stresses have the shape (n_cases, n_plies, 2, 3). The third
+    axis is the bottom and top of the ply, the last axis the components
+    (x, y, xy) in laminate axes or (1, 2, 12) in material axes. Shear
+    strains are engineering shear strains. The strains are total strains;
+    the stresses are caused by the strains minus the free thermal strains.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    strain0: np.ndarray
+    curvature: np.ndarray
+    z: np.ndarray
+    strain: np.ndarray
+    stress: np.ndarray
+    strain12: np.ndarray
+    stress12: np.ndarray
+
+
+def ply_response(
+    lam: Laminate, loads: np.ndarray, dT: float | np.ndarray = 0.0
+) -> PlyResponse:
+    """Calculate the ply strains and stresses for the given load cases.
+
+    Arguments:
+        lam: the laminate.
+        loads: (n_cases, 6) array of force and moment resultants
+            Nx, Ny, Nxy [N/mm] and Mx, My, Mxy [N·mm/mm].
+        dT: temperature difference [K], a scalar or one per load case.
+    """
+    loads = np.atleast_2d(np.asarray(loads, dtype=float))
+    dT = np.broadcast_to(np.asarray(dT, dtype=float), loads.shape[:1])
+    plies = ply_arrays(lam)
+    Q, alpha = plies["Q"], plies["alpha"]
+    thermal = np.concatenate((lam.Nt, plies["Mt"]))
+    deformation = (loads + dT[:, np.newaxis] * thermal) @ lam.abd.T
+    strain0, curvature = deformation[:, :3], deformation[:, 3:]
+    z = plies["z"]
+    strain = (
+        strain0[:, np.newaxis, np.newaxis, :]
+        + z[np.newaxis, :, :, np.newaxis] * curvature[:, np.newaxis, np.newaxis, :]
+    )
+    mechanical = strain - dT[:, None, None, None] * alpha[None, :, None, :]
+    stress = np.einsum("pij,cpsj->cpsi", Q, mechanical, optimize=True)
+    return PlyResponse(
+        strain0=strain0,
+        curvature=curvature,
+        z=z,
+        strain=strain,
+        stress=stress,
+        strain12=np.einsum("pij,cpsj->cpsi", plies["Te"], strain, optimize=True),
+        stress12=np.einsum("pij,cpsj->cpsi", plies["Ts"], stress, optimize=True),
+    )
+
+
+def ply_arrays(lam: Laminate) -> dict[str, np.ndarray]:
+    """Ply data of a laminate for stress analysis.
+
+    Next to the entries of the ply table, this contains z (the bottom and
+    top of every ply), Mt (thermal moment resultants per K) and Ts and Te,
+    the matrices that transform stresses and strains from laminate to
+    material axes.
+    """
+    layers = [la for la in lam.layers if isinstance(la, Lamina)]
+    plies = _ply_table(layers)
+    t = plies["t"]
+    top = np.cumsum(t) - np.sum(t) / 2
+    plies["z"] = np.stack((top - t, top), axis=-1)
+    z2, _ = _z_moments(t)
+    plies["Mt"] = np.einsum("k,kij,kj->i", z2, plies["Q"], plies["alpha"])
+    a = np.radians([la.angle for la in layers])
+    m, n = np.cos(a), np.sin(a)
+    m2, n2, mn = m * m, n * n, m * n
+    plies["Ts"] = np.stack(
+        (
+            np.stack((m2, n2, 2 * mn), axis=-1),
+            np.stack((n2, m2, -2 * mn), axis=-1),
+            np.stack((-mn, mn, m2 - n2), axis=-1),
+        ),
+        axis=-2,
+    )
+    plies["Te"] = np.stack(
+        (
+            np.stack((m2, n2, mn), axis=-1),
+            np.stack((n2, m2, -mn), axis=-1),
+            np.stack((-2 * mn, 2 * mn, m2 - n2), axis=-1),
+        ),
+        axis=-2,
+    )
+    return plies
@@ -0,0 +1,240 @@
+"""Chebyshev surrogates of laminate properties over vf and one more parameter."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Literal, Optional, Tuple
+
+import numpy as np
+from numpy.polynomial import chebyshev as cheb
+from pydantic import BaseModel, ConfigDict
+
+from .batch import LaminateBatch, lamina_batch, laminate_batch
+from .fiber import Fiber
+from .resin import Resin
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+Parameter = Literal["rotation", "weight"]
+
+DEFAULT_PROPERTIES = (
+    "thickness",
+    "rho",
+    "resin_weight",
+    "Ex",
+    "Ey",
+    "Ez",
+    "Gxy",
+    "Gyz",
+    "Gxz",
+    "nu_xy",
+    "nu_yx",
+    "alpha_x",
+    "alpha_y",
+    "ABD",
+    "C",
+)
+
+
+class SurrogateReport(BaseModel):
+    """Comparison of a surrogate with the laminate engine.
+
+    The errors are the largest absolute differences at the sample points,
+    divided by the largest magnitude of the property over those points.
+    For matrices the largest magnitude of any term is used.
+    """
+
+    points: int
+    max_error: Dict[str, float]
+
+    @property
+    def worst(self) -> tuple[str, float]:
+        """The property with the largest error and that error."""
+        name = max(self.max_error, key=self.max_error.get)
+        return name, self.max_error[name]
+
+
+class LaminateSurrogate(BaseModel):
+    """Tensor product Chebyshev fits of laminate properties.
+
+    The laminate has plies of one fiber and resin at the given angles. The
+    fits cover the fiber volume fraction and optionally a second parameter:
+    a rotation in degrees that is added to all ply angles, or the fiber
+    weight per ply in g/m². The coefficients of every property have the
+    shape (vf_degree + 1, param_degree + 1, *property shape).
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    fiber: Fiber
+    resin: Resin
+    angles: List[float]
+    fiber_weight: float
+    vf_range: Tuple[float, float]
+    param: Optional[Parameter] = None
+    param_range: Optional[Tuple[float, float]] = None
+    coefficients: Dict[str, np.ndarray]
+    report: Optional[SurrogateReport] = None
+
+    def __call__(
+        self, vf: float | np.ndarray, param: float | np.ndarray | None = None
+    ) -> dict[str, np.ndarray]:
+        """Evaluate all properties; the result has the shape of the arguments.
+
+        Matrices get their own axes after those of the arguments.
+        """
+        return {name: self.evaluate(name, vf, param) for name in self.coefficients}
+
+    def evaluate(
+        self,
+        name: str,
+        vf: float | np.ndarray,
+        param: float | np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Evaluate one property."""
+        x = _to_unit(np.asarray(vf, dtype=float), self.vf_range, "vf")
+        if self.param is None:
+            y = np.zeros_like(x)
+        else:
+            if param is None:
+                msg = f"a value for {self.param} is required"
+                raise ValueError(msg)
+            y = _to_unit(np.asarray(param, dtype=float), self.param_range, self.param)
+        x, y = np.broadcast_arrays(x, y)
+        c = self.coefficients[name]
+        rv = cheb.chebval2d(x, y, c)
+        # chebval2d puts the axes of the property first.
+        nd = c.ndim - 2
+        return np.moveaxis(rv, tuple(range(nd)), tuple(range(-nd, 0)))
+
+    def validate(self, points: int = 500, seed: int | None = 0) -> SurrogateReport:
+        """Compare with the laminate engine at random points in the range."""
+        rng = np.random.default_rng(seed)
+        vf = rng.uniform(*self.vf_range, points)
+        param = None
+        if self.param is not None:
+            param = rng.uniform(*self.param_range, points)
+        exact = self.exact(vf, param)
+        errors = {}
+        for name in self.coefficients:
+            ref = np.asarray(getattr(exact, name))
+            diff = np.max(np.abs(self.evaluate(name, vf, param) - ref))
+            scale = np.max(np.abs(ref))
+            errors[name] = float(diff / scale) if scale > 0 else float(diff)
+        return SurrogateReport(points=points, max_error=errors)
+
+    def exact(self, vf: np.ndarray, param: np.ndarray | None = None) -> LaminateBatch:
+        """The laminates at the given points, calculated by laminate_batch."""
+        vf = np.atleast_1d(np.asarray(vf, dtype=float))
+        n, nplies = len(vf), len(self.angles)
+        angles = np.broadcast_to(self.angles, (n, nplies))
+        weight = np.full((n, nplies), self.fiber_weight)
+        if self.param == "rotation":
+            angles = angles + np.asarray(param, dtype=float)[:, np.newaxis]
+        elif self.param == "weight":
+            weight = np.broadcast_to(
+                np.asarray(param, dtype=float)[:, None], weight.shape
+            )
+        plies = lamina_batch(
+            self.fiber,
+            self.resin,
+            weight.ravel(),
+            angles.ravel(),
+            np.repeat(vf, nplies),
+        )
+        return laminate_batch(plies, np.arange(n * nplies).reshape(n, nplies))
+
+
+def laminate_surrogate(
+    fiber: Fiber,
+    resin: Resin,
+    angles: Sequence[float],
+    fiber_weight: float,
+    vf_range: tuple[float, float] = (0.3, 0.7),
+    *,
+    param: Parameter | None = None,
+    param_range: tuple[float, float] | None = None,
+    degree: int = 12,
+    param_degree: int = 12,
+    properties: Sequence[str] = DEFAULT_PROPERTIES,
+    validate: int = 500,
+) -> LaminateSurrogate:
+    """Fit a surrogate to the laminate engine.
+
+    The engine is evaluated at the Chebyshev points of the ranges, which
+    keeps the interpolation error close to that of the best polynomial
+    approximation of the given degree.
+
+    Arguments:
+        fiber, resin: the materials of the plies.
+        angles: the ply angles from bottom to top.
+        fiber_weight: the fiber weight per ply in g/m².
+        vf_range: the range of the fiber volume fraction.
+        param: optional second parameter, "rotation" or "weight".
+        param_range: the range of the second parameter.
+        degree: the degree of the fits in vf.
+        param_degree: the degree of the fits in the second parameter.
+        properties: names of LaminateBatch properties to fit.
+        validate: number of random points for the validation report, or 0
+            to skip it.
+    """
+    lo, hi = vf_range
+    if not 0 < lo < hi < 1:
+        msg = f"invalid vf range {vf_range}"
+        raise ValueError(msg)
+    if param is not None and (param_range is None or param_range[0] >= param_range[1]):
+        msg = f"invalid range {param_range} for {param}"
+        raise ValueError(msg)
+    unknown = [p for p in properties if p not in LaminateBatch.model_fields]
+    if unknown:
+        msg = f"unknown properties: {', '.join(unknown)}"
+        raise ValueError(msg)
+    rv = LaminateSurrogate(
+        fiber=fiber,
+        resin=resin,
+        angles=list(angles),
+        fiber_weight=fiber_weight,
+        vf_range=vf_range,
+        param=param,
+        param_range=param_range,
+        coefficients={},
+    )
+    nx = degree + 1
+    ny = 1 if param is None else param_degree + 1
+    x, y = _nodes(nx), _nodes(ny)
+    vf = np.repeat(_from_unit(x, vf_range), ny)
+    p = None if param is None else np.tile(_from_unit(y, param_range), nx)
+    exact = rv.exact(vf, p)
+    # Interpolation at the nodes is a product of 1D transforms.
+    Vx = np.linalg.inv(cheb.chebvander(x, nx - 1))
+    Vy = np.linalg.inv(cheb.chebvander(y, ny - 1))
+    for name in properties:
+        values = np.asarray(getattr(exact, name))
+        values = values.reshape(nx, ny, *values.shape[1:])
+        rv.coefficients[name] = np.einsum("ai,bj,ij...->ab...", Vx, Vy, values)
+    if validate:
+        rv.report = rv.validate(validate)
+    return rv
+
+
+def _nodes(n: int) -> np.ndarray:
+    """Chebyshev points of the first kind in [-1, 1]; 0 for n = 1."""
+    if n == 1:
+        return np.zeros(1)
+    return np.cos(np.pi * (np.arange(n) + 0.5) / n)
+
+
+def _to_unit(v: np.ndarray, bounds: tuple[float, float], name: str) -> np.ndarray:
+    """Map values in bounds to [-1, 1]."""
+    lo, hi = bounds
+    tol = 1e-9 * (hi - lo)
+    if np.any(v < lo - tol) or np.any(v > hi + tol):
+        msg = f"{name} outside the range [{lo}, {hi}] of the surrogate"
+        raise ValueError(msg)
+    return (2 * v - (lo + hi)) / (hi - lo)
+
+
+def _from_unit(x: np.ndarray, bounds: tuple[float, float]) -> np.ndarray:
+    """Map values in [-1, 1] to bounds."""
+    lo, hi = bounds
+    return (lo + hi) / 2 + x * (hi - lo) / 2
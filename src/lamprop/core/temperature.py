@@ -0,0 +1,58 @@
+"""Temperature dependent material properties."""
+
+from __future__ import annotations
+
+from typing import Dict, List
+
+import numpy as np
+from pydantic import BaseModel, Field, model_validator
+
+
+class TemperatureTable(BaseModel):
+    """Values of material properties at a number of temperatures.
+
+    The table is only used by thermal_sweep; the other calculations use
+    the values of the material itself. Between the temperatures the values
+    are interpolated linearly; outside them the value at the nearest
+    temperature is used. In input files the properties are given next to
+    T, e.g. {"T": [-55, 23, 120], "E": [3900, 3500, 2400]}.
+    """
+
+    T: List[float] = Field(..., min_length=1, description="Temperatures in °C")
+    values: Dict[str, List[float]]
+
+    @model_validator(mode="before")
+    @classmethod
+    def _gather_values(cls, data):
+        if isinstance(data, dict) and "values" not in data:
+            values = {k: v for k, v in data.items() if k != "T"}
+            data = {"T": data.get("T"), "values": values}
+        return data
+
+    @model_validator(mode="after")
+    def _check_table(self):
+        if any(b <= a for a, b in zip(self.T, self.T[1:])):
+            msg = "temperatures must be increasing"
+            raise ValueError(msg)
+        for name, values in self.values.items():
+            if len(values) != len(self.T):
+                msg = f"'{name}' needs {len(self.T)} values, one per temperature"
+                raise ValueError(msg)
+        return self
+
+    def at(self, name: str, T: float | np.ndarray, default: float) -> np.ndarray:
+        """Value of a property at temperatures T, default if it is not in the table."""
+        T = np.asarray(T, dtype=float)
+        if name not in self.values:
+            return np.full(T.shape, default)
+        return np.interp(T, self.T, self.values[name])
+
+
+def check_table(table: TemperatureTable | None, fields: tuple[str, ...], kind: str):
+    """Check that a table only has the given temperature dependent fields."""
+    if table is not None:
+        unknown = [name for name in table.values if name not in fields]
+        if unknown:
+            msg = f"{kind} properties {', '.join(unknown)} cannot depend on temperature"
+            raise ValueError(msg)
+    return table
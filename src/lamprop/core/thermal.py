@@ -0,0 +1,143 @@
+"""Laminate properties and thermal stresses over a range of temperatures."""
+
+from __future__ import annotations
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict
+
+from .batch import _FIBER_FIELDS, _RESIN_FIELDS, _lamina_arrays, laminate_batch
+from .lamina import Lamina
+from .laminate import Laminate, _qmatrix
+from .stress import ply_arrays
+
+
+class ThermalSweep(BaseModel):
+    """Laminate properties and thermal response at n temperatures.
+
+    The engineering properties and the coefficients of thermal expansion
+    are those at each temperature, shape (n,). The free thermal
+    deformation, shape (n, 6), holds the mid-plane strains and curvatures
+    of the unloaded laminate relative to the stress-free temperature. The
+    residual stresses, shape (n, n_plies, 2, 3), are at the bottom and top
+    of every ply, in laminate axes (x, y, xy) and in material axes
+    (1, 2, 12), like in PlyResponse.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    temperatures: np.ndarray
+    stress_free: float
+    Ex: np.ndarray
+    Ey: np.ndarray
+    Gxy: np.ndarray
+    nu_xy: np.ndarray
+    alpha_x: np.ndarray
+    alpha_y: np.ndarray
+    deformation: np.ndarray
+    stress: np.ndarray
+    stress12: np.ndarray
+
+
+def thermal_sweep(
+    lam: Laminate,
+    temperatures: float | np.ndarray,
+    stress_free: float = 20.0,
+    *,
+    step: float = 1.0,
+) -> ThermalSweep:
+    """Evaluate a laminate over an array of temperatures in one pass.
+
+    The fiber and resin properties are taken from their temperature tables;
+    without tables they are constant. Because the stiffness and expansion
+    change with temperature, the free thermal strains and the residual
+    stresses are integrated from the stress-free temperature, usually the
+    cure temperature, with the trapezoidal rule. All integration points
+    are evaluated in a single batch.
+
+    Arguments:
+        lam: the laminate.
+        temperatures: the temperatures in °C.
+        stress_free: the temperature in °C at which the laminate is free of
+            thermal stresses.
+        step: the largest distance between integration points in K.
+    """
+    temperatures = np.atleast_1d(np.asarray(temperatures, dtype=float))
+    layers = [la for la in lam.layers if isinstance(la, Lamina)]
+    n = len(layers)
+    lo = min(np.min(temperatures), stress_free)
+    hi = max(np.max(temperatures), stress_free)
+    grid = np.unique(
+        np.concatenate((np.arange(lo, hi, step), temperatures, [stress_free, hi]))
+    )
+    g = len(grid)
+    fiber = _material_at([la.fiber for la in layers], _FIBER_FIELDS, grid)
+    resin = _material_at([la.resin for la in layers], _RESIN_FIELDS, grid)
+    per_ply = [
+        np.broadcast_to([getattr(la, name) for la in layers], (g, n))
+        for name in ("fiber_weight", "angle", "vf")
+    ]
+    plies = _lamina_arrays(*(a.ravel() for a in (*fiber, *resin, *per_ply)))
+    lb = laminate_batch(plies, np.arange(g * n).reshape(g, n))
+    Q = _qmatrix(
+        plies.Q11_bar,
+        plies.Q12_bar,
+        plies.Q16_bar,
+        plies.Q22_bar,
+        plies.Q26_bar,
+        plies.Q66_bar,
+    ).reshape(g, n, 3, 3)
+    alpha = np.stack((plies.alpha_x, plies.alpha_y, plies.alpha_xy), axis=-1)
+    alpha = alpha.reshape(g, n, 3)
+    t = plies.thickness.reshape(g, n)
+    z = np.concatenate((np.zeros((g, 1)), np.cumsum(t, axis=1)), axis=1)
+    z -= z[:, -1:] / 2
+    z = np.stack((z[:, :-1], z[:, 1:]), axis=-1)
+    Qa = np.einsum("gpij,gpj->gpi", Q, alpha)
+    Nt = np.einsum("gpi,gp->gi", Qa, t)
+    Mt = np.einsum("gpi,gp->gi", Qa, (z[..., 1] ** 2 - z[..., 0] ** 2) / 2)
+    # Rates of change with temperature of the deformation and ply stresses.
+    rate = np.einsum("gij,gj->gi", lb.abd, np.concatenate((Nt, Mt), axis=1))
+    strain = rate[:, None, None, :3] + z[..., None] * rate[:, None, None, 3:]
+    stress_rate = np.einsum("gpij,gpsj->gpsi", Q, strain - alpha[:, :, None, :])
+    deformation = _integral(grid, rate, stress_free)
+    stress = _integral(grid, stress_rate, stress_free)
+    index = np.searchsorted(grid, temperatures)
+    stress = stress[index]
+    return ThermalSweep(
+        temperatures=temperatures,
+        stress_free=stress_free,
+        Ex=lb.Ex[index],
+        Ey=lb.Ey[index],
+        Gxy=lb.Gxy[index],
+        nu_xy=lb.nu_xy[index],
+        alpha_x=lb.alpha_x[index],
+        alpha_y=lb.alpha_y[index],
+        deformation=deformation[index],
+        stress=stress,
+        stress12=np.einsum("pij,npsj->npsi", ply_arrays(lam)["Ts"], stress),
+    )
+
+
+def _material_at(materials, fields, T) -> list[np.ndarray]:
+    """Fields of the materials at temperatures T; each has shape (len(T), n)."""
+    unique = {}
+    index = [unique.setdefault(id(m), (len(unique), m))[0] for m in materials]
+    rv = []
+    for name in fields:
+        columns = []
+        for _, m in unique.values():
+            default = getattr(m, name)
+            if m.temperature is None:
+                columns.append(np.full(T.shape, default))
+            else:
+                columns.append(m.temperature.at(name, T, default))
+        rv.append(np.stack(columns, axis=-1)[:, index])
+    return rv
+
+
+def _integral(x: np.ndarray, y: np.ndarray, x0: float) -> np.ndarray:
+    """Cumulative trapezoidal integral of y over x along the first axis from x0."""
+    dx = np.diff(x).reshape(-1, *([1] * (y.ndim - 1)))
+    steps = (y[1:] + y[:-1]) * dx / 2
+    rv = np.concatenate((np.zeros_like(y[:1]), np.cumsum(steps, axis=0)))
+    return rv - rv[np.searchsorted(x, x0)]
@@ -0,0 +1,359 @@
+"""Monte Carlo propagation of material scatter and ply misalignment."""
+
+from __future__ import annotations
+
+import math
+import sys
+from statistics import NormalDist
+from typing import TYPE_CHECKING, Dict, Literal, Optional, Union
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+if sys.version_info >= (3, 9):
+    from typing import Annotated
+else:
+    from typing_extensions import Annotated
+
+from .batch import (
+    _FIBER_FIELDS,
+    _RESIN_FIELDS,
+    LaminateBatch,
+    _lamina_arrays,
+    _material_arrays,
+    laminate_batch,
+)
+from .cache import content_key
+from .fiber import Fiber
+from .lamina import Lamina
+from .resin import Resin
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .laminate import Laminate
+
+# The standard deviation needs at least two samples.
+MIN_SAMPLES = 2
+DEFAULT_PROPERTIES = (
+    "thickness",
+    "rho",
+    "vf",
+    "Ex",
+    "Ey",
+    "Ez",
+    "Gxy",
+    "Gyz",
+    "Gxz",
+    "nu_xy",
+    "nu_yx",
+    "alpha_x",
+    "alpha_y",
+)
+
+
+class _Spread(BaseModel):
+    """Location and spread shared by the distributions.
+
+    The mean defaults to the nominal value of the quantity. The spread is
+    given either as a standard deviation or as a coefficient of variation.
+    """
+
+    mean: Optional[float] = None
+    std: Optional[float] = Field(None, ge=0)
+    cv: Optional[float] = Field(None, ge=0)
+
+    @model_validator(mode="after")
+    def _check_spread(self):
+        if (self.std is None) == (self.cv is None):
+            msg = "give either std or cv"
+            raise ValueError(msg)
+        return self
+
+    def _moments(self, nominal: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        mean = nominal if self.mean is None else np.full_like(nominal, self.mean)
+        std = (
+            self.cv * np.abs(mean) if self.std is None else np.full_like(mean, self.std)
+        )
+        return mean, std
+
+
+class Normal(_Spread):
+    """Normal distribution."""
+
+    kind: Literal["normal"] = "normal"
+
+    def sample(self, rng: np.random.Generator, nominal: np.ndarray, n: int):
+        """Draw n values for every nominal value; shape (n, len(nominal))."""
+        mean, std = self._moments(nominal)
+        return mean + std * rng.standard_normal((n, len(nominal)))
+
+
+class Uniform(_Spread):
+    """Uniform distribution with the given mean and standard deviation."""
+
+    kind: Literal["uniform"] = "uniform"
+
+    def sample(self, rng: np.random.Generator, nominal: np.ndarray, n: int):
+        """Draw n values for every nominal value; shape (n, len(nominal))."""
+        mean, std = self._moments(nominal)
+        half = math.sqrt(3) * std
+        return mean + half * rng.uniform(-1.0, 1.0, (n, len(nominal)))
+
+
+class LogNormal(_Spread):
+    """Log-normal distribution with the given mean and standard deviation.
+
+    Suitable for quantities that cannot be negative, like moduli.
+    """
+
+    kind: Literal["lognormal"] = "lognormal"
+
+    def sample(self, rng: np.random.Generator, nominal: np.ndarray, n: int):
+        """Draw n values for every nominal value; shape (n, len(nominal))."""
+        mean, std = self._moments(nominal)
+        if np.any(mean <= 0):
+            msg = "the mean of a log-normal distribution must be > 0"
+            raise ValueError(msg)
+        s2 = np.log1p((std / mean) ** 2)
+        mu = np.log(mean) - s2 / 2
+        return np.exp(mu + np.sqrt(s2) * rng.standard_normal((n, len(nominal))))
+
+
+Distribution = Annotated[Union[Normal, Uniform, LogNormal], Field(discriminator="kind")]
+
+
+class Scatter(BaseModel):
+    """Scatter of the inputs of a laminate.
+
+    Fiber and resin fields are the numerical fields of Fiber and Resin.
+    Every distinct fiber, resin and nominal fiber volume fraction in the
+    laminate gets its own draws, which all plies that use it share; this
+    models variation between batches of material. The angle is the
+    misalignment of the plies in degrees around their nominal angles; it
+    is drawn for every ply independently.
+    """
+
+    fiber: Dict[str, Distribution] = {}
+    resin: Dict[str, Distribution] = {}
+    vf: Optional[Distribution] = None
+    angle: Optional[Distribution] = None
+
+    @field_validator("fiber")
+    @classmethod
+    def _check_fiber(cls, value):
+        return _check_fields(value, _FIBER_FIELDS, "fiber")
+
+    @field_validator("resin")
+    @classmethod
+    def _check_resin(cls, value):
+        return _check_fields(value, _RESIN_FIELDS, "resin")
+
+
+def _check_fields(value: dict, fields: tuple[str, ...], kind: str) -> dict:
+    unknown = [name for name in value if name not in fields]
+    if unknown:
+        msg = f"unknown {kind} fields: {', '.join(unknown)}"
+        raise ValueError(msg)
+    return value
+
+
+class UncertaintyResult(BaseModel):
+    """Samples of laminate properties and the inputs they were made from.
+
+    Both dictionaries have arrays of shape (samples,). Inputs are named
+    "<material>.<field>", "vf" and "angle[<ply>]"; a "vf@<nominal>" is used
+    when the plies have different nominal fiber volume fractions.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    samples: int
+    seed: Optional[int]
+    nominal: Dict[str, float]
+    inputs: Dict[str, np.ndarray]
+    properties: Dict[str, np.ndarray]
+
+    def mean(self) -> dict[str, float]:
+        """The mean of every property."""
+        return {k: float(np.mean(v)) for k, v in self.properties.items()}
+
+    def std(self) -> dict[str, float]:
+        """The sample standard deviation of every property."""
+        return {k: float(np.std(v, ddof=1)) for k, v in self.properties.items()}
+
+    def percentiles(
+        self, q: Sequence[float] = (5.0, 50.0, 95.0)
+    ) -> dict[str, np.ndarray]:
+        """The given percentiles of every property."""
+        return {k: np.percentile(v, q) for k, v in self.properties.items()}
+
+    def basis(
+        self, coverage: float = 0.90, confidence: float = 0.95
+    ) -> dict[str, float]:
+        """Lower tolerance bounds of the properties, assuming normality.
+
+        With the given confidence, the fraction coverage of the population
+        lies above the returned value.
+        """
+        k = tolerance_factor(self.samples, coverage, confidence)
+        mean, std = self.mean(), self.std()
+        return {name: mean[name] - k * std[name] for name in self.properties}
+
+    def b_basis(self) -> dict[str, float]:
+        """B-basis values: 90% coverage with 95% confidence."""
+        return self.basis(0.90, 0.95)
+
+    def a_basis(self) -> dict[str, float]:
+        """A-basis values: 99% coverage with 95% confidence."""
+        return self.basis(0.99, 0.95)
+
+    def correlation(self, *, inputs: bool = True) -> tuple[list[str], np.ndarray]:
+        """Correlation coefficients of the properties and optionally the inputs.
+
+        Returns the names and the square matrix of coefficients. Quantities
+        without variation have no meaningful coefficients.
+        """
+        data = dict(self.properties)
+        if inputs:
+            data.update(self.inputs)
+        names = list(data)
+        values = np.stack([data[name] for name in names])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return names, np.corrcoef(values)
+
+
+def tolerance_factor(n: int, coverage: float, confidence: float) -> float:
+    """One-sided tolerance factor of a normal distribution for n samples.
+
+    This uses the approximation by Natrella, which is within two percent
+    of the exact factor for n ≥ 10.
+    """
+    if n < MIN_SAMPLES:
+        msg = "at least two samples are needed"
+        raise ValueError(msg)
+    zp = NormalDist().inv_cdf(coverage)
+    zg = NormalDist().inv_cdf(confidence)
+    a = 1 - zg * zg / (2 * (n - 1))
+    b = zp * zp - zg * zg / n
+    return (zp + math.sqrt(zp * zp - a * b)) / a
+
+
+def monte_carlo(
+    lam: Laminate,
+    scatter: Scatter,
+    samples: int = 1000,
+    *,
+    seed: int | None = None,
+    properties: Sequence[str] = DEFAULT_PROPERTIES,
+    chunk_size: int = 4096,
+) -> UncertaintyResult:
+    """Propagate scatter of the inputs to the properties of a laminate.
+
+    All inputs are drawn up front, in a fixed order, from a generator made
+    with the given seed; so the results only depend on the seed and not on
+    the chunk size. The laminates are evaluated by laminate_batch in chunks
+    of chunk_size samples.
+
+    Arguments:
+        lam: the nominal laminate.
+        scatter: the distributions of the inputs.
+        samples: the number of samples.
+        seed: the seed of the random generator.
+        properties: names of scalar LaminateBatch properties to collect.
+        chunk_size: the number of samples evaluated at once.
+    """
+    if samples < MIN_SAMPLES:
+        msg = "at least two samples are needed"
+        raise ValueError(msg)
+    unknown = [p for p in properties if p not in LaminateBatch.model_fields]
+    if unknown:
+        msg = f"unknown properties: {', '.join(unknown)}"
+        raise ValueError(msg)
+    layers = [la for la in lam.layers if isinstance(la, Lamina)]
+    nplies = len(layers)
+    rng = np.random.default_rng(seed)
+    inputs = {}
+    fiber = _draw(
+        rng,
+        samples,
+        [la.fiber for la in layers],
+        Fiber,
+        _FIBER_FIELDS,
+        scatter.fiber,
+        inputs,
+    )
+    resin = _draw(
+        rng,
+        samples,
+        [la.resin for la in layers],
+        Resin,
+        _RESIN_FIELDS,
+        scatter.resin,
+        inputs,
+    )
+    vf = np.array([la.vf for la in layers])
+    vf = np.broadcast_to(vf, (samples, nplies))
+    if scatter.vf is not None:
+        levels, index = np.unique(vf[0], return_inverse=True)
+        draws = scatter.vf.sample(rng, levels, samples)
+        for k, level in enumerate(levels):
+            name = "vf" if len(levels) == 1 else f"vf@{level:g}"
+            inputs[name] = draws[:, k]
+        vf = draws[:, index]
+        if np.any(vf <= 0) or np.any(vf >= 1):
+            msg = "sampled fiber volume fractions outside (0, 1)"
+            raise ValueError(msg)
+    angle = np.broadcast_to([la.angle for la in layers], (samples, nplies))
+    if scatter.angle is not None:
+        error = scatter.angle.sample(rng, np.zeros(nplies), samples)
+        inputs.update((f"angle[{k}]", error[:, k]) for k in range(nplies))
+        angle = angle + error
+    weight = np.broadcast_to([la.fiber_weight for la in layers], (samples, nplies))
+    values = {p: np.empty(samples) for p in properties}
+    for start in range(0, samples, chunk_size):
+        stop = min(start + chunk_size, samples)
+        part = slice(start, stop)
+        plies = _lamina_arrays(
+            *(a[part].ravel() for a in (*fiber, *resin, weight, angle, vf))
+        )
+        count = stop - start
+        lb = laminate_batch(plies, np.arange(count * nplies).reshape(count, nplies))
+        for p in properties:
+            values[p][part] = getattr(lb, p)
+    return UncertaintyResult(
+        samples=samples,
+        seed=seed,
+        nominal={p: float(getattr(lam, p)) for p in properties},
+        inputs=inputs,
+        properties=values,
+    )
+
+
+def _draw(rng, n, materials, model, fields, dists, inputs) -> list[np.ndarray]:
+    """Sample the fields of the materials of the plies; each is (n, plies).
+
+    Equal materials share their draws. The draws are recorded in inputs
+    under the name of the material, so different materials with the same
+    name are an error.
+    """
+    unique = {}
+    index = [unique.setdefault(content_key(m), (len(unique), m))[0] for m in materials]
+    if dists:
+        names = [m.name for _, m in unique.values()]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            kind = model.__name__.lower()
+            msg = f"different {kind}s with the same name: {', '.join(duplicates)}"
+            raise ValueError(msg)
+    table = _material_arrays([m for _, m in unique.values()], model, fields)
+    rv = []
+    for name, nominal in zip(fields, table):
+        if name in dists:
+            draws = dists[name].sample(rng, nominal, n)
+            for k, (_, m) in enumerate(unique.values()):
+                inputs[f"{m.name}.{name}"] = draws[:, k]
+        else:
+            draws = np.broadcast_to(nominal, (n, len(nominal)))
+        rv.append(draws[:, index])
+    return rv
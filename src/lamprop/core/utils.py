@@ -23,6 +23,28 @@ def tbar(degrees: float) -> np.ndarray:
     )
 
 
+def tbars(degrees: np.ndarray) -> np.ndarray:
+    """Stack of tbar matrices for an array of angles, shape (..., 6, 6)."""
+    theta = np.radians(np.asarray(degrees, dtype=float))
+    c, s = np.cos(theta), np.sin(theta)
+    rv = np.zeros((*theta.shape, 6, 6))
+    rv[..., 0, 0] = c * c
+    rv[..., 0, 1] = s * s
+    rv[..., 0, 5] = c * s
+    rv[..., 1, 0] = s * s
+    rv[..., 1, 1] = c * c
+    rv[..., 1, 5] = -c * s
+    rv[..., 2, 2] = 1.0
+    rv[..., 3, 3] = c
+    rv[..., 3, 4] = -s
+    rv[..., 4, 3] = s
+    rv[..., 4, 4] = c
+    rv[..., 5, 0] = -2 * c * s
+    rv[..., 5, 1] = 2 * c * s
+    rv[..., 5, 5] = c * c - s * s
+    return rv
+
+
 def clean(m: np.ndarray) -> np.ndarray:
     """Set matrix numbers < _LIMIT with 0."""
     rv = m.copy()
@@ -0,0 +1,294 @@
+"""Column-wise laminate database in NPZ or Parquet format."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict
+
+from lamprop.core.cache import content_key
+from lamprop.core.fiber import Fiber
+from lamprop.core.lamina import Lamina, lamina
+from lamprop.core.laminate import Laminate, laminate
+from lamprop.core.resin import Resin
+from lamprop.core.strength import Strength
+from lamprop.core.temperature import TemperatureTable
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+TABLES = ("laminates", "layers", "plies", "fibers", "resins")
+
+_FIBER_COLUMNS = ("E1", "nu12", "alpha1", "rho")
+_STRENGTH_COLUMNS = tuple(Strength.model_fields)
+_RESIN_COLUMNS = ("E", "nu", "alpha", "rho")
+_PLY_COLUMNS = tuple(
+    name for name in Lamina.model_fields if name not in ("fiber", "resin", "C")
+)
+
+
+class LaminateDB(BaseModel):
+    """Laminates stored as tables of columns.
+
+    Every table is a dictionary of arrays of equal length:
+
+    * laminates: the name, every scalar property and every matrix, stacked
+      into arrays of shape (N, ...). The layers of laminate i are rows
+      first_layer[i] up to first_layer[i] + layer_count[i] of the layers
+      table.
+    * layers: the row of the plies table for every layer.
+    * plies: one row per distinct lamina, with the row of its fiber and
+      resin.
+    * fibers and resins: one row per distinct material. Missing fiber
+      strengths are stored as NaN. Temperature tables are stored as JSON
+      text, empty for materials without one.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    laminates: Dict[str, np.ndarray]
+    layers: Dict[str, np.ndarray]
+    plies: Dict[str, np.ndarray]
+    fibers: Dict[str, np.ndarray]
+    resins: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        """Return the number of laminates."""
+        return len(self.laminates["name"])
+
+    def index(self, name: str) -> int:
+        """Row of the laminate with the given name."""
+        rows = np.flatnonzero(self.laminates["name"] == name)
+        if not len(rows):
+            msg = f"no laminate named '{name}'"
+            raise KeyError(msg)
+        return int(rows[0])
+
+    def ply_rows(self, index: int) -> np.ndarray:
+        """Rows of the plies table for the layers of a laminate."""
+        start = self.laminates["first_layer"][index]
+        stop = start + self.laminates["layer_count"][index]
+        return self.layers["ply"][start:stop]
+
+    def fiber(self, row: int) -> Fiber:
+        """Recreate the fiber in the given row."""
+        values = {name: float(self.fibers[name][row]) for name in _FIBER_COLUMNS}
+        strength = {
+            name: float(self.fibers[f"strength_{name}"][row])
+            for name in _STRENGTH_COLUMNS
+        }
+        if np.isnan(strength["Xt"]):
+            strength = None
+        elif np.isnan(strength["S23"]):
+            strength["S23"] = None
+        return Fiber(
+            name=str(self.fibers["name"][row]),
+            strength=strength,
+            temperature=_table(self.fibers, row),
+            **values,
+        )
+
+    def resin(self, row: int) -> Resin:
+        """Recreate the resin in the given row."""
+        values = {name: float(self.resins[name][row]) for name in _RESIN_COLUMNS}
+        return Resin(
+            name=str(self.resins["name"][row]),
+            temperature=_table(self.resins, row),
+            **values,
+        )
+
+    def laminate(self, index: int) -> Laminate:
+        """Recreate a laminate from its plies."""
+        plies = self.plies
+        layers = [
+            lamina(
+                self.fiber(plies["fiber"][k]),
+                self.resin(plies["resin"][k]),
+                float(plies["fiber_weight"][k]),
+                float(plies["angle"][k]),
+                float(plies["vf"][k]),
+            )
+            for k in self.ply_rows(index)
+        ]
+        return laminate(str(self.laminates["name"][index]), layers)
+
+
+def laminate_db(laminates: Iterable[Laminate]) -> LaminateDB:
+    """Create a LaminateDB from laminates.
+
+    Plies, fibers and resins are stored once. Plies are recognized by
+    identity, which works well with cached_lamina; fibers and resins by
+    their contents. Comment layers are not stored.
+    """
+    laminates = list(laminates)
+    if not laminates:
+        msg = "no laminates to store"
+        raise ValueError(msg)
+    materials = {Fiber: {}, Resin: {}}
+    plies = {}
+    layer_rows, first, count = [], [], []
+    for lam in laminates:
+        first.append(len(layer_rows))
+        n = 0
+        for la in lam.layers:
+            if isinstance(la, Lamina):
+                layer_rows.append(plies.setdefault(id(la), (len(plies), la))[0])
+                n += 1
+        count.append(n)
+    ply_list = [la for _, la in plies.values()]
+    fiber_rows = [_intern(materials[Fiber], la.fiber) for la in ply_list]
+    resin_rows = [_intern(materials[Resin], la.resin) for la in ply_list]
+    fibers = [m for _, m in materials[Fiber].values()]
+    resins = [m for _, m in materials[Resin].values()]
+    lam_table = {"name": np.array([lam.name for lam in laminates])}
+    for name in (*Laminate.model_fields, *Laminate.model_computed_fields):
+        if name in ("name", "layers"):
+            continue
+        lam_table[name] = np.array([getattr(lam, name) for lam in laminates])
+    lam_table["first_layer"] = np.array(first, dtype=np.int64)
+    lam_table["layer_count"] = np.array(count, dtype=np.int64)
+    ply_table = {
+        name: np.array([getattr(la, name) for la in ply_list], dtype=float)
+        for name in _PLY_COLUMNS
+    }
+    ply_table["fiber"] = np.array(fiber_rows, dtype=np.int64)
+    ply_table["resin"] = np.array(resin_rows, dtype=np.int64)
+    fiber_table = _material_table(fibers, _FIBER_COLUMNS)
+    for name in _STRENGTH_COLUMNS:
+        fiber_table[f"strength_{name}"] = np.array(
+            [_strength(f, name) for f in fibers], dtype=float
+        )
+    return LaminateDB(
+        laminates=lam_table,
+        layers={"ply": np.array(layer_rows, dtype=np.int64)},
+        plies=ply_table,
+        fibers=fiber_table,
+        resins=_material_table(resins, _RESIN_COLUMNS),
+    )
+
+
+def write_db(db: LaminateDB | Iterable[Laminate], path: str | Path) -> Path:
+    """Write a laminate database.
+
+    A path ending in .parquet is written as a directory with one Parquet
+    file per table; this needs pyarrow. Otherwise it is written as a
+    single NPZ file, with keys of the form "table/column".
+    """
+    if not isinstance(db, LaminateDB):
+        db = laminate_db(db)
+    path = Path(path)
+    if path.suffix == ".parquet":
+        _require_pyarrow()
+        path.mkdir(parents=True, exist_ok=True)
+        for table in TABLES:
+            columns = getattr(db, table)
+            fields = [_arrow_field(name, col) for name, col in columns.items()]
+            arrays = [_to_arrow(col) for col in columns.values()]
+            pq.write_table(
+                pa.Table.from_arrays(arrays, schema=pa.schema(fields)),
+                path / f"{table}.parquet",
+            )
+        return path
+    arrays = {
+        f"{table}/{name}": column
+        for table in TABLES
+        for name, column in getattr(db, table).items()
+    }
+    with path.open("wb") as f:
+        np.savez(f, **arrays)
+    return path
+
+
+def read_db(path: str | Path) -> LaminateDB:
+    """Read a laminate database written by write_db."""
+    path = Path(path)
+    tables = {table: {} for table in TABLES}
+    if path.suffix == ".parquet":
+        _require_pyarrow()
+        for table in TABLES:
+            data = pq.read_table(path / f"{table}.parquet")
+            for field, column in zip(data.schema, data.columns):
+                tables[table][field.name] = _from_arrow(field, column)
+        return LaminateDB(**tables)
+    with np.load(path, allow_pickle=False) as data:
+        for key in data.files:
+            table, name = key.split("/", 1)
+            tables[table][name] = data[key]
+    return LaminateDB(**tables)
+
+
+def _intern(table: dict, material: BaseModel) -> int:
+    """Row of a material, adding it if its contents are new."""
+    key = content_key(material)
+    return table.setdefault(key, (len(table), material))[0]
+
+
+def _material_table(materials: list, columns: tuple[str, ...]) -> dict:
+    """Columns of a fiber or resin table."""
+    table = {"name": np.array([m.name for m in materials])}
+    for name in columns:
+        table[name] = np.array([getattr(m, name) for m in materials], dtype=float)
+    table["temperature"] = np.array(
+        [
+            "" if m.temperature is None else m.temperature.model_dump_json()
+            for m in materials
+        ]
+    )
+    return table
+
+
+def _table(materials: dict, row: int) -> TemperatureTable | None:
+    """Temperature table of a material, None if it has none.
+
+    Databases written before the tables were stored lack the column.
+    """
+    text = str(materials["temperature"][row]) if "temperature" in materials else ""
+    return TemperatureTable.model_validate_json(text) if text else None
+
+
+def _strength(fiber: Fiber, name: str) -> float:
+    """Strength value of a fiber, NaN if it is not known."""
+    if fiber.strength is None:
+        return np.nan
+    value = getattr(fiber.strength, name)
+    return np.nan if value is None else value
+
+
+def _require_pyarrow():
+    if pa is None:
+        msg = "writing or reading Parquet requires pyarrow"
+        raise ImportError(msg)
+
+
+def _arrow_field(name: str, column: np.ndarray):
+    """Arrow field of a column; the shape of matrices is kept as metadata."""
+    shape = ",".join(str(n) for n in column.shape[1:])
+    array = _to_arrow(column)
+    return pa.field(name, array.type, metadata={"shape": shape} if shape else None)
+
+
+def _to_arrow(column: np.ndarray):
+    """Convert a column to an Arrow array; matrices become fixed size lists."""
+    if column.ndim == 1:
+        return pa.array(column)
+    flat = column.reshape(len(column), -1)
+    return pa.FixedSizeListArray.from_arrays(pa.array(flat.ravel()), flat.shape[1])
+
+
+def _from_arrow(field, column) -> np.ndarray:
+    """Convert an Arrow column back to an array."""
+    column = column.combine_chunks()
+    if field.metadata and b"shape" in field.metadata:
+        shape = [int(n) for n in field.metadata[b"shape"].split(b",")]
+        return column.flatten().to_numpy().reshape(len(column), *shape)
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        return np.array(column.to_pylist())
+    return column.to_numpy()
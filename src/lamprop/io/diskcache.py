@@ -0,0 +1,171 @@
+"""Persistent on-disk cache of the output for lamprop files."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+from lamprop import __version__
+
+# Change this when the layout of the entries changes.
+FORMAT = 1
+DEFAULT_MAX_SIZE = 64 * 2**20
+
+
+def default_cache_dir() -> Path:
+    """Return the lamprop directory in XDG_CACHE_HOME or in ~/.cache."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "lamprop"
+
+
+@lru_cache(maxsize=None)
+def code_version() -> str:
+    """Return the version of lamprop, or a hash of its sources if it is unknown.
+
+    A source tree that is not installed has no version, so its entries
+    would survive changes of the code.
+    """
+    if __version__ != "unknown":
+        return __version__
+    h = hashlib.blake2b(digest_size=10)
+    package = Path(__file__).resolve().parents[1]
+    for path in sorted(package.rglob("*.py")):
+        h.update(path.relative_to(package).as_posix().encode("utf-8"))
+        h.update(path.read_bytes())
+    return f"source-{h.hexdigest()}"
+
+
+class ResultCache:
+    """Output of lamprop files, stored as JSON files in a directory.
+
+    An entry is keyed on the contents of the input file, the name it was
+    given as, the version of lamprop (see code_version) and the output
+    options. So a file that has not changed is served from the cache
+    without being parsed, while changing the file or upgrading lamprop
+    makes the old entry unreachable. Unreachable entries are removed by
+    the eviction.
+
+    When the entries take more than max_size bytes, the least recently used
+    ones are removed. Using an entry updates its modification time. Entries
+    are written to a temporary file and then renamed, so processes sharing
+    a cache never see a partial entry.
+    """
+
+    def __init__(
+        self, directory: str | Path | None = None, max_size: int | None = None
+    ):
+        """Use the cache in directory; it is created when the first entry is stored."""
+        self.directory = Path(directory) if directory else default_cache_dir()
+        self.max_size = DEFAULT_MAX_SIZE if max_size is None else max_size
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+
+    def key(self, filename: str | Path, **options) -> str | None:
+        """Key of a file with the given output options.
+
+        Returns None if the file cannot be read.
+        """
+        try:
+            data = Path(filename).read_bytes()
+        except OSError:
+            return None
+        h = hashlib.blake2b(digest_size=20)
+        header = [FORMAT, code_version(), str(filename), sorted(options.items())]
+        h.update(json.dumps(header).encode("utf-8"))
+        h.update(data)
+        return h.hexdigest()
+
+    def get(self, key: str | None):
+        """Return the stored value for key, or None if it is not in the cache."""
+        if key is None:
+            return None
+        path = self._path(key)
+        try:
+            value = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        # The modification time is the last use for the eviction.
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return value
+
+    def put(self, key: str | None, value):
+        """Store a JSON serializable value for key, and evict if needed."""
+        if key is None or self.max_size <= 0:
+            return
+        path = self._path(key)
+        data = json.dumps(value).encode("utf-8")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            Path(tmp).replace(path)
+        except OSError:
+            with contextlib.suppress(OSError):
+                Path(tmp).unlink()
+            return
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        else:
+            self._size += len(data)
+        if self._size > self.max_size:
+            self._size = self._evict(self.max_size)
+
+    def stats(self) -> dict:
+        """Return the directory, the number of entries and their total size."""
+        entries = self._entries()
+        return {
+            "directory": str(self.directory),
+            "entries": len(entries),
+            "size": sum(size for _, size, _ in entries),
+            "max_size": self.max_size,
+        }
+
+    def purge(self, max_size: int = 0) -> int:
+        """Remove least recently used entries until at most max_size bytes remain.
+
+        Returns the number of removed entries; by default all are removed.
+        """
+        before = len(self._entries())
+        self._size = self._evict(max_size)
+        return before - len(self._entries())
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        """Modification time, size and path of all entries."""
+        rv = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            rv.append((st.st_mtime, st.st_size, path))
+        return rv
+
+    def _evict(self, max_size: int) -> int:
+        """Remove the oldest entries to fit in max_size; returns the new size."""
+        entries = sorted(self._entries(), key=lambda e: e[0])
+        size = sum(s for _, s, _ in entries)
+        for _, s, path in entries:
+            if size <= max_size:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            size -= s
+        return size
@@ -2,51 +2,257 @@
 
 from __future__ import annotations
 
-from typing import Any
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, List
 
 import yaml
+from pydantic import BaseModel, ValidationError
 
+from lamprop.core.cache import cached_lamina
 from lamprop.core.fiber import Fiber
-from lamprop.core.lamina import lamina
-from lamprop.core.laminate import laminate
+from lamprop.core.laminate import Laminate, laminate
 from lamprop.core.resin import Resin
 from lamprop.generic import fibers as generic_fibers
 from lamprop.generic import resins as generic_resins
 
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterator
+
+# The exceptions that building a laminate from an invalid definition can
+# raise, for callers that report them instead of stopping.
+DEFINITION_ERRORS = (KeyError, TypeError, ValueError, ValidationError, ArithmeticError)
+
+# Diagnostics of the last call of parse or parse_iter without a context.
+# These are kept for compatibility; they are not safe to use from threads.
 info: list[str] = []
 warn: list[str] = []
 
+if yaml.__with_libyaml__:
+    from yaml.composer import Composer
+    from yaml.constructor import SafeConstructor
+    from yaml.cyaml import CParser
+    from yaml.resolver import Resolver
 
-def parse(filename: str) -> list[laminate]:
-    """Parse a YAML lamprop file."""
-    info.clear()
-    warn.clear()
-    try:
-        info.append(f'Reading file "{filename}".')
-        from pathlib import Path
-
-        data = yaml.safe_load(Path(filename).read_text(encoding="utf-8")) or {}
-    except Exception as e:
-        warn.append(f'Cannot read "{filename}": {e}')
-        return []
-    fdict = _get_components(data.get("fibers", []), Fiber)
-    info.append(
-        f"Found {len(fdict)} fibers, including {len(generic_fibers)} generic fibers."
+    class Loader(CParser, Composer, SafeConstructor, Resolver):
+        """Safe loader with the libyaml parser and the Python composer.
+
+        The Python composer can compose one node at a time, which
+        CSafeLoader cannot.
+        """
+
+        def __init__(self, stream):
+            CParser.__init__(self, stream)
+            Composer.__init__(self)
+            SafeConstructor.__init__(self)
+            Resolver.__init__(self)
+
+else:
+    Loader = yaml.SafeLoader
+
+
+class ParseContext:
+    """Diagnostics of parsing one file.
+
+    Every parse has its own context, so that files can be parsed
+    concurrently from threads or tasks.
+    """
+
+    def __init__(self, filename: str):
+        """Create a context without messages."""
+        self.filename = str(filename)
+        self.info: list[str] = []
+        self.warn: list[str] = []
+
+
+class ParseResult(BaseModel):
+    """The laminates of a file and the diagnostics of parsing it."""
+
+    filename: str
+    laminates: List[Laminate]
+    info: List[str]
+    warn: List[str]
+
+
+def parse(filename: str, *, lazy: bool = False) -> list[laminate]:
+    """Parse a YAML lamprop file.
+
+    If lazy is True, the laminate properties that need matrix inversions
+    are only calculated when used. The diagnostics are put in the module
+    level info and warn lists; use parse_file to get them thread-safely.
+    """
+    return list(parse_iter(filename, lazy=lazy))
+
+
+def parse_file(
+    filename: str, *, lazy: bool = False, multi_document: bool = False
+) -> ParseResult:
+    """Parse a YAML lamprop file; safe to call from several threads at once."""
+    context = ParseContext(filename)
+    laminates = list(
+        parse_iter(filename, lazy=lazy, multi_document=multi_document, context=context)
+    )
+    return ParseResult(
+        filename=context.filename,
+        laminates=laminates,
+        info=context.info,
+        warn=context.warn,
     )
-    rdict = _get_components(data.get("resins", []), Resin)
-    info.append(
-        f"Found {len(rdict)} resins, including {len(generic_resins)} generic resins."
+
+
+def parse_iter(
+    filename: str,
+    *,
+    lazy: bool = False,
+    multi_document: bool = False,
+    context: ParseContext | None = None,
+) -> Iterator[laminate]:
+    """Parse a YAML lamprop file and yield every laminate when it is built.
+
+    Only the laminate that is being built is kept in memory, next to the
+    fibers and resins. The laminates are read one by one from the file, so
+    the fibers and resins should come before them; otherwise the laminates
+    are kept until the end of the file.
+
+    With multi_document, the file can contain several YAML documents that
+    are loaded one at a time. Fibers and resins of earlier documents remain
+    available in later ones.
+
+    The diagnostics are added to the context, and are complete when the
+    iteration ends. Without a context, they go to the module level info and
+    warn lists, which are cleared when the iteration starts.
+    """
+    if context is None:
+        info.clear()
+        warn.clear()
+        context = ParseContext(filename)
+        context.info, context.warn = info, warn
+    context.info.append(f'Reading file "{filename}".')
+    components = {Fiber: {}, Resin: {}}
+    count = 0
+    try:
+        with Path(filename).open(encoding="utf-8") as stream:
+            sections = _documents(stream) if multi_document else _sections(stream)
+            for key, value in sections:
+                if key == "laminates":
+                    lam = build_laminate(
+                        value, components[Resin], components[Fiber], context, lazy=lazy
+                    )
+                    if lam:
+                        count += 1
+                        yield lam
+                else:
+                    model = Fiber if key == "fibers" else Resin
+                    add_components(value, components, model, context)
+    except OSError as e:
+        context.warn.append(f'Cannot read "{filename}": {e}')
+        return
+    except (yaml.YAMLError, UnicodeDecodeError) as e:
+        context.warn.append(f'Cannot read "{filename}": {e}')
+    context.info.append(f"Found {count} laminates")
+
+
+def add_components(items, components: dict, model, context: ParseContext):
+    """Add the fibers or resins in items and report the total.
+
+    The components map Fiber and Resin to dictionaries of those materials
+    by name; model selects the one items are added to.
+    """
+    table = components[model]
+    table.update(_get_components(items or [], model, context))
+    generic = generic_fibers if model is Fiber else generic_resins
+    kind = "fibers" if model is Fiber else "resins"
+    context.info.append(
+        f"Found {len(table)} {kind}, including {len(generic)} generic {kind}."
     )
-    laminates = []
-    for lam_data in data.get("laminates", []):
-        lam = _laminate(lam_data, rdict, fdict)
-        if lam:
-            laminates.append(lam)
-    info.append(f"Found {len(laminates)} laminates")
-    return laminates
 
 
-def _get_components(items: list[dict[str, Any]], model) -> dict[str, Any]:
+def _documents(stream) -> Iterator[tuple[str, Any]]:
+    """Yield the sections of every document of a multi-document file.
+
+    The laminates are yielded one by one.
+    """
+    for document in yaml.load_all(stream, Loader=Loader):
+        data = document or {}
+        yield "fibers", data.get("fibers", [])
+        yield "resins", data.get("resins", [])
+        for lam_data in data.get("laminates", None) or []:
+            yield "laminates", lam_data
+
+
+def _sections(stream) -> Iterator[tuple[str, Any]]:
+    """Yield the sections of a single YAML document as they are read.
+
+    This walks the parser events of the top-level mapping. The fibers and
+    resins are loaded as a whole, the laminates one by one. If the
+    laminates come before the fibers and resins, they are yielded at the
+    end of the document.
+    """
+    loader = Loader(stream)
+    try:
+        loader.get_event()  # StreamStart
+        if loader.check_event(yaml.StreamEndEvent):
+            yield from _empty()
+            return
+        loader.get_event()  # DocumentStart
+        if not loader.check_event(yaml.MappingStartEvent):
+            # Not a mapping, like an empty document.
+            loader.compose_node(None, None)
+            yield from _empty()
+            return
+        rest = yield from _mapping_sections(loader)
+        loader.get_event()  # DocumentEnd
+        if not loader.check_event(yaml.StreamEndEvent):
+            msg = "more than one document; use multi_document"
+            raise yaml.YAMLError(msg)
+        yield from rest
+    finally:
+        loader.dispose()
+
+
+def _mapping_sections(
+    loader,
+) -> Generator[tuple[str, Any], None, list[tuple[str, Any]]]:
+    """Yield the sections of the top-level mapping the loader is at.
+
+    Returns the sections that must wait for the end of the document: the
+    laminates that came before the fibers and resins, and empty fibers or
+    resins if they are missing.
+    """
+    loader.get_event()  # MappingStart
+    seen, deferred = set(), []
+    while not loader.check_event(yaml.MappingEndEvent):
+        key = loader.construct_object(loader.compose_node(None, None))
+        if key == "laminates" and loader.check_event(yaml.SequenceStartEvent):
+            if seen >= {"fibers", "resins"}:
+                loader.get_event()
+                while not loader.check_event(yaml.SequenceEndEvent):
+                    yield key, _construct(loader)
+                loader.get_event()
+            else:
+                deferred.extend(_construct(loader))
+            continue
+        value = _construct(loader)
+        if key in ("fibers", "resins"):
+            seen.add(key)
+            yield key, value
+    loader.get_event()  # MappingEnd
+    missing = [(key, []) for key in ("fibers", "resins") if key not in seen]
+    return [*missing, *(("laminates", lam_data) for lam_data in deferred)]
+
+
+def _empty() -> Iterator[tuple[str, Any]]:
+    yield "fibers", []
+    yield "resins", []
+
+
+def _construct(loader) -> Any:
+    """Compose and construct the next node."""
+    return loader.construct_document(loader.compose_node(None, None))
+
+
+def _get_components(
+    items: list[dict[str, Any]], model, context: ParseContext
+) -> dict[str, Any]:
     """Parse components from list of dicts."""
     rv = {}
     for item in items:
@@ -54,21 +260,33 @@ def _get_components(items: list[dict[str, Any]], model) -> dict[str, Any]:
             comp = model(**item)
             rv[comp.name] = comp
         except (ValueError, TypeError) as e:
-            warn.append(f"Error parsing {model.__name__}: {e}")
+            context.warn.append(f"Error parsing {model.__name__}: {e}")
     return rv
 
 
-def _laminate(
-    lam_data: dict[str, Any], resins: dict[str, Resin], fibers: dict[str, Fiber]
+def build_laminate(
+    lam_data: dict[str, Any],
+    resins: dict[str, Resin],
+    fibers: dict[str, Fiber],
+    context: ParseContext,
+    *,
+    lazy: bool = False,
 ) -> laminate:
-    """Parse a laminate definition."""
+    """Build the laminate of a definition from a file.
+
+    The resin and fibers are looked up by name. Returns None, with a warning
+    in the context, if the definition cannot be used.
+    """
+    if not isinstance(lam_data, dict):
+        context.warn.append("Laminate definition is not a mapping")
+        return None
     name = lam_data.get("name", "")
     if not name:
-        warn.append("No laminate name")
+        context.warn.append("No laminate name")
         return None
     resin_name = lam_data.get("resin", "")
     if resin_name not in resins:
-        warn.append(f'Unknown resin "{resin_name}"')
+        context.warn.append(f'Unknown resin "{resin_name}"')
         return None
     vf = lam_data.get("vf", 0.5)
     layers = []
@@ -78,9 +296,9 @@ def _laminate(
         else:
             fiber_name = layer_data.get("fiber", "")
             if fiber_name not in fibers:
-                warn.append(f'Unknown fiber "{fiber_name}"')
+                context.warn.append(f'Unknown fiber "{fiber_name}"')
                 continue
-            la = lamina(
+            la = cached_lamina(
                 fibers[fiber_name],
                 resins[resin_name],
                 layer_data["weight"],
@@ -89,11 +307,11 @@ def _laminate(
             )
             layers.append(la)
     if not layers:
-        warn.append(f'Empty laminate "{name}"')
+        context.warn.append(f'Empty laminate "{name}"')
         return None
     if lam_data.get("symmetric", False):
         layers = _extend_symmetric(layers)
-    return laminate(name, layers)
+    return laminate(name, layers, lazy=lazy)
 
 
 def _extend_symmetric(original: list) -> list:
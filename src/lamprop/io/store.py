@@ -0,0 +1,293 @@
+"""Read-only, memory-mapped store of laminate properties."""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from lamprop.core.lamina import Lamina
+from lamprop.core.laminate import Laminate
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+MAGIC = b"LAMPSTOR"
+VERSION = 1
+
+# Scalar properties in every record, after the key and before the matrices.
+SCALARS = (
+    "thickness",
+    "fiber_weight",
+    "resin_weight",
+    "rho",
+    "vf",
+    "wf",
+    "Ex",
+    "Ey",
+    "Ez",
+    "Gxy",
+    "Gyz",
+    "Gxz",
+    "nu_xy",
+    "nu_yx",
+    "alpha_x",
+    "alpha_y",
+    "tEx",
+    "tEy",
+    "tEz",
+    "tGxy",
+    "tGyz",
+    "tGxz",
+    "t_nu_xy",
+    "t_nu_xz",
+    "t_nu_yz",
+)
+MATRICES = (("Nt", (3,)), ("ABD", (6, 6)), ("abd", (6, 6)), ("H", (2, 2)))
+MATRICES += (("C", (6, 6)), ("S", (6, 6)))
+
+_HEADER = np.dtype(
+    [
+        ("magic", "S8"),
+        ("version", "<u4"),
+        ("key_width", "<u4"),
+        ("count", "<u8"),
+        ("index_offset", "<u8"),
+        ("record_offset", "<u8"),
+        ("record_size", "<u8"),
+        ("reserved", "<u8", (2,)),
+    ]
+)
+_ALIGN = 64
+
+
+def record_dtype(key_width: int = 128) -> np.dtype:
+    """Structured type of the records, with a key of key_width bytes."""
+    fields = [("key", f"S{key_width}")]
+    fields += [(name, "<f8") for name in SCALARS]
+    fields += [(name, "<f8", shape) for name, shape in MATRICES]
+    return np.dtype(fields, align=True)
+
+
+def store_key(stack: str | Sequence[float], fiber: str, resin: str, vf: float) -> str:
+    """Key of a laminate in a store.
+
+    The stack is a name or a sequence of ply angles, which is written as
+    the angles separated by slashes. The fiber volume fraction is rounded
+    to four decimals so that computed values find their key.
+    """
+    if not isinstance(stack, str):
+        stack = "/".join(f"{float(a):g}" for a in stack)
+    return f"{stack}|{fiber}|{resin}|{float(vf):.4f}"
+
+
+def laminate_key(lam: Laminate) -> str:
+    """Default key of a laminate: its ply angles, fibers, resins and vf.
+
+    Different fibers or resins in one laminate are joined with a "+".
+    """
+    layers = [la for la in lam.layers if isinstance(la, Lamina)]
+    fibers = "+".join(dict.fromkeys(la.fiber.name for la in layers))
+    resins = "+".join(dict.fromkeys(la.resin.name for la in layers))
+    return store_key([la.angle for la in layers], fibers, resins, lam.vf)
+
+
+def key_hash(keys: Iterable[str]) -> np.ndarray:
+    """64-bit hashes of keys."""
+    return np.array(
+        [
+            int.from_bytes(
+                hashlib.blake2b(k.encode("utf-8"), digest_size=8).digest(), "little"
+            )
+            for k in keys
+        ],
+        dtype=np.uint64,
+    )
+
+
+def write_store(
+    path: str | Path,
+    items: Iterable[Laminate | tuple[str | tuple, Laminate]],
+    *,
+    key_width: int = 128,
+) -> int:
+    """Write laminates to a store file.
+
+    Arguments:
+        path: the file to write.
+        items: laminates, which get laminate_key as their key, or
+            (key, laminate) pairs. A key is a string or a tuple of
+            arguments for store_key.
+        key_width: maximum length of the encoded keys in bytes.
+
+    Returns:
+        The number of records.
+    """
+    keys, lams = [], []
+    for item in items:
+        if isinstance(item, Laminate):
+            key, lam = laminate_key(item), item
+        else:
+            key, lam = item
+            if isinstance(key, tuple):
+                key = store_key(*key)
+        if len(key.encode("utf-8")) > key_width:
+            msg = f"key '{key}' is longer than {key_width} bytes"
+            raise ValueError(msg)
+        keys.append(key)
+        lams.append(lam)
+    if len(set(keys)) != len(keys):
+        msg = "duplicate keys"
+        raise ValueError(msg)
+    hashes = key_hash(keys)
+    order = np.argsort(hashes, kind="stable")
+    records = np.zeros(len(keys), dtype=record_dtype(key_width))
+    lams = [lams[k] for k in order]
+    if lams:
+        records["key"] = [keys[k].encode("utf-8") for k in order]
+        for name in (*SCALARS, *(name for name, _ in MATRICES)):
+            records[name] = [getattr(lam, name) for lam in lams]
+    header = np.zeros(1, dtype=_HEADER)
+    index_offset = _HEADER.itemsize
+    record_offset = _aligned(index_offset + 8 * len(keys))
+    header[0] = (
+        MAGIC,
+        VERSION,
+        key_width,
+        len(keys),
+        index_offset,
+        record_offset,
+        records.dtype.itemsize,
+        (0, 0),
+    )
+    with Path(path).open("wb") as f:
+        f.write(header.tobytes())
+        f.write(hashes[order].astype("<u8").tobytes())
+        f.write(bytes(record_offset - f.tell()))
+        f.write(records.tobytes())
+    return len(keys)
+
+
+class LaminateStore:
+    """Read-only view of a store file.
+
+    The index and the records are memory-mapped, so opening a store does
+    not read it, and processes that open the same file share its pages.
+    Records are numpy structured scalars; fields are accessed by name,
+    e.g. store[key]["ABD"].
+    """
+
+    def __init__(self, path: str | Path):
+        """Open the store in path."""
+        self.path = Path(path)
+        header = np.fromfile(self.path, dtype=_HEADER, count=1)
+        if len(header) != 1 or header["magic"][0] != MAGIC:
+            msg = f"'{path}' is not a lamprop store"
+            raise ValueError(msg)
+        header = header[0]
+        if header["version"] != VERSION:
+            msg = f"unsupported store version {header['version']}"
+            raise ValueError(msg)
+        self.dtype = record_dtype(int(header["key_width"]))
+        if self.dtype.itemsize != header["record_size"]:
+            msg = "record size does not match the store version"
+            raise ValueError(msg)
+        count = int(header["count"])
+        if count:
+            self._index = np.memmap(
+                self.path,
+                dtype="<u8",
+                mode="r",
+                offset=int(header["index_offset"]),
+                shape=(count,),
+            )
+            self.records = np.memmap(
+                self.path,
+                dtype=self.dtype,
+                mode="r",
+                offset=int(header["record_offset"]),
+                shape=(count,),
+            )
+        else:
+            self._index = np.zeros(0, dtype="<u8")
+            self.records = np.zeros(0, dtype=self.dtype)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Release the memory maps."""
+        self._index = np.zeros(0, dtype="<u8")
+        self.records = np.zeros(0, dtype=self.dtype)
+
+    def __len__(self) -> int:
+        """Return the number of records."""
+        return len(self.records)
+
+    def __contains__(self, key) -> bool:
+        """Whether the store has a record for key."""
+        return self.find([key])[0] >= 0
+
+    def __getitem__(self, key: str | tuple) -> np.void:
+        """The record of key, where key is a string or store_key arguments."""
+        row = self.find([key])[0]
+        if row < 0:
+            msg = f"no laminate with key '{_key(key)}'"
+            raise KeyError(msg)
+        return self.records[row]
+
+    def get(self, key: str | tuple, default=None):
+        """The record of key, or default if there is none."""
+        row = self.find([key])[0]
+        return default if row < 0 else self.records[row]
+
+    def keys(self) -> list[str]:
+        """All keys, in the order of the records."""
+        return [k.decode("utf-8") for k in self.records["key"]]
+
+    def find(self, keys: Iterable[str | tuple]) -> np.ndarray:
+        """Rows of the records of keys, -1 for missing keys."""
+        encoded = [_key(k).encode("utf-8") for k in keys]
+        hashes = key_hash(k.decode("utf-8") for k in encoded)
+        n = len(self._index)
+        rows = np.minimum(np.searchsorted(self._index, hashes), max(n - 1, 0))
+        rv = np.full(len(encoded), -1, dtype=np.int64)
+        if not n or not encoded:
+            return rv
+        hit = self._index[rows] == hashes
+        match = hit & (self.records["key"][rows] == np.array(encoded))
+        rv[match] = rows[match]
+        # Different keys can have the same hash; look at the next records.
+        for k in np.flatnonzero(hit & ~match):
+            row = rows[k] + 1
+            while row < n and self._index[row] == hashes[k]:
+                if self.records[row]["key"] == encoded[k]:
+                    rv[k] = row
+                    break
+                row += 1
+        return rv
+
+    def lookup(self, keys: Iterable[str | tuple]) -> np.ndarray:
+        """Records of many keys as a structured array; raises KeyError."""
+        keys = list(keys)
+        rows = self.find(keys)
+        missing = np.flatnonzero(rows < 0)
+        if len(missing):
+            msg = f"no laminate with key '{_key(keys[missing[0]])}'"
+            raise KeyError(msg)
+        return self.records[rows]
+
+
+def _key(key: str | tuple) -> str:
+    """Convert store_key arguments to a key."""
+    return store_key(*key) if isinstance(key, tuple) else key
+
+
+def _aligned(offset: int) -> int:
+    """Round offset up to a multiple of _ALIGN."""
+    return -(-offset // _ALIGN) * _ALIGN
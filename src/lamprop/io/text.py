@@ -2,10 +2,17 @@
 
 from __future__ import annotations
 
+import csv
+import io
+
+import numpy as np
 import pandas as pd
 
+from lamprop.core.polar import polar
 from lamprop.core.utils import is_ortho, to_abaqus_i
 
+POLAR_COLUMNS = ("Ex", "Ey", "Gxy", "nu_xy", "nu_yx", "alpha_x", "alpha_y")
+
 
 def text_output(lam, *, eng=True, mat=True, fea=True) -> list[str]:
     """Return the output as a list of lines."""
@@ -37,6 +44,28 @@ def text_output(lam, *, eng=True, mat=True, fea=True) -> list[str]:
     return lines
 
 
+def polar_output(lam, step: float = 1.0, *, header: bool = True) -> list[str]:
+    """Return the properties in every direction as comma separated lines.
+
+    The directions are step degrees apart, from 0 up to 360. The name of the
+    laminate is quoted when it contains a comma or a quote.
+    """
+    curves = polar(lam, np.arange(0.0, 360.0, step))
+    lines = [_csv_line(["laminate", "angle", *POLAR_COLUMNS])] if header else []
+    columns = [getattr(curves, name) for name in POLAR_COLUMNS]
+    for k, angle in enumerate(curves.angles):
+        values = [f"{c[k]:.6g}" for c in columns]
+        lines.append(_csv_line([lam.name, f"{angle:g}", *values]))
+    return lines
+
+
+def _csv_line(row: list[str]) -> str:
+    """Format a row as a line of CSV."""
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="").writerow(row)
+    return buf.getvalue()
+
+
 def _engprop(lam) -> list[str]:
     """Return engineering properties as text."""
     lines = ["In-plane engineering properties:"]
@@ -0,0 +1,371 @@
+"""Re-evaluate the laminates of files when they change."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import List
+
+import yaml
+from pydantic import BaseModel
+from yaml.tokens import AliasToken, AnchorToken
+
+from lamprop.core.cache import content_key
+from lamprop.core.fiber import Fiber
+from lamprop.core.resin import Resin
+
+from .parser import (
+    DEFINITION_ERRORS,
+    Loader,
+    ParseContext,
+    add_components,
+    build_laminate,
+)
+from .text import text_output
+
+
+class WatchEvent(BaseModel):
+    """What changed in a file since the previous poll.
+
+    The names are those of the laminates that were recomputed and of the
+    laminates that are no longer in the file. The warnings are those of
+    the file and of the recomputed laminates, and the lines are the output
+    of the recomputed laminates, in the order of the file.
+    """
+
+    filename: str
+    changed: List[str] = []
+    removed: List[str] = []
+    warn: List[str] = []
+    lines: List[str] = []
+
+
+class _Entry(BaseModel):
+    """A laminate definition with its output."""
+
+    key: str
+    name: str
+    warn: List[str]
+    lines: List[str]
+
+
+class _FileState:
+    """What is known about a file after the last update.
+
+    The laminates are items of a block sequence; item k starts at line
+    starts[k] and ends where the next one starts, the last one at the line
+    end. Without a block sequence, starts is None.
+    """
+
+    def __init__(self):
+        self.lines: list[str] | None = None
+        self.components = {Fiber: {}, Resin: {}}
+        self.entries: list[_Entry] = []
+        self.starts: list[int] | None = None
+        self.column = 0
+        self.end = 0
+        self.anchors = False
+
+
+class Watcher:
+    """Keep the output of files up to date by polling them.
+
+    A file is read again when its modification time or size changes. The
+    new text is compared with the old one line by line. If only lines in
+    the laminates section changed, only the laminates around those lines
+    are parsed again, so the time an update takes does not grow with the
+    size of the file. Other changes parse the whole file, as do all changes
+    to a file with YAML anchors or aliases, since those can make a laminate
+    depend on the text of another one.
+
+    Every laminate is keyed on a hash of its definition and of the fibers
+    and resin it uses; only the laminates with a new key are computed, the
+    output of the others is kept. A file that cannot be read or parsed
+    keeps its previous output.
+    """
+
+    def __init__(
+        self, files, *, eng: bool = True, mat: bool = False, fea: bool = False
+    ):
+        """Watch files; the output options are those of text_output."""
+        self.files = list(dict.fromkeys(str(f) for f in files))
+        self._options = {"eng": eng, "mat": mat, "fea": fea}
+        self._stamps: dict[str, tuple[int, int] | None] = {}
+        self._states = {f: _FileState() for f in self.files}
+
+    def poll(self) -> list[WatchEvent]:
+        """Update the files that changed since the last poll.
+
+        The first poll evaluates all files.
+        """
+        events = []
+        for f in self.files:
+            try:
+                st = Path(f).stat()
+                stamp = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                stamp = None
+            if f in self._stamps and stamp == self._stamps[f]:
+                continue
+            self._stamps[f] = stamp
+            try:
+                lines = Path(f).read_text(encoding="utf-8").splitlines(keepends=True)
+            except (OSError, UnicodeDecodeError) as e:
+                events.append(WatchEvent(filename=f, warn=[f'Cannot read "{f}": {e}']))
+                continue
+            state = self._states[f]
+            # Saving a file without changing it only updates the time.
+            if lines == state.lines:
+                continue
+            event = self._update_part(f, state, lines)
+            if event is None:
+                event = self._update(f, state, lines)
+            events.append(event)
+        return events
+
+    def lines(self) -> list[str]:
+        """Output of all laminates of all files."""
+        return [
+            line
+            for f in self.files
+            for entry in self._states[f].entries
+            for line in entry.lines
+        ]
+
+    def _update(self, f: str, state: _FileState, lines: list[str]) -> WatchEvent:
+        """Parse a whole file and recompute its new or changed laminates."""
+        context = ParseContext(f)
+        text = "".join(lines)
+        loader = Loader(text)
+        try:
+            node = loader.get_single_node()
+            data = loader.construct_document(node) if node else None
+        except yaml.YAMLError as e:
+            # Keep the old output; the file is read again when it changes.
+            return WatchEvent(filename=f, warn=[f'Cannot read "{f}": {e}'])
+        finally:
+            loader.dispose()
+        if not isinstance(data, dict):
+            data = {}
+        components = {Fiber: {}, Resin: {}}
+        add_components(data.get("fibers"), components, Fiber, context)
+        add_components(data.get("resins"), components, Resin, context)
+        definitions = data.get("laminates") or []
+        if not isinstance(definitions, list):
+            definitions = []
+        old = state.entries
+        state.lines, state.components = lines, components
+        state.starts = None
+        state.anchors = _has_anchors(text)
+        if isinstance(node, yaml.MappingNode):
+            for key, value in node.value:
+                if key.value == "laminates":
+                    _find_items(state, value)
+        entries, changed = self._entries(f, state, definitions, old)
+        state.entries = entries
+        return _event(f, context.warn, old, entries, changed)
+
+    def _update_part(self, f: str, state: _FileState, lines: list[str]):
+        """Parse and recompute only the laminates around the changed lines.
+
+        Returns None if the change is not limited to the laminates, or if
+        the file has anchors or aliases.
+        """
+        if not state.starts or state.anchors:
+            return None
+        old = state.lines
+        first = _common_prefix(old, lines)
+        n = min(len(old), len(lines)) - first
+        last = len(old) - _common_suffix(old, lines, n)
+        shift = len(lines) - len(old)
+        starts = state.starts
+        if first < starts[0] or last > state.end:
+            return None
+        # The items that contain or touch the changed lines.
+        ends = [*starts[1:], state.end]
+        lo = bisect_left(ends, first)
+        hi = bisect_right(starts, last)
+        begin, stop = starts[lo], ends[hi - 1] + shift
+        part = _parse_items(lines[begin:stop], state.column)
+        if part is None:
+            return None
+        definitions, offsets = part
+        replaced = state.entries[lo:hi]
+        entries, changed = self._entries(f, state, definitions, replaced)
+        state.lines = lines
+        state.starts = (
+            starts[:lo]
+            + [begin + k for k in offsets]
+            + [s + shift for s in starts[hi:]]
+        )
+        state.end += shift
+        old = state.entries
+        state.entries = old[:lo] + entries + old[hi:]
+        if not state.starts:
+            state.starts = None
+        return _event(f, [], old, state.entries, changed)
+
+    def _entries(self, f: str, state: _FileState, definitions: list, old: list):
+        """Entries for the definitions, reusing the old ones that are unchanged.
+
+        Returns the entries and the new ones among them.
+        """
+        known = {entry.key: entry for entry in old}
+        entries, changed = [], []
+        for lam_data in definitions:
+            key = _laminate_key(lam_data, state.components)
+            entry = known.get(key)
+            if entry is None:
+                entry = self._evaluate(f, key, lam_data, state.components)
+                known[key] = entry
+                changed.append(entry)
+            entries.append(entry)
+        return entries, changed
+
+    def _evaluate(self, f: str, key: str, lam_data, components: dict) -> _Entry:
+        """Build a laminate and format it."""
+        context = ParseContext(f)
+        name = lam_data.get("name", "") if isinstance(lam_data, dict) else ""
+        lines = []
+        try:
+            lam = build_laminate(
+                lam_data, components[Resin], components[Fiber], context
+            )
+            if lam:
+                lines = text_output(lam, **self._options)
+        except (OSError, yaml.YAMLError, *DEFINITION_ERRORS) as e:
+            context.warn.append(f"Cannot process laminate: {type(e).__name__}: {e}")
+        return _Entry(key=key, name=str(name), warn=context.warn, lines=lines)
+
+
+def _event(f: str, warn: list[str], old: list, entries: list, changed: list):
+    """Describe the changes of a file."""
+    names = {entry.name for entry in entries}
+    removed = [entry.name for entry in old if entry.name not in names]
+    return WatchEvent(
+        filename=f,
+        changed=[entry.name for entry in changed],
+        removed=list(dict.fromkeys(removed)),
+        warn=warn + [w for entry in changed for w in entry.warn],
+        lines=[line for entry in changed for line in entry.lines],
+    )
+
+
+def _laminate_key(lam_data, components: dict) -> str:
+    """Hash of a laminate definition and of the materials it refers to."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps(lam_data, sort_keys=True, default=str).encode("utf-8"))
+    if isinstance(lam_data, dict):
+        materials = [components[Resin].get(str(lam_data.get("resin")))]
+        materials.extend(
+            components[Fiber].get(str(layer.get("fiber")))
+            for layer in lam_data.get("layers") or []
+            if isinstance(layer, dict)
+        )
+        for m in materials:
+            h.update(repr(content_key(m)).encode("utf-8") if m else b"-")
+    return h.hexdigest()
+
+
+def _find_items(state: _FileState, node):
+    """Record where the items of the laminates sequence start and end."""
+    state.starts = None
+    if not isinstance(node, yaml.SequenceNode) or node.flow_style:
+        return
+    column = node.start_mark.column
+    end = node.end_mark.line
+    if end < len(state.lines) and state.lines[end][: node.end_mark.column].strip():
+        end += 1
+    starts = [
+        k
+        for k in range(node.start_mark.line, min(end, len(state.lines)))
+        if _is_item(state.lines[k], column)
+    ]
+    if starts and len(starts) == len(node.value):
+        state.starts, state.column, state.end = starts, column, end
+
+
+def _parse_items(lines: list[str], column: int):
+    """Parse lines that hold whole items of a block sequence at column.
+
+    Returns the items and the line of each item, or None if the lines can
+    only be understood as part of the whole file. That includes lines with
+    anchors or aliases, which can tie the items to other parts of the file.
+    """
+    offsets = []
+    for k, line in enumerate(lines):
+        text = line.strip()
+        if not text or text.startswith("#"):
+            continue
+        if _is_item(line, column):
+            offsets.append(k)
+        elif not offsets or len(line) - len(line.lstrip(" ")) <= column:
+            # Text before the first item or outside of the sequence.
+            return None
+    if not offsets:
+        return [], []
+    text = "".join(lines)
+    if _has_anchors(text):
+        return None
+    loader = Loader(text)
+    try:
+        items = loader.get_single_data()
+    except yaml.YAMLError:
+        return None
+    finally:
+        loader.dispose()
+    if not isinstance(items, list) or len(items) != len(offsets):
+        return None
+    return items, offsets
+
+
+def _has_anchors(text: str) -> bool:
+    """Whether the YAML text has anchors or aliases.
+
+    Text that is not valid YAML is assumed to have them.
+    """
+    loader = Loader(text)
+    try:
+        while loader.check_token():
+            if isinstance(loader.get_token(), (AnchorToken, AliasToken)):
+                return True
+    except yaml.YAMLError:
+        return True
+    finally:
+        loader.dispose()
+    return False
+
+
+def _is_item(line: str, column: int) -> bool:
+    """Whether the line starts an item of a block sequence at column."""
+    return (
+        line[column : column + 1] == "-"
+        and not line[:column].strip(" ")
+        and line[column + 1 : column + 2] in ("", " ", "\t", "\n", "\r")
+    )
+
+
+def _common_prefix(a: list, b: list) -> int:
+    """Number of equal items at the start of a and b."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix(a: list, b: list, limit: int) -> int:
+    """Number of equal items at the end of a and b, at most limit."""
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid : len(a) - lo] == b[len(b) - mid : len(b) - lo]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
@@ -0,0 +1,5 @@
+"""Stacking sequence optimization built on the batched laminate engine."""
+
+from .stacking import Goal, StackingProblem, StackingResult, optimize_stacking
+
+__all__ = ["Goal", "StackingProblem", "StackingResult", "optimize_stacking"]
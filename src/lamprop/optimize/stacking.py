@@ -0,0 +1,235 @@
+"""Genetic search for ply angle sequences."""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Literal, Optional
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from lamprop.core.batch import LaminaBatch, LaminateBatch, laminate_batch
+from lamprop.core.ply import PlyMaterial
+
+Property = Literal["Ex", "Ey", "Gxy", "nu_xy", "alpha_x", "alpha_y", "weight"]
+# Probability that a gene of a child comes from the first parent.
+_CROSSOVER = 0.5
+
+
+class Goal(BaseModel):
+    """A target value for, or the extremum of, a laminate property.
+
+    With a target the cost is weight * ((value - target) / scale)².
+    Without a target the cost is weight * value / scale, negated when
+    maximize is True. The scale defaults to the absolute target or 1.
+    """
+
+    prop: Property
+    target: Optional[float] = None
+    maximize: bool = False
+    weight: float = Field(1.0, ge=0)
+    scale: Optional[float] = Field(None, gt=0)
+
+    def cost(self, values: np.ndarray) -> np.ndarray:
+        """Cost of the property values of a population."""
+        scale = self.scale
+        if scale is None:
+            scale = abs(self.target) if self.target else 1.0
+        if self.target is not None:
+            return self.weight * ((values - self.target) / scale) ** 2
+        sign = -1.0 if self.maximize else 1.0
+        return sign * self.weight * values / scale
+
+
+class StackingProblem(BaseModel):
+    """Definition of a stacking sequence search.
+
+    The candidates are sequences of plies of one material, with angles
+    from a discrete set. If symmetric is True, the sequence is the bottom
+    half of the laminate and the ply limits apply to that half.
+    Constraint violations are added to the cost as a penalty.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    material: PlyMaterial
+    angles: List[float] = Field(..., min_length=1)
+    goals: List[Goal] = Field(..., min_length=1)
+    min_plies: int = Field(1, ge=1)
+    max_plies: int = Field(..., ge=1)
+    symmetric: bool = False
+    balanced: bool = False
+    max_contiguous: Optional[int] = Field(None, ge=1)
+    penalty: float = Field(1000.0, gt=0)
+
+    @model_validator(mode="after")
+    def _check_limits(self):
+        if self.min_plies > self.max_plies:
+            msg = "min_plies must not exceed max_plies"
+            raise ValueError(msg)
+        return self
+
+    def stacks(self, genes: np.ndarray) -> np.ndarray:
+        """Convert genes into (P, L) ply index arrays padded with -1.
+
+        A gene equal to the number of angles means "no ply".
+        """
+        genes = np.atleast_2d(genes)
+        empty = len(self.angles)
+        order = np.argsort(genes == empty, axis=1, kind="stable")
+        half = np.take_along_axis(genes, order, axis=1)
+        half = np.where(half == empty, -1, half)
+        if not self.symmetric:
+            return half
+        n = np.sum(half >= 0, axis=1, keepdims=True)
+        j = np.arange(2 * half.shape[1])
+        src = np.where(j < n, j, 2 * n - 1 - j)
+        valid = j < 2 * n
+        full = np.take_along_axis(half, np.where(valid, src, 0), axis=1)
+        return np.where(valid, full, -1)
+
+    def evaluate(self, genes: np.ndarray) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+        """Cost and properties of a population of genes, shape (P, L)."""
+        stacks = self.stacks(genes)
+        count = np.sum(stacks >= 0, axis=1)
+        ok = count > 0
+        values = {
+            name: np.full(len(stacks), np.nan)
+            for name in ("Ex", "Ey", "Gxy", "nu_xy", "alpha_x", "alpha_y", "weight")
+        }
+        if np.any(ok):
+            lb = laminate_batch(self._plies(), stacks[ok])
+            for name, column in values.items():
+                column[ok] = _property(lb, name)
+        cost = sum(goal.cost(values[goal.prop]) for goal in self.goals)
+        cost = cost + self.penalty * self._violations(stacks)
+        return np.where(np.isfinite(cost), cost, np.inf), values
+
+    def _plies(self) -> LaminaBatch:
+        """The plies for every angle in the set."""
+        return self.material.batch(self.angles)
+
+    def _violations(self, stacks: np.ndarray) -> np.ndarray:
+        """Measure of the constraint violations of every stack."""
+        valid = stacks >= 0
+        count = np.sum(valid, axis=1)
+        if self.symmetric:
+            count = count // 2
+        rv = np.maximum(self.min_plies - count, 0).astype(float)
+        if self.balanced:
+            angles = np.asarray(self.angles)
+            for a in np.unique(angles):
+                if a % 90 == 0:
+                    continue
+                n = np.sum(np.isin(stacks, np.flatnonzero(angles == a)), axis=1)
+                mirror = np.flatnonzero(angles == -a)
+                if not len(mirror):
+                    # No ply can balance these ones.
+                    rv += n
+                elif a > 0:
+                    rv += np.abs(n - np.sum(np.isin(stacks, mirror), axis=1))
+        if self.max_contiguous is not None:
+            rv += _excess_runs(stacks, self.max_contiguous)
+        return rv
+
+
+class StackingResult(BaseModel):
+    """Outcome of a stacking sequence search."""
+
+    angles: List[float]
+    cost: float
+    properties: Dict[str, float]
+    history: List[float]
+    evaluations: int
+
+
+def _property(lb: LaminateBatch, name: str) -> np.ndarray:
+    """Property of a LaminateBatch; weight is the areal weight in g/m²."""
+    if name == "weight":
+        return lb.fiber_weight + lb.resin_weight
+    return getattr(lb, name)
+
+
+def _excess_runs(stacks: np.ndarray, limit: int) -> np.ndarray:
+    """Number of plies in runs of equal angles that are longer than limit."""
+    same = (stacks[:, 1:] == stacks[:, :-1]) & (stacks[:, 1:] >= 0)
+    run = np.zeros(len(stacks), dtype=int)
+    rv = np.zeros(len(stacks), dtype=int)
+    for k in range(same.shape[1]):
+        run = np.where(same[:, k], run + 1, 0)
+        rv += run >= limit
+    return rv
+
+
+def _evaluate_chunk(problem: StackingProblem, genes: np.ndarray) -> np.ndarray:
+    """Evaluate part of a population; used in worker processes."""
+    return problem.evaluate(genes)[0]
+
+
+def optimize_stacking(
+    problem: StackingProblem,
+    *,
+    population: int = 200,
+    generations: int = 100,
+    mutation: float = 0.1,
+    elite: int = 2,
+    seed: int | None = None,
+    workers: int = 1,
+) -> StackingResult:
+    """Search for the stacking sequence with the lowest cost.
+
+    This is a genetic algorithm with tournament selection, uniform
+    crossover and mutation. Every generation is evaluated as one batch;
+    with workers > 1 the batch is split over a process pool.
+    """
+    rng = np.random.default_rng(seed)
+    n_genes = len(problem.angles) + 1
+    genes = rng.integers(0, n_genes - 1, (population, problem.max_plies))
+    # Start with a spread of ply counts.
+    for k, row in enumerate(genes):
+        nply = rng.integers(problem.min_plies, problem.max_plies + 1)
+        row[nply:] = n_genes - 1
+        genes[k] = rng.permutation(row)
+    history = []
+    evaluations = 0
+    pool = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        for _ in range(generations):
+            cost = _evaluate(problem, genes, pool, workers)
+            evaluations += len(genes)
+            order = np.argsort(cost)
+            history.append(float(cost[order[0]]))
+            a = rng.integers(0, population, (2, population))
+            b = rng.integers(0, population, (2, population))
+            pa = np.where(cost[a[0]] < cost[a[1]], a[0], a[1])
+            pb = np.where(cost[b[0]] < cost[b[1]], b[0], b[1])
+            mask = rng.random(genes.shape) < _CROSSOVER
+            children = np.where(mask, genes[pa], genes[pb])
+            mutate = rng.random(genes.shape) < mutation
+            children = np.where(mutate, rng.integers(0, n_genes, genes.shape), children)
+            children[:elite] = genes[order[:elite]]
+            genes = children
+        cost = _evaluate(problem, genes, pool, workers)
+        evaluations += len(genes)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    best = int(np.argmin(cost))
+    _, values = problem.evaluate(genes[best : best + 1])
+    stack = problem.stacks(genes[best : best + 1])[0]
+    history.append(float(cost[best]))
+    return StackingResult(
+        angles=[problem.angles[k] for k in stack if k >= 0],
+        cost=float(cost[best]),
+        properties={name: float(v[0]) for name, v in values.items()},
+        history=history,
+        evaluations=evaluations,
+    )
+
+
+def _evaluate(problem, genes, pool, workers) -> np.ndarray:
+    """Evaluate a population, optionally in parallel."""
+    if pool is None:
+        return problem.evaluate(genes)[0]
+    chunks = np.array_split(genes, workers)
+    return np.concatenate(list(pool.map(_evaluate_chunk, [problem] * workers, chunks)))
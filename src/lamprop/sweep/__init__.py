@@ -0,0 +1,5 @@
+"""Parametric sweeps over laminate definitions built on the batched engine."""
+
+from .engine import SweepSpec, evaluate_chunk, load_spec, run_sweep
+
+__all__ = ["SweepSpec", "evaluate_chunk", "load_spec", "run_sweep"]
@@ -0,0 +1,221 @@
+"""Evaluation of laminate parameter sweeps in chunks."""
+
+from __future__ import annotations
+
+import json
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, TextIO
+
+import numpy as np
+import yaml
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from lamprop.core.batch import LaminateBatch, lamina_batch, laminate_batch
+from lamprop.core.fiber import Fiber
+from lamprop.core.resin import Resin
+
+# The order of the axes of the sweep; the last one varies fastest.
+AXES = ("stack", "fiber", "resin", "weight", "vf")
+
+DEFAULT_PROPERTIES = [
+    "thickness",
+    "fiber_weight",
+    "resin_weight",
+    "rho",
+    "wf",
+    "Ex",
+    "Ey",
+    "Ez",
+    "Gxy",
+    "Gyz",
+    "Gxz",
+    "nu_xy",
+    "nu_yx",
+    "alpha_x",
+    "alpha_y",
+]
+
+
+class SweepSpec(BaseModel):
+    """Declarative definition of a parameter sweep.
+
+    The sweep covers every combination of stack, fiber, resin, fiber
+    weight per ply and fiber volume fraction. Fibers and resins are defined like
+    in lamprop input files. Numeric axes are lists, or a mapping with
+    start, stop and step where stop is included.
+    """
+
+    fibers: List[Fiber] = Field(..., min_length=1)
+    resins: List[Resin] = Field(..., min_length=1)
+    stacks: Dict[str, List[float]] = Field(..., min_length=1)
+    weight: List[float] = Field(..., min_length=1)
+    vf: List[float] = Field(..., min_length=1)
+    properties: List[str] = Field(default_factory=lambda: list(DEFAULT_PROPERTIES))
+    name: str = "{stack}_{fiber}_{resin}_{weight:g}_{vf:.2f}"
+    chunk_size: int = Field(4096, ge=1)
+
+    @field_validator("weight", "vf", mode="before")
+    @classmethod
+    def _expand_range(cls, value: Any) -> Any:
+        if isinstance(value, dict):
+            start, stop, step = value["start"], value["stop"], value["step"]
+            return np.arange(start, stop + step / 2, step).tolist()
+        if isinstance(value, (int, float)):
+            return [value]
+        return value
+
+    @field_validator("weight")
+    @classmethod
+    def _check_weights(cls, value: list[float]) -> list[float]:
+        if not all(w > 0 for w in value):
+            msg = "fiber weights must be > 0"
+            raise ValueError(msg)
+        return value
+
+    @field_validator("vf")
+    @classmethod
+    def _check_vf(cls, value: list[float]) -> list[float]:
+        if not all(0 < v < 1 for v in value):
+            msg = "fiber volume fractions must be between 0 and 1"
+            raise ValueError(msg)
+        return value
+
+    @field_validator("properties")
+    @classmethod
+    def _check_properties(cls, value: list[str]) -> list[str]:
+        unknown = [p for p in value if p not in LaminateBatch.model_fields]
+        if unknown:
+            msg = f"unknown properties: {', '.join(unknown)}"
+            raise ValueError(msg)
+        return value
+
+    @model_validator(mode="after")
+    def _check_stacks(self):
+        for name, angles in self.stacks.items():
+            if not angles:
+                msg = f"stack '{name}' has no plies"
+                raise ValueError(msg)
+        return self
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        """Number of values along every axis, in the order of AXES."""
+        return (
+            len(self.stacks),
+            len(self.fibers),
+            len(self.resins),
+            len(self.weight),
+            len(self.vf),
+        )
+
+    def __len__(self) -> int:
+        """Return the number of laminates in the sweep."""
+        return int(np.prod(self.shape))
+
+
+def load_spec(filename: str | Path) -> SweepSpec:
+    """Read a sweep specification from a YAML file."""
+    with Path(filename).open(encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+    return SweepSpec(**data)
+
+
+def evaluate_chunk(spec: SweepSpec, start: int, stop: int) -> list[dict[str, Any]]:
+    """Evaluate the laminates start up to stop of the sweep.
+
+    All plies of the chunk are made in one lamina_batch call and all
+    laminates in one laminate_batch call.
+    """
+    shape = spec.shape
+    index = np.unravel_index(np.arange(start, stop), shape)
+    stack_names = list(spec.stacks)
+    angles = sorted({a for s in spec.stacks.values() for a in s})
+    na = len(angles)
+    # Every combination of materials in this chunk gets one ply per angle.
+    combos, inverse = np.unique(
+        np.stack(index[1:], axis=-1), axis=0, return_inverse=True
+    )
+    inverse = inverse.ravel()
+    fi, ri, wi, vi = combos.T
+    plies = lamina_batch(
+        [spec.fibers[k] for k in np.repeat(fi, na)],
+        [spec.resins[k] for k in np.repeat(ri, na)],
+        np.repeat(np.asarray(spec.weight)[wi], na),
+        np.tile(angles, len(combos)),
+        np.repeat(np.asarray(spec.vf)[vi], na),
+    )
+    position = {a: k for k, a in enumerate(angles)}
+    stack_index = [np.array([position[a] for a in s]) for s in spec.stacks.values()]
+    stacks = [stack_index[s] + na * c for s, c in zip(index[0], inverse)]
+    lb = laminate_batch(plies, stacks)
+    columns = {p: getattr(lb, p).tolist() for p in spec.properties}
+    rv = []
+    for k, (s, f, r, w, v) in enumerate(zip(*index)):
+        params = {
+            "stack": stack_names[s],
+            "fiber": spec.fibers[f].name,
+            "resin": spec.resins[r].name,
+            "weight": spec.weight[w],
+            "vf": spec.vf[v],
+        }
+        record = {"name": spec.name.format(**params), **params}
+        record.update((p, columns[p][k]) for p in spec.properties)
+        rv.append(record)
+    return rv
+
+
+def _chunk_lines(spec: SweepSpec, start: int, stop: int) -> str:
+    """Evaluate a chunk and format it as JSON lines; runs in the workers."""
+    return "".join(json.dumps(r) + "\n" for r in evaluate_chunk(spec, start, stop))
+
+
+def run_sweep(
+    spec: SweepSpec,
+    output: str | Path | TextIO,
+    *,
+    workers: int = 1,
+    chunk_size: int | None = None,
+) -> int:
+    """Evaluate a sweep and write one JSON object per laminate.
+
+    The records are written in sweep order as the chunks complete. At most
+    two chunks per worker are in progress at any time, so the memory use
+    does not depend on the size of the sweep.
+
+    Arguments:
+        spec: the sweep.
+        output: a filename, "-" for standard output, or an open text file.
+        workers: the number of worker processes.
+        chunk_size: overrides the chunk size of the spec.
+
+    Returns:
+        The number of records written.
+    """
+    size = chunk_size or spec.chunk_size
+    total = len(spec)
+    bounds = [(s, min(s + size, total)) for s in range(0, total, size)]
+    if isinstance(output, (str, Path)) and str(output) != "-":
+        with Path(output).open("w", encoding="utf-8") as f:
+            _write(spec, bounds, f, workers)
+    else:
+        _write(spec, bounds, sys.stdout if output == "-" else output, workers)
+    return total
+
+
+def _write(spec, bounds, out, workers):
+    """Write the chunks in order, keeping a bounded number in flight."""
+    if workers <= 1:
+        for start, stop in bounds:
+            out.write(_chunk_lines(spec, start, stop))
+        return
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        for start, stop in bounds:
+            pending.append(pool.submit(_chunk_lines, spec, start, stop))
+            if len(pending) >= 2 * workers:
+                out.write(pending.popleft().result())
+        while pending:
+            out.write(pending.popleft().result())
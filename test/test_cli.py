@@ -0,0 +1,102 @@
+# file: test_cli.py
+#
+# Tests for processing files in parallel in the console CLI.
+
+import argparse
+import multiprocessing
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(1, ".")
+from lamprop.cli import console
+from lamprop.cli.console import (
+    _file_lines,
+    _map_files,
+    fea_callback,
+    non_negative_int,
+)
+from lamprop.io.diskcache import ResultCache
+
+BROKEN = """\
+fibers:
+  - {name: carbon, E1: 240000, nu12: 0.2, alpha1: -0.2e-6, rho: 1.76}
+resins:
+  - {name: epoxy, E: 3000, nu: 0.3, alpha: 60e-6, rho: 1.2}
+laminates:
+  - name: no weight
+    resin: epoxy
+    layers: [{fiber: carbon, angle: 0}]
+"""
+
+
+def test_ordered_output(tmp_path):
+    """The output with several jobs is the same as with one."""
+    files = sorted(str(p) for p in Path("test").glob("*.yaml")) * 3
+    outputs = []
+    for jobs in (1, 3):
+        out = tmp_path / f"fea{jobs}.inp"
+        fea_callback(files, output=str(out), jobs=jobs)
+        outputs.append(out.read_text())
+    assert outputs[0] == outputs[1]
+    assert 'Warnings for "test/unknown.yaml"' in outputs[0]
+
+
+def test_bad_file(tmp_path):
+    """A file that cannot be processed does not stop the others."""
+    broken = tmp_path / "broken.yaml"
+    broken.write_text(BROKEN)
+    files = ["test/hyer.yaml", str(broken), "test/qi.yaml"]
+    for jobs in (1, 2):
+        results = list(_map_files(files, jobs, eng=True, mat=False, fea=False))
+        assert [f for f, _, _ in results] == files
+        (_, warn0, lines0), (_, warn1, lines1), (_, warn2, lines2) = results
+        assert not warn0
+        assert not warn2
+        assert lines0
+        assert lines2
+        assert lines1 is None
+        assert warn1[0].startswith("Cannot process file: KeyError")
+
+
+def _crash(f, **kwargs):
+    """Kill the worker process for hyer.yaml; process other files normally."""
+    if f.endswith("hyer.yaml"):
+        os._exit(1)
+    return _file_lines(f, **kwargs)
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="the workers must inherit the patched function",
+)
+def test_dead_worker(monkeypatch, tmp_path):
+    """A worker that dies only loses the file it was processing."""
+    files = ["test/qi.yaml", "test/hyer.yaml", "test/unknown.yaml"] * 2
+    files += sorted(str(p) for p in Path("test").glob("*.yaml"))
+    kwargs = {"eng": True, "mat": False, "fea": False}
+    expected = list(_map_files(files, 1, **kwargs))
+    monkeypatch.setattr(console, "_file_lines", _crash)
+    cache = ResultCache(tmp_path)
+    for jobs, c in ((2, None), (3, None), (2, cache)):
+        results = list(_map_files(files, jobs, c, **kwargs))
+        assert [f for f, _, _ in results] == files
+        for (f, warn, lines), ref in zip(results, expected):
+            if f.endswith("hyer.yaml"):
+                assert warn[0].startswith("Cannot process file: BrokenProcessPool")
+                assert lines is None
+            else:
+                assert (f, warn, lines) == ref
+    # The file that killed its worker is not cached.
+    assert cache.stats()["entries"] == len(set(files)) - 1
+
+
+def test_negative_jobs():
+    """A negative number of jobs is rejected."""
+    assert non_negative_int("0") == 0
+    with pytest.raises(argparse.ArgumentTypeError):
+        non_negative_int("-2")
+    with pytest.raises(ValueError, match="negative"):
+        list(_map_files(["test/hyer.yaml"], -1, eng=True, mat=False, fea=False))
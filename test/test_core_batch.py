@@ -0,0 +1,122 @@
+# file: test_core_batch.py
+#
+# Tests for the vectorized lamina calculations.
+
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(1, ".")
+from lamprop.core.batch import LaminaBatch, LaminateBatch, lamina_batch, laminate_batch
+from lamprop.core.fiber import fiber
+from lamprop.core.lamina import lamina
+from lamprop.core.laminate import laminate
+from lamprop.core.resin import resin
+
+hf = fiber(233000, 0.2, -0.54e-6, 1.76, "Hyer's carbon fiber")
+hr = resin(4620, 0.36, 41.4e-6, 1.1, "Hyer's resin")
+gf = fiber(73000, 0.33, 5.3e-6, 2.60, "e-glas")
+pr = resin(4000, 0.36, 40e-6, 1.20, "polyester")
+
+_fields = (
+    "thickness",
+    "resin_weight",
+    "E1",
+    "E2",
+    "E3",
+    "G12",
+    "G13",
+    "G23",
+    "nu12",
+    "nu13",
+    "nu23",
+    "alpha_x",
+    "alpha_y",
+    "alpha_xy",
+    "Q11_bar",
+    "Q12_bar",
+    "Q16_bar",
+    "Q22_bar",
+    "Q26_bar",
+    "Q66_bar",
+    "Q44_bar_s",
+    "Q55_bar_s",
+    "Q45_bar_s",
+    "rho",
+)
+
+
+def test_lamina_batch():
+    """Compare lamina_batch with lamina."""
+    fibers = [hf, gf, hf, gf, hf]
+    resins = [hr, hr, pr, pr, hr]
+    weights = [100, 200, 300, 450, 600]
+    angles = [0, 90, 45, -30, 12.5]
+    vfs = [0.5, 0.4, 0.55, 0.6, 0.35]
+    batch = lamina_batch(fibers, resins, weights, angles, vfs)
+    assert len(batch) == 5
+    assert batch.C.shape == (5, 6, 6)
+    for k, args in enumerate(zip(fibers, resins, weights, angles, vfs)):
+        la = lamina(*args)
+        for name in _fields:
+            assert np.isclose(getattr(batch, name)[k], getattr(la, name), rtol=1e-12)
+        np.testing.assert_allclose(batch.C[k], la.C, rtol=1e-12, atol=1e-9)
+
+
+def test_lamina_batch_broadcast():
+    """Scalar arguments and single materials are used for all laminae."""
+    angles = np.linspace(-90, 90, 7)
+    batch = lamina_batch(hf, hr, 100, angles, 0.5)
+    assert len(batch) == 7
+    np.testing.assert_array_equal(batch.angle, angles)
+    assert np.allclose(batch.thickness, lamina(hf, hr, 100, 0, 0.5).thickness)
+    assert np.isclose(batch.Q11_bar[3], lamina(hf, hr, 100, 0, 0.5).Q11_bar)
+
+
+def test_lamina_batch_invalid():
+    """Invalid weights and fiber volume fractions are rejected."""
+    with pytest.raises(ValueError, match="fiber weight"):
+        lamina_batch(hf, hr, [100, 0], 0, 0.5)
+    with pytest.raises(ValueError, match=r"lamina 2\)"):
+        lamina_batch(hf, hr, 100, 0, [0.5, 0.6, 1.2])
+    with pytest.raises(ValueError, match="volume fraction"):
+        lamina_batch(hf, hr, 100, 0, np.nan)
+
+
+def test_laminate_batch():
+    """Compare laminate_batch with laminate."""
+    plies = lamina_batch(hf, hr, 100, [0, 90, 45, -45], 0.5)
+    laminae = [lamina(hf, hr, 100, a, 0.5) for a in (0, 90, 45, -45)]
+    stacks = [[0, 0, 0, 0], [0, 1, 1, 0], [2, 3, 3, 2], [0, 1, 2, 3, 3, 2, 1, 0], [2]]
+    batch = laminate_batch(plies, stacks)
+    assert len(batch) == len(stacks)
+    for k, stack in enumerate(stacks):
+        lam = laminate("test", [laminae[j] for j in stack])
+        for name in LaminateBatch.model_fields:
+            np.testing.assert_allclose(
+                getattr(batch, name)[k], getattr(lam, name), rtol=1e-9, atol=1e-12
+            )
+
+
+def test_laminate_batch_padded():
+    """Padded index arrays give the same result as ragged stacks."""
+    plies = LaminaBatch.from_laminae(
+        [lamina(hf, hr, 100, 0, 0.5), lamina(gf, pr, 300, 45, 0.4)]
+    )
+    ragged = laminate_batch(plies, [[0, 1, 1, 0], [1, 0]])
+    padded = laminate_batch(plies, np.array([[0, 1, 1, 0], [1, 0, -1, -1]]))
+    np.testing.assert_allclose(ragged.ABD, padded.ABD)
+    np.testing.assert_allclose(ragged.Ex, padded.Ex)
+
+
+def test_laminate_batch_empty():
+    """Missing stacks and stacks without plies are rejected."""
+    plies = lamina_batch(hf, hr, 100, [0, 90], 0.5)
+    for stacks in ([], np.empty((0, 4), dtype=int)):
+        with pytest.raises(ValueError, match="no laminates"):
+            laminate_batch(plies, stacks)
+    with pytest.raises(ValueError, match="stack 1 has no plies"):
+        laminate_batch(plies, [[0, 1], []])
+    with pytest.raises(ValueError, match="stack 0 has no plies"):
+        laminate_batch(plies, np.array([[-1, -1], [0, 1]]))
@@ -0,0 +1,80 @@
+# file: test_core_cache.py
+#
+# Tests for the lamina cache.
+
+import sys
+
+import pytest
+from pydantic import ValidationError
+
+sys.path.insert(1, ".")
+from lamprop.core.cache import LaminaCache
+from lamprop.core.fiber import fiber
+from lamprop.core.lamina import lamina
+from lamprop.core.resin import resin
+
+hf = fiber(233000, 0.2, -0.54e-6, 1.76, "Hyer's carbon fiber")
+hr = resin(4620, 0.36, 41.4e-6, 1.1, "Hyer's resin")
+
+
+def test_hits_and_misses():
+    """Equal materials share entries, even when they are different objects."""
+    cache = LaminaCache(maxsize=10)
+    a = cache.lamina(hf, hr, 100, 45, 0.5)
+    b = cache.lamina(
+        hf.model_copy(), resin(4620, 0.36, 41.4e-6, 1.1, hr.name), 100, 45, 0.5
+    )
+    assert a is b
+    assert (cache.hits, cache.misses) == (1, 1)
+    c = cache.lamina(hf, hr, 100, -45, 0.5)
+    assert c is not a
+    assert c.Q16_bar == lamina(hf, hr, 100, -45, 0.5).Q16_bar
+    assert cache.info() == {"hits": 1, "misses": 2, "size": 2, "maxsize": 10}
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_eviction():
+    """The least recently used entries are evicted first."""
+    cache = LaminaCache(maxsize=2)
+    first = cache.lamina(hf, hr, 100, 0, 0.5)
+    cache.lamina(hf, hr, 100, 90, 0.5)
+    assert cache.lamina(hf, hr, 100, 0, 0.5) is first
+    cache.lamina(hf, hr, 100, 45, 0.5)
+    assert len(cache) == 2
+    assert cache.lamina(hf, hr, 100, 0, 0.5) is first
+    assert cache.misses == 3
+    cache.maxsize = 1
+    assert len(cache) == 1
+    cache.maxsize = 0
+    assert len(cache) == 0
+    cache.lamina(hf, hr, 100, 0, 0.5)
+    assert len(cache) == 0
+
+
+def test_shared_laminae_are_frozen():
+    """Callers share cached laminae, so they cannot be changed."""
+    cache = LaminaCache(maxsize=10)
+    a = cache.lamina(hf, hr, 100, 45, 0.5)
+    assert cache.lamina(hf, hr, 100, 45, 0.5) is a
+    with pytest.raises(ValidationError):
+        a.angle = 0
+
+
+def test_nested_contents():
+    """Fibers with strengths and temperature tables are keyed on them too."""
+    cache = LaminaCache(maxsize=10)
+    table = {"T": [20, 100], "E1": [233000, 220000]}
+    a = cache.lamina(
+        fiber(233000, 0.2, -0.54e-6, 1.76, "f", temperature=table), hr, 100, 0, 0.5
+    )
+    b = cache.lamina(
+        fiber(233000, 0.2, -0.54e-6, 1.76, "f", temperature=table), hr, 100, 0, 0.5
+    )
+    table = {"T": [20, 100], "E1": [233000, 200000]}
+    c = cache.lamina(
+        fiber(233000, 0.2, -0.54e-6, 1.76, "f", temperature=table), hr, 100, 0, 0.5
+    )
+    assert a is b
+    assert c is not a
@@ -0,0 +1,91 @@
+# file: test_core_failure.py
+#
+# Tests for first ply failure.
+
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(1, ".")
+from lamprop.core.failure import first_ply_failure
+from lamprop.core.fiber import fiber
+from lamprop.core.lamina import lamina
+from lamprop.core.laminate import laminate
+from lamprop.core.resin import resin
+from lamprop.core.strength import strength
+from lamprop.core.stress import ply_response
+
+st = strength(1500, 1200, 50, 200, 70)
+hf = fiber(233000, 0.2, -0.54e-6, 1.76, "Hyer's carbon fiber", st)
+hr = resin(4620, 0.36, 41.4e-6, 1.1, "Hyer's resin")
+
+
+def test_ud_max_stress():
+    """Uniaxial loads on a unidirectional laminate."""
+    la = lamina(hf, hr, 100, 0, 0.5)
+    ud = laminate("ud", [la, la])
+    t = ud.thickness
+    loads = np.array(
+        [
+            [1, 0, 0, 0, 0, 0],
+            [-1, 0, 0, 0, 0, 0],
+            [0, 1, 0, 0, 0, 0],
+            [0, 0, 1, 0, 0, 0],
+        ]
+    )
+    r = first_ply_failure(ud, loads, "max_stress")
+    assert r.reserve.shape == (4, 2)
+    np.testing.assert_allclose(r.min_reserve, [1500 * t, 1200 * t, 50 * t, 70 * t])
+    np.testing.assert_allclose(r.index * r.reserve, 1)
+    # Hashin and Tsai-Wu agree with max stress for uniaxial fiber loads.
+    for criterion in ("hashin", "tsai_wu"):
+        rc = first_ply_failure(ud, loads[:2], criterion)
+        np.testing.assert_allclose(rc.min_reserve, [1500 * t, 1200 * t])
+
+
+def test_cross_ply():
+    """The 90° plies of a cross-ply laminate fail first in tension."""
+    A = lamina(hf, hr, 100, 0, 0.5)
+    B = lamina(hf, hr, 100, 90, 0.5)
+    cp = laminate("cp", [A, B, B, A])
+    loads = np.array([[100.0, 0, 0, 0, 0, 0]] * 3) * [[1], [2], [-1]]
+    for criterion in ("max_stress", "max_strain", "tsai_wu", "hashin"):
+        r = first_ply_failure(cp, loads, criterion)
+        assert r.critical_ply[0] in (1, 2)
+        # The reserve factor scales inversely with the load.
+        np.testing.assert_allclose(r.reserve[1], r.reserve[0] / 2)
+        assert np.all(r.min_reserve == r.reserve.min(axis=1))
+
+
+def test_tsai_wu_reserve():
+    """At the reserve factor the Tsai-Wu criterion equals one."""
+    rng = np.random.default_rng(2)
+    layers = [lamina(hf, hr, 100, a, 0.5) for a in (0, 45, -45, 90, 30)]
+    lam = laminate("mixed", layers)
+    loads = rng.normal(size=(10, 6)) * [100, 100, 50, 10, 10, 5]
+    r = first_ply_failure(lam, loads, "tsai_wu", dT=-80)
+    R = r.min_reserve
+    s = ply_response(lam, loads * R[:, None], dT=-80).stress12
+    k = np.arange(len(loads))
+    s1, s2, t = s[k, r.critical_ply].transpose(2, 0, 1)
+    F11, F22 = 1 / (1500 * 1200), 1 / (50 * 200)
+    fi = (
+        (1 / 1500 - 1 / 1200) * s1
+        + (1 / 50 - 1 / 200) * s2
+        + F11 * s1 * s1
+        + F22 * s2 * s2
+        + t * t / 70**2
+        - np.sqrt(F11 * F22) * s1 * s2
+    )
+    np.testing.assert_allclose(fi.max(axis=1), 1)
+
+
+def test_missing_strength():
+    """Strengths are required."""
+    la = lamina(fiber(233000, 0.2, -0.54e-6, 1.76, "no strength"), hr, 100, 0, 0.5)
+    ud = laminate("ud", [la])
+    with pytest.raises(ValueError, match="no strength for ply 0"):
+        first_ply_failure(ud, [[1, 0, 0, 0, 0, 0]])
+    r = first_ply_failure(ud, [[1, 0, 0, 0, 0, 0]], "max_stress", strengths=st)
+    np.testing.assert_allclose(r.min_reserve, 1500 * ud.thickness)
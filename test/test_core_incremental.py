@@ -0,0 +1,161 @@
+# file: test_core_incremental.py
+#
+# Tests for the incremental laminate builder.
+
+import gc
+import sys
+import weakref
+
+import numpy as np
+import pytest
+
+sys.path.insert(1, ".")
+from lamprop.core.fiber import fiber
+from lamprop.core.incremental import LaminateBuilder
+from lamprop.core.lamina import lamina
+from lamprop.core.laminate import laminate
+from lamprop.core.resin import resin
+
+hf = fiber(233000, 0.2, -0.54e-6, 1.76, "Hyer's carbon fiber")
+hr = resin(4620, 0.36, 41.4e-6, 1.1, "Hyer's resin")
+gf = fiber(73000, 0.33, 5.3e-6, 2.60, "e-glas")
+
+_names = (
+    "thickness",
+    "fiber_weight",
+    "rho",
+    "vf",
+    "resin_weight",
+    "ABD",
+    "abd",
+    "H",
+    "Ex",
+    "Ey",
+    "Ez",
+    "Gxy",
+    "Gxz",
+    "Gyz",
+    "nu_xy",
+    "alpha_x",
+    "alpha_y",
+    "C",
+    "tEx",
+    "t_nu_yz",
+)
+
+
+def same(builder, layers):
+    """Check the builder against laminate()."""
+    assert len(builder.layers) == len(layers)
+    assert all(a is b for a, b in zip(builder.layers, layers))
+    lam = builder.laminate("test")
+    ref = laminate("test", layers)
+    for name in _names:
+        a, b = np.asarray(getattr(lam, name)), np.asarray(getattr(ref, name))
+        np.testing.assert_allclose(a, b, rtol=1e-9, atol=1e-9 * np.max(np.abs(b)))
+
+
+def test_builder():
+    """Insert, remove and replace plies of different thickness."""
+    A = lamina(hf, hr, 100, 0, 0.5)
+    B = lamina(hf, hr, 200, 45, 0.55)
+    C = lamina(gf, hr, 300, -30, 0.4)
+    D = lamina(hf, hr, 150, 90, 0.6)
+    layers = [A, B, C]
+    b = LaminateBuilder(layers)
+    same(b, layers)
+    b.insert(1, D)
+    layers.insert(1, D)
+    same(b, layers)
+    b.insert(0, C)
+    layers.insert(0, C)
+    same(b, layers)
+    assert b.remove(2) is layers.pop(2)
+    same(b, layers)
+    E = lamina(hf, hr, 100, -45, 0.5)
+    b.replace(1, E)
+    layers[1] = E
+    same(b, layers)
+    b.replace(-1, D)
+    layers[-1] = D
+    same(b, layers)
+    b.append(A)
+    layers.append(A)
+    same(b, layers)
+    assert len(b) == 5
+
+
+def test_random_edits():
+    """Many random edits stay equal to laminate()."""
+    rng = np.random.default_rng(7)
+    plies = [lamina(hf, hr, w, a, 0.5) for w in (100, 250) for a in (0, 45, -45, 90)]
+    layers = [plies[0], plies[5]]
+    b = LaminateBuilder(layers)
+    for _ in range(200):
+        op = rng.integers(3) if len(layers) > 2 else 0
+        k = int(rng.integers(len(layers)))
+        la = plies[rng.integers(len(plies))]
+        if op == 0:
+            b.insert(k, la)
+            layers.insert(k, la)
+        elif op == 1:
+            b.remove(k)
+            layers.pop(k)
+        else:
+            b.replace(k, la)
+            layers[k] = la
+    same(b, layers)
+
+
+def test_cached_result():
+    """The laminate is only derived again after a change."""
+    b = LaminateBuilder([lamina(hf, hr, 100, 0, 0.5)])
+    first = b.laminate("x")
+    assert b.laminate("x") is first
+    b.append(lamina(hf, hr, 100, 90, 0.5))
+    assert b.laminate("x") is not first
+    b.remove(0)
+    b.remove(0)
+    with pytest.raises(ValueError, match="no plies"):
+        b.laminate("x")
+
+
+def test_many_edits():
+    """The sums do not drift over many edits of a thick laminate."""
+    rng = np.random.default_rng(11)
+    plies = [lamina(hf, hr, w, a, 0.5) for w in (100, 250) for a in (0, 45, -45, 90)]
+    layers = [plies[k % 8] for k in range(40)]
+    b = LaminateBuilder(layers)
+    b.resum_interval = 500
+    for _ in range(5000):
+        k = int(rng.integers(len(layers)))
+        if rng.integers(2):
+            la = plies[rng.integers(len(plies))]
+            b.replace(k, la)
+            layers[k] = la
+        else:
+            # Move a ply, which shifts the plies in between.
+            la = b.remove(k)
+            layers.pop(k)
+            j = int(rng.integers(len(layers) + 1))
+            b.insert(j, la)
+            layers.insert(j, la)
+    same(b, layers)
+    before = b.ABD
+    b.resum()
+    np.testing.assert_allclose(b.ABD, before, rtol=1e-12, atol=1e-9)
+    same(b, layers)
+
+
+def test_released_plies():
+    """Plies that were removed are not kept alive by the builder."""
+    b = LaminateBuilder()
+    refs = []
+    for k in range(200):
+        la = lamina(hf, hr, 100, k, 0.5)
+        refs.append(weakref.ref(la))
+        b.append(la)
+        b.remove(0)
+    del la
+    gc.collect()
+    assert sum(r() is not None for r in refs) < 100
@@ -5,9 +5,11 @@
 import math
 import sys
 
+import pytest
+
 sys.path.insert(1, ".")
 from lamprop.core.fiber import fiber
-from lamprop.core.lamina import lamina
+from lamprop.core.lamina import check_ply, lamina
 from lamprop.core.resin import resin
 
 hf = fiber(233000, 0.2, -0.54e-6, 1.76, "Hyer's carbon fiber")
@@ -34,6 +36,17 @@ def test_lamina():
     )
 
 
+def test_lamina_validation():
+    """Test lamina input checks."""
+    with pytest.raises(ValueError, match="fiber weight"):
+        lamina(hf, hr, 0, 0, 0.5)  # fiber_weight <= 0
+    with pytest.raises(ValueError, match="volume fraction"):
+        lamina(hf, hr, 100, 0, 1.2)  # vf > 1
+    with pytest.raises(ValueError, match="volume fraction"):
+        lamina(hf, hr, 100, 0, 0)  # vf <= 0
+    check_ply(100, 1)
+
+
 # From old test_parser.py
 def test_good_lamina():
     """Test good lamina."""
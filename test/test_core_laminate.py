@@ -134,3 +134,19 @@ def test_qi():
     assert math.isclose(qi.t_nu_xy, 0.32283, rel_tol=0.01)
     assert math.isclose(qi.t_nu_xz, 0.31239, rel_tol=0.01)
     assert math.isclose(qi.t_nu_yz, 0.31239, rel_tol=0.01)
+
+
+def test_lazy():
+    """Test that lazy laminates calculate derived properties on first use."""
+    A = lamina(hf, hr, 100, 0, 0.5)
+    B = lamina(hf, hr, 100, 90, 0.5)
+    eager = laminate("pw", [A, B, B, A])
+    lazy = laminate("pw", [A, B, B, A], lazy=True)
+    assert "abd" in vars(eager)
+    assert "abd" not in vars(lazy)
+    assert "S" not in vars(lazy)
+    assert math.isclose(lazy.Ex, eager.Ex)
+    assert "abd" in vars(lazy)
+    assert "S" not in vars(lazy)
+    assert math.isclose(lazy.t_nu_xz, eager.t_nu_xz)
+    assert set(lazy.model_dump()) == set(eager.model_dump())
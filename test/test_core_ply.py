@@ -0,0 +1,73 @@
+# file: test_core_ply.py
+#
+# Tests for the angle-independent ply material.
+
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(1, ".")
+from lamprop.core.fiber import fiber
+from lamprop.core.lamina import lamina
+from lamprop.core.laminate import laminate
+from lamprop.core.ply import ply_material
+from lamprop.core.resin import resin
+
+hf = fiber(233000, 0.2, -0.54e-6, 1.76, "Hyer's carbon fiber")
+hr = resin(4620, 0.36, 41.4e-6, 1.1, "Hyer's resin")
+
+_fields = (
+    "thickness",
+    "E2",
+    "G23",
+    "nu23",
+    "alpha_x",
+    "alpha_y",
+    "alpha_xy",
+    "Q11_bar",
+    "Q12_bar",
+    "Q16_bar",
+    "Q22_bar",
+    "Q26_bar",
+    "Q66_bar",
+    "Q44_bar_s",
+    "Q55_bar_s",
+    "Q45_bar_s",
+    "rho",
+)
+
+
+def test_rotation():
+    """Rotated plies are the same as those made by lamina."""
+    pm = ply_material(hf, hr, 100, 0.5)
+    scale = pm.Q11
+    for angle in (0, 15, 30, 45, -45, -60, 90, 123.4):
+        ref = lamina(hf, hr, 100, angle, 0.5)
+        la = pm.lamina(angle)
+        assert la.angle == angle
+        for name in _fields:
+            a, b = getattr(la, name), getattr(ref, name)
+            assert a == pytest.approx(b, rel=1e-12, abs=scale * 1e-14)
+        np.testing.assert_allclose(la.C, ref.C, rtol=1e-12, atol=scale * 1e-14)
+
+
+def test_batch_and_laminate():
+    """Arrays of angles and stacks given as material plus angles."""
+    pm = ply_material(hf, hr, 100, 0.5)
+    angles = [0, 90, 45, -45, -45, 45, 90, 0]
+    batch = pm.batch(angles)
+    assert batch.C.shape == (8, 6, 6)
+    np.testing.assert_allclose(
+        batch.Q16_bar[2:4], [pm.lamina(45).Q16_bar, pm.lamina(-45).Q16_bar]
+    )
+    qi = pm.laminate("qi", angles)
+    ref = laminate("qi", [lamina(hf, hr, 100, a, 0.5) for a in angles])
+    for name in ("Ex", "Ey", "Gxy", "nu_xy", "alpha_x", "tEz", "t_nu_xz"):
+        assert getattr(qi, name) == pytest.approx(getattr(ref, name), rel=1e-10)
+    direct = laminate("qi", pm, angles=angles)
+    np.testing.assert_array_equal(direct.ABD, qi.ABD)
+    with pytest.raises(TypeError):
+        laminate("qi", pm)
+    with pytest.raises(TypeError):
+        laminate("qi", qi.layers, angles=angles)
@@ -0,0 +1,61 @@
+# file: test_core_polar.py
+#
+# Tests for the laminate properties as a function of the direction.
+
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(1, ".")
+from lamprop.core.fiber import fiber
+from lamprop.core.lamina import lamina
+from lamprop.core.laminate import laminate
+from lamprop.core.polar import polar, principal_directions
+from lamprop.core.resin import resin
+
+hf = fiber(233000, 0.2, -0.54e-6, 1.76, "Hyer's carbon fiber")
+hr = resin(4620, 0.36, 41.4e-6, 1.1, "Hyer's resin")
+angles = [0, 30, -45, 90, 15, 0]
+
+
+def make(angles, rotation=0.0):
+    return laminate("test", [lamina(hf, hr, 200, a - rotation, 0.5) for a in angles])
+
+
+@pytest.mark.parametrize("theta", [0.0, 10.0, 33.3, -70.0, 200.0])
+def test_rotated_laminate(theta):
+    """The properties in a direction are those of the rotated laminate."""
+    curves = polar(make(angles), [theta])
+    ref = make(angles, theta)
+    for name in ("Ex", "Ey", "Gxy", "nu_xy", "nu_yx", "alpha_x", "alpha_y"):
+        assert getattr(curves, name)[0] == pytest.approx(getattr(ref, name), rel=1e-9)
+    for name in ("tEx", "tEy", "tGxy", "t_nu_xy"):
+        assert getattr(curves, name)[0] == pytest.approx(getattr(ref, name), rel=1e-9)
+    for name in ("ABD", "abd", "C", "S"):
+        value, expected = getattr(curves, name)[0], getattr(ref, name)
+        scale = np.max(np.abs(expected))
+        assert np.max(np.abs(value - expected)) < 1e-9 * scale
+
+
+def test_default_angles():
+    """By default the properties are given for every degree."""
+    lam = make(angles)
+    curves = polar(lam)
+    assert curves.angles.shape == (360,)
+    assert curves.ABD.shape == (360, 6, 6)
+    assert curves.Ex[0] == pytest.approx(lam.Ex)
+    # Properties repeat every 180°.
+    assert curves.Ex[:180] == pytest.approx(curves.Ex[180:])
+
+
+def test_principal_directions():
+    """The directions of the largest and smallest Ex."""
+    lam = make(angles)
+    stiff, soft = principal_directions(lam)
+    fine = polar(lam, np.arange(0, 180, 0.001))
+    assert stiff == pytest.approx(fine.angles[np.argmax(fine.Ex)], abs=1e-3)
+    assert soft == pytest.approx(fine.angles[np.argmin(fine.Ex)], abs=1e-3)
+    assert principal_directions(make([0])) == pytest.approx([0.0, 59.8], abs=0.1)
+    qi = make([0, 45, -45, 90, 90, -45, 45, 0])
+    assert np.all(np.isnan(principal_directions(qi)))
@@ -0,0 +1,71 @@
+# file: test_core_progressive.py
+#
+# Tests for progressive ply failure.
+
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(1, ".")
+from lamprop.core.failure import first_ply_failure
+from lamprop.core.fiber import fiber
+from lamprop.core.lamina import lamina
+from lamprop.core.laminate import laminate
+from lamprop.core.progressive import _degraded_q, progressive_failure
+from lamprop.core.resin import resin
+from lamprop.core.strength import strength
+from lamprop.core.stress import ply_arrays
+
+st = strength(1500, 1200, 50, 200, 70)
+hf = fiber(233000, 0.2, -0.54e-6, 1.76, "Hyer's carbon fiber", st)
+hr = resin(4620, 0.36, 41.4e-6, 1.1, "Hyer's resin")
+layers = [lamina(hf, hr, 100, a, 0.5) for a in (0, 45, -45, 90, 90, -45, 45, 0)]
+qi = laminate("qi", layers)
+
+
+def test_first_ply():
+    """The first step is first ply failure."""
+    theta = np.linspace(0, 2 * np.pi, 24)
+    directions = np.zeros((24, 6))
+    directions[:, 0], directions[:, 2] = np.cos(theta), np.sin(theta)
+    for criterion in ("max_stress", "max_strain", "tsai_wu", "hashin"):
+        r = progressive_failure(qi, directions, criterion)
+        fpf = first_ply_failure(qi, directions, criterion)
+        np.testing.assert_allclose(r.first_ply, fpf.min_reserve)
+        np.testing.assert_array_equal(r.failed_ply[:, 0], fpf.critical_ply)
+        assert np.all(r.last_ply >= r.first_ply)
+        # Every ply fails twice.
+        assert np.all(np.sum(r.failed_ply >= 0, axis=1) == 16)
+
+
+def test_history():
+    """The deformations follow from the degraded laminate at every step."""
+    directions = np.random.default_rng(3).normal(size=(5, 6))
+    r = progressive_failure(qi, directions, knockdown=0.1)
+    Q = _degraded_q(layers, 0.1)
+    z = ply_arrays(qi)["z"]
+    m = [(z[:, 1] ** k - z[:, 0] ** k) / k for k in (1, 2, 3)]
+    for path in range(5):
+        level = np.zeros(len(layers), dtype=int)
+        for step in range(r.failed_ply.shape[1]):
+            ply = r.failed_ply[path, step]
+            if ply < 0:
+                break
+            Qp = Q[level, np.arange(len(layers))]
+            A, B, D = (np.einsum("p,pij->ij", mk, Qp) for mk in m)
+            ABD = np.block([[A, B], [B, D]])
+            expected = r.load_factor[path, step] * np.linalg.solve(
+                ABD, directions[path]
+            )
+            np.testing.assert_allclose(
+                r.deformation[path, step], expected, rtol=1e-7, atol=1e-12
+            )
+            level[ply] += 1
+            assert r.level[path, step] == level[ply]
+
+
+def test_knockdown():
+    """The knockdown factor must be a fraction."""
+    with pytest.raises(ValueError, match="knockdown"):
+        progressive_failure(qi, [[1, 0, 0, 0, 0, 0]], knockdown=0)
@@ -0,0 +1,62 @@
+# file: test_core_sensitivity.py
+#
+# Tests for the derivatives of laminate properties.
+
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(1, ".")
+from lamprop.core.fiber import fiber
+from lamprop.core.lamina import lamina
+from lamprop.core.laminate import laminate
+from lamprop.core.resin import resin
+from lamprop.core.sensitivity import laminate_sensitivity
+
+hf = fiber(233000, 0.2, -0.54e-6, 1.76, "Hyer's carbon fiber")
+gf = fiber(73000, 0.33, 5.3e-6, 2.60, "E-glass")
+hr = resin(4620, 0.36, 41.4e-6, 1.1, "Hyer's resin")
+fibers = [hf, gf, hf, hf, gf]
+angles = [0, 30, -60, 90, 15]
+weights = [100, 200, 150, 300, 250]
+names = ["ABD", "abd", "Nt", "Ex", "Ey", "Gxy", "nu_xy", "nu_yx", "alpha_x", "alpha_y"]
+
+
+def make(angles, weights, vf=0.5):
+    layers = [lamina(f, hr, w, a, vf) for f, w, a in zip(fibers, weights, angles)]
+    return laminate("unsymmetric", layers)
+
+
+def central(name, lo, hi, h):
+    return (np.asarray(getattr(hi, name)) - np.asarray(getattr(lo, name))) / (2 * h)
+
+
+def check(name, fd, exact):
+    scale = np.max(np.abs(fd))
+    np.testing.assert_allclose(exact, fd, rtol=0, atol=1e-6 * scale, err_msg=name)
+
+
+@pytest.mark.parametrize(("kind", "h"), [("angle", 1e-4), ("weight", 1e-3)])
+def test_plies(kind, h):
+    """Derivatives to the ply parameters agree with finite differences."""
+    s = laminate_sensitivity(make(angles, weights))
+    for j in range(len(angles)):
+        step = np.zeros(len(angles))
+        step[j] = h
+        if kind == "angle":
+            lo, hi = make(angles - step, weights), make(angles + step, weights)
+        else:
+            lo, hi = make(angles, weights - step), make(angles, weights + step)
+        for name in names:
+            check(name, central(name, lo, hi, h), getattr(s, kind)(name)[j])
+
+
+def test_vf():
+    """Derivatives to the fiber volume fraction agree with finite differences."""
+    s = laminate_sensitivity(make(angles, weights))
+    h = 1e-6
+    lo, hi = make(angles, weights, 0.5 - h), make(angles, weights, 0.5 + h)
+    for name in [*names, "thickness"]:
+        check(name, central(name, lo, hi, h), s.vf(name))
+    assert s.ABD.shape == (11, 6, 6)
@@ -0,0 +1,73 @@
+# file: test_core_stress.py
+#
+# Tests for ply stress and strain recovery.
+
+import sys
+
+import numpy as np
+
+sys.path.insert(1, ".")
+from lamprop.core.fiber import fiber
+from lamprop.core.lamina import lamina
+from lamprop.core.laminate import laminate
+from lamprop.core.resin import resin
+from lamprop.core.stress import ply_response
+
+hf = fiber(233000, 0.2, -0.54e-6, 1.76, "Hyer's carbon fiber")
+hr = resin(4620, 0.36, 41.4e-6, 1.1, "Hyer's resin")
+
+
+def resultants(r):
+    """Integrate the ply stresses over the thickness."""
+    t = r.z[:, 1] - r.z[:, 0]
+    zm = r.z.mean(axis=1)
+    mean = r.stress.mean(axis=2)
+    slope = (r.stress[:, :, 1] - r.stress[:, :, 0]) / t[:, None]
+    N = np.einsum("cpi,p->ci", mean, t)
+    M = np.einsum("cpi,p->ci", mean, t * zm) + np.einsum("cpi,p->ci", slope, t**3 / 12)
+    return np.concatenate((N, M), axis=1)
+
+
+def test_ud():
+    """Tension of a unidirectional laminate."""
+    la = lamina(hf, hr, 100, 0, 0.5)
+    ud = laminate("ud", [la, la, la, la])
+    r = ply_response(ud, [[100.0, 0, 0, 0, 0, 0]])
+    assert r.stress.shape == (1, 4, 2, 3)
+    np.testing.assert_allclose(r.stress[..., 0], 100 / ud.thickness, rtol=1e-9)
+    np.testing.assert_allclose(r.stress12, r.stress, atol=1e-9)
+    np.testing.assert_allclose(r.strain0[0, 0], 100 / (ud.Ex * ud.thickness))
+    np.testing.assert_allclose(r.curvature, 0, atol=1e-15)
+
+
+def test_equilibrium():
+    """The ply stresses add up to the applied loads."""
+    rng = np.random.default_rng(1)
+    layers = [lamina(hf, hr, 100, a, 0.5) for a in (0, 30, -45, 90, 60)]
+    lam = laminate("unsym", layers)
+    loads = rng.normal(size=(20, 6)) * [100, 100, 50, 10, 10, 5]
+    r = ply_response(lam, loads)
+    np.testing.assert_allclose(resultants(r), loads, atol=1e-8)
+    # Material axes of the 30° ply.
+    m, n = np.cos(np.radians(30)), np.sin(np.radians(30))
+    sx, sy, txy = r.stress[:, 1, 0].T
+    np.testing.assert_allclose(
+        r.stress12[:, 1, 0, 1], n * n * sx + m * m * sy - 2 * m * n * txy
+    )
+    ex, ey, gxy = r.strain[:, 1, 1].T
+    np.testing.assert_allclose(
+        r.strain12[:, 1, 1, 2], 2 * m * n * (ey - ex) + (m * m - n * n) * gxy
+    )
+
+
+def test_thermal():
+    """Free thermal expansion of a symmetric laminate."""
+    A = lamina(hf, hr, 100, 0, 0.5)
+    B = lamina(hf, hr, 100, 90, 0.5)
+    cp = laminate("cp", [A, B, B, A])
+    r = ply_response(cp, np.zeros((2, 6)), dT=[-100.0, 50.0])
+    np.testing.assert_allclose(r.strain0[:, 0], [-100 * cp.alpha_x, 50 * cp.alpha_x])
+    np.testing.assert_allclose(resultants(r), 0, atol=1e-9)
+    # Residual stresses: fibers of the 0° plies are in compression on cooling.
+    assert r.stress12[0, 0, 0, 0] < 0
+    assert r.stress12[0, 0, 0, 1] > 0
@@ -0,0 +1,59 @@
+# file: test_core_surrogate.py
+#
+# Tests for the laminate property surrogates.
+
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(1, ".")
+from lamprop.core.fiber import fiber
+from lamprop.core.lamina import lamina
+from lamprop.core.laminate import laminate
+from lamprop.core.resin import resin
+from lamprop.core.surrogate import laminate_surrogate
+
+hf = fiber(233000, 0.2, -0.54e-6, 1.76, "Hyer's carbon fiber")
+hr = resin(4620, 0.36, 41.4e-6, 1.1, "Hyer's resin")
+qi = [0, 45, -45, 90, 90, -45, 45, 0]
+
+
+def test_vf():
+    """Fit over vf only."""
+    s = laminate_surrogate(hf, hr, qi, 200, (0.35, 0.7))
+    assert s.report.worst[1] < 1e-7
+    for vf in (0.35, 0.42, 0.7):
+        lam = laminate("qi", [lamina(hf, hr, 200, a, vf) for a in qi])
+        assert s.evaluate("Ex", vf) == pytest.approx(lam.Ex, rel=1e-7)
+        np.testing.assert_allclose(s(vf)["C"], lam.C, rtol=1e-7, atol=1e-3)
+    vf = np.linspace(0.4, 0.6, 11).reshape(1, 11)
+    assert s.evaluate("ABD", vf).shape == (1, 11, 6, 6)
+    with pytest.raises(ValueError, match="outside the range"):
+        s.evaluate("Ex", 0.8)
+
+
+@pytest.mark.parametrize(
+    ("param", "bounds", "value"),
+    [("rotation", (0, 90), 30), ("weight", (100, 600), 450)],
+)
+def test_param(param, bounds, value):
+    """Fit over vf and a second parameter."""
+    angles = [0, 90, 30, -30]
+    s = laminate_surrogate(
+        hf,
+        hr,
+        angles,
+        200,
+        (0.4, 0.6),
+        param=param,
+        param_range=bounds,
+        param_degree=20,
+    )
+    assert s.report.worst[1] < 1e-5
+    rotation, weight = (value, 200) if param == "rotation" else (0, value)
+    layers = [lamina(hf, hr, weight, a + rotation, 0.5) for a in angles]
+    lam = laminate("ref", layers)
+    assert s.evaluate("Gxy", 0.5, value) == pytest.approx(lam.Gxy, rel=1e-5)
+    with pytest.raises(ValueError, match="is required"):
+        s.evaluate("Gxy", 0.5)
@@ -0,0 +1,84 @@
+# file: test_core_thermal.py
+#
+# Tests for temperature dependent materials and thermal sweeps.
+
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(1, ".")
+from lamprop.core.fiber import fiber
+from lamprop.core.lamina import lamina
+from lamprop.core.laminate import laminate
+from lamprop.core.resin import Resin, resin
+from lamprop.core.stress import ply_response
+from lamprop.core.thermal import thermal_sweep
+
+hf = fiber(233000, 0.2, -0.54e-6, 1.76, "Hyer's carbon fiber")
+hr = resin(4620, 0.36, 41.4e-6, 1.1, "Hyer's resin")
+table = {"T": [-55, 23, 120], "E": [5500, 4620, 2500], "alpha": [35e-6, 41.4e-6, 60e-6]}
+tr = resin(4620, 0.36, 41.4e-6, 1.1, "hot resin", temperature=table)
+angles = [0, 30, -45, 90, 15, 0]
+
+
+def make(r):
+    return laminate("test", [lamina(hf, r, 200, a, 0.5) for a in angles])
+
+
+def test_constant_properties():
+    """Without tables the result is the linear thermal response."""
+    lam = make(hr)
+    T = np.array([-55.0, 0.0, 23.0, 120.0])
+    rv = thermal_sweep(lam, T, 120)
+    ref = ply_response(lam, np.zeros((4, 6)), T - 120)
+    assert rv.Ex == pytest.approx(np.full(4, lam.Ex))
+    assert rv.alpha_x == pytest.approx(np.full(4, lam.alpha_x))
+    assert np.allclose(rv.stress, ref.stress, rtol=1e-10, atol=1e-9)
+    assert np.allclose(rv.stress12, ref.stress12, rtol=1e-10, atol=1e-9)
+    expected = np.concatenate((ref.strain0, ref.curvature), axis=1)
+    assert np.allclose(rv.deformation, expected, rtol=1e-10, atol=1e-15)
+    assert np.all(rv.stress[-1] == 0)
+
+
+def test_table_values():
+    """At a temperature in the table the properties are those of the table."""
+    rv = thermal_sweep(make(tr), [-55, 120], 120)
+    cold = make(resin(5500, 0.36, 35e-6, 1.1, "cold"))
+    hot = make(resin(2500, 0.36, 60e-6, 1.1, "hot"))
+    assert rv.Ex == pytest.approx([cold.Ex, hot.Ex])
+    assert rv.alpha_x == pytest.approx([cold.alpha_x, hot.alpha_x])
+    # Outside the table the nearest values are used.
+    assert thermal_sweep(make(tr), [-80], 120).Ex == pytest.approx([cold.Ex])
+
+
+def test_integration_step():
+    """The result converges with the step and follows the table values."""
+    lam = make(tr)
+    coarse = thermal_sweep(lam, [-55.0, 23.0], 120)
+    fine = thermal_sweep(lam, [-55.0, 23.0], 120, step=0.1)
+    scale = np.max(np.abs(fine.stress))
+    assert np.max(np.abs(coarse.stress - fine.stress)) < 1e-4 * scale
+    # Over most of the range the resin is softer than 4620 MPa, which
+    # reduces the stresses.
+    soft = {"T": [-55, 120], "E": [6000, 2500]}
+    lam = make(resin(4620, 0.36, 41.4e-6, 1.1, "r", temperature=soft))
+    stress = thermal_sweep(lam, [-55.0], 120).stress
+    linear = ply_response(lam, np.zeros((1, 6)), -175.0).stress
+    assert np.max(np.abs(stress)) < 0.97 * np.max(np.abs(linear))
+
+
+def test_table_validation():
+    """Malformed temperature tables are rejected; valid ones are kept."""
+    with pytest.raises(ValueError, match="needs 2 values"):
+        resin(4620, 0.36, 41.4e-6, 1.1, "r", temperature={"T": [0, 20], "E": [1]})
+    with pytest.raises(ValueError, match="must be increasing"):
+        resin(4620, 0.36, 41.4e-6, 1.1, "r", temperature={"T": [20, 0], "E": [1, 2]})
+    with pytest.raises(ValueError, match="rho cannot depend"):
+        resin(4620, 0.36, 41.4e-6, 1.1, "r", temperature={"T": [0], "rho": [1]})
+    with pytest.raises(ValueError, match="E cannot depend"):
+        fiber(233000, 0.2, -0.54e-6, 1.76, "f", temperature={"T": [0], "E": [1]})
+    data = {"E": 4620, "nu": 0.36, "alpha": 41.4e-6, "rho": 1.1, "name": "r"}
+    r = Resin(**data, temperature=table)
+    assert r.temperature.values["E"] == [5500, 4620, 2500]
+    assert r.temperature.at("nu", [0, 50], 0.36) == pytest.approx([0.36, 0.36])
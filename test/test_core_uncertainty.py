@@ -0,0 +1,120 @@
+# file: test_core_uncertainty.py
+#
+# Tests for the Monte Carlo propagation of scatter.
+
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(1, ".")
+from lamprop.core.fiber import fiber
+from lamprop.core.lamina import lamina
+from lamprop.core.laminate import laminate
+from lamprop.core.resin import resin
+from lamprop.core.uncertainty import (
+    LogNormal,
+    Normal,
+    Scatter,
+    Uniform,
+    monte_carlo,
+    tolerance_factor,
+)
+
+hf = fiber(233000, 0.2, -0.54e-6, 1.76, "Hyer's carbon fiber")
+gf = fiber(73000, 0.33, 5.3e-6, 2.60, "E-glass")
+hr = resin(4620, 0.36, 41.4e-6, 1.1, "Hyer's resin")
+angles = [0, 45, -45, 90, 90, -45, 45, 0]
+lam = laminate("quasi", [lamina(hf, hr, 200, a, 0.5) for a in angles])
+scatter = Scatter(
+    fiber={"E1": Normal(cv=0.05)},
+    resin={"E": LogNormal(cv=0.08)},
+    vf=Normal(std=0.02),
+    angle=Uniform(mean=0, std=1),
+)
+
+
+def test_reproducible():
+    """The results depend on the seed, not on the chunk size."""
+    a = monte_carlo(lam, scatter, 500, seed=42)
+    b = monte_carlo(lam, scatter, 500, seed=42, chunk_size=64)
+    c = monte_carlo(lam, scatter, 500, seed=43)
+    for name in a.properties:
+        assert np.array_equal(a.properties[name], b.properties[name])
+    assert not np.array_equal(a.properties["Ex"], c.properties["Ex"])
+
+
+def test_no_scatter():
+    """Without scatter every sample is the nominal laminate."""
+    none = Scatter(fiber={"E1": Normal(std=0)}, angle=Normal(mean=0, std=0))
+    r = monte_carlo(lam, none, 10, seed=1)
+    for name, values in r.properties.items():
+        assert values == pytest.approx(r.nominal[name], rel=1e-12, abs=1e-20)
+
+
+def test_mixed_materials():
+    """Every distinct material and fiber fraction gets its own inputs."""
+    layers = [lamina(hf, hr, 200, 0, 0.5), lamina(gf, hr, 300, 90, 0.45)]
+    mixed = laminate("mixed", layers + layers[::-1])
+    r = monte_carlo(mixed, scatter, 200, seed=0)
+    assert {"Hyer's carbon fiber.E1", "E-glass.E1", "Hyer's resin.E"} <= set(r.inputs)
+    assert {"vf@0.45", "vf@0.5"} <= set(r.inputs)
+    assert len([k for k in r.inputs if k.startswith("angle[")]) == 4
+
+
+def test_material_names():
+    """Equal materials share draws; different ones need different names."""
+    copy = fiber(233000, 0.2, -0.54e-6, 1.76, "Hyer's carbon fiber")
+    layers = [lamina(hf, hr, 200, 0, 0.5), lamina(copy, hr, 200, 90, 0.5)]
+    r = monte_carlo(laminate("copy", layers), scatter, 100, seed=0)
+    assert len([k for k in r.inputs if k.endswith(".E1")]) == 1
+    other = fiber(73000, 0.33, 5.3e-6, 2.60, "Hyer's carbon fiber")
+    layers = [lamina(hf, hr, 200, 0, 0.5), lamina(other, hr, 200, 90, 0.5)]
+    same = laminate("same name", layers)
+    with pytest.raises(ValueError, match="different fibers with the same name"):
+        monte_carlo(same, scatter, 100, seed=0)
+    # Without scatter of the fibers, the names do not matter.
+    monte_carlo(same, Scatter(resin={"E": Normal(cv=0.05)}), 100, seed=0)
+
+
+def test_statistics():
+    """Statistics of the samples and the basis values."""
+    r = monte_carlo(lam, scatter, 4000, seed=7)
+    mean, std = r.mean(), r.std()
+    assert mean["Ex"] == pytest.approx(lam.Ex, rel=0.01)
+    p5, p50, p95 = r.percentiles()["Ex"]
+    assert p5 < p50 < p95
+    b, a = r.b_basis()["Ex"], r.a_basis()["Ex"]
+    assert a < b < mean["Ex"]
+    # For nearly normal samples, B-basis is close to the 10th percentile.
+    assert b == pytest.approx(np.percentile(r.properties["Ex"], 10), rel=0.02)
+    assert b == pytest.approx(
+        mean["Ex"] - tolerance_factor(4000, 0.9, 0.95) * std["Ex"]
+    )
+    names, corr = r.correlation()
+    assert corr.shape == (len(names), len(names))
+    # The fiber modulus dominates the laminate modulus.
+    assert corr[names.index("Ex"), names.index("Hyer's carbon fiber.E1")] > 0.5
+    assert r.correlation(inputs=False)[0] == list(r.properties)
+
+
+def test_tolerance_factor():
+    """The approximation is close to the exact factors."""
+    # Exact one-sided factors from tables of the non-central t distribution.
+    assert tolerance_factor(10, 0.90, 0.95) == pytest.approx(2.355, rel=0.02)
+    assert tolerance_factor(30, 0.90, 0.95) == pytest.approx(1.777, rel=0.02)
+    assert tolerance_factor(10, 0.99, 0.95) == pytest.approx(3.981, rel=0.02)
+    with pytest.raises(ValueError, match="two samples"):
+        tolerance_factor(1, 0.9, 0.95)
+
+
+def test_invalid():
+    """Invalid distributions and arguments are rejected."""
+    with pytest.raises(ValueError, match="unknown fiber fields"):
+        Scatter(fiber={"E2": Normal(cv=0.1)})
+    with pytest.raises(ValueError, match="either std or cv"):
+        Normal(std=1, cv=0.1)
+    with pytest.raises(ValueError, match="volume fractions outside"):
+        monte_carlo(lam, Scatter(vf=Normal(std=0.5)), 100, seed=0)
+    with pytest.raises(ValueError, match="unknown properties"):
+        monte_carlo(lam, scatter, 100, properties=["foo"])
@@ -0,0 +1,92 @@
+# file: test_db.py
+#
+# Tests for the column-wise laminate database.
+
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(1, ".")
+from lamprop.core.cache import cached_lamina
+from lamprop.core.fiber import fiber
+from lamprop.core.laminate import laminate
+from lamprop.core.resin import resin
+from lamprop.core.strength import strength
+from lamprop.io.db import laminate_db, read_db, write_db
+
+hf = fiber(
+    233000,
+    0.2,
+    -0.54e-6,
+    1.76,
+    "Hyer's carbon fiber",
+    strength(1500, 1200, 50, 200, 70),
+)
+gf = fiber(73000, 0.33, 5.3e-6, 2.60, "E-glass")
+hr = resin(4620, 0.36, 41.4e-6, 1.1, "Hyer's resin")
+
+
+def laminates():
+    rv = []
+    for f in (hf, gf):
+        for vf in (0.5, 0.6):
+            for angles in ([0, 0], [0, 90, 90, 0], [45, -45, 0, -45, 45]):
+                layers = [cached_lamina(f, hr, 200, a, vf) for a in angles]
+                rv.append(laminate(f"{f.name}-{vf}-{len(angles)}", layers))
+    return rv
+
+
+def test_tables():
+    """Plies and materials are stored once."""
+    lams = laminates()
+    db = laminate_db(lams)
+    assert len(db) == 12
+    assert len(db.fibers["name"]) == 2
+    assert len(db.resins["name"]) == 1
+    # Angles 0, 90, 45 and -45 for every fiber and vf.
+    assert len(db.plies["angle"]) == 16
+    assert len(db.layers["ply"]) == 2 * 2 * 11
+    assert db.laminates["ABD"].shape == (12, 6, 6)
+    k = db.index(lams[5].name)
+    np.testing.assert_array_equal(
+        db.plies["angle"][db.ply_rows(k)], [la.angle for la in lams[5].layers]
+    )
+    with pytest.raises(KeyError):
+        db.index("missing")
+
+
+@pytest.mark.parametrize("suffix", [".npz", ".parquet"])
+def test_roundtrip(tmp_path, suffix):
+    """A database can be written, read and turned back into laminates."""
+    if suffix == ".parquet":
+        pytest.importorskip("pyarrow")
+    lams = laminates()
+    path = write_db(lams, tmp_path / f"db{suffix}")
+    db = read_db(path)
+    ref = laminate_db(lams)
+    for table in ("laminates", "layers", "plies", "fibers", "resins"):
+        for name, column in getattr(ref, table).items():
+            np.testing.assert_array_equal(getattr(db, table)[name], column)
+    for k, lam in enumerate(lams):
+        new = db.laminate(k)
+        assert new.name == lam.name
+        assert new.Ex == pytest.approx(lam.Ex, rel=1e-12)
+        assert [la.fiber for la in new.layers] == [la.fiber for la in lam.layers]
+
+
+@pytest.mark.parametrize("suffix", [".npz", ".parquet"])
+def test_temperature_tables(tmp_path, suffix):
+    """Temperature tables of fibers and resins are stored too."""
+    if suffix == ".parquet":
+        pytest.importorskip("pyarrow")
+    table = {"T": [-40, 20, 80], "E": [5000, 4620, 3000]}
+    tr = resin(4620, 0.36, 41.4e-6, 1.1, "hot resin", temperature=table)
+    lams = [laminate("hot", [cached_lamina(f, tr, 200, 0, 0.5) for f in (hf, gf)])]
+    db = read_db(write_db(lams, tmp_path / f"db{suffix}"))
+    new = db.laminate(0)
+    assert new.layers[0].resin == tr
+    assert new.layers[0].fiber.temperature is None
+    # Databases without the column have no tables.
+    del db.resins["temperature"]
+    assert db.resin(0).temperature is None
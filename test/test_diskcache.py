@@ -0,0 +1,114 @@
+# file: test_diskcache.py
+#
+# Tests for the persistent result cache.
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(1, ".")
+import lamprop
+from lamprop.cli.console import _map_files
+from lamprop.io import diskcache
+from lamprop.io.diskcache import ResultCache, default_cache_dir
+
+
+def entry(cache, key):
+    """The file that holds the entry for key."""
+    (path,) = cache.directory.glob(f"*/{key}.json")
+    return path
+
+
+def test_default_dir(monkeypatch, tmp_path):
+    """The cache is in XDG_CACHE_HOME, or else in ~/.cache."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert default_cache_dir() == tmp_path / "lamprop"
+    monkeypatch.delenv("XDG_CACHE_HOME")
+    assert default_cache_dir().parts[-2:] == (".cache", "lamprop")
+
+
+def test_key(monkeypatch, tmp_path):
+    """The key depends on the contents of the file and on the options."""
+    cache = ResultCache(tmp_path / "cache")
+    f = tmp_path / "a.yaml"
+    f.write_text("fibers: []\n")
+    key = cache.key(f, eng=True)
+    assert key == cache.key(f, eng=True)
+    assert key != cache.key(f, eng=False)
+    f.write_text("resins: []\n")
+    assert key != cache.key(f, eng=True)
+    assert cache.key(tmp_path / "missing.yaml") is None
+    # A new version of lamprop does not use the old entries.
+    monkeypatch.setattr(diskcache, "__version__", lamprop.__version__ + "+1")
+    diskcache.code_version.cache_clear()
+    assert key != cache.key(f, eng=True)
+    diskcache.code_version.cache_clear()
+
+
+def test_unknown_version(monkeypatch):
+    """Without a version, the sources of lamprop are hashed instead."""
+    monkeypatch.setattr(diskcache, "__version__", "unknown")
+    diskcache.code_version.cache_clear()
+    version = diskcache.code_version()
+    assert version.startswith("source-")
+    assert version == diskcache.code_version()
+    monkeypatch.setattr(diskcache, "__version__", "1.0")
+    diskcache.code_version.cache_clear()
+    assert diskcache.code_version() == "1.0"
+    diskcache.code_version.cache_clear()
+
+
+def test_get_put(tmp_path):
+    """Stored values are returned and counted as hits."""
+    cache = ResultCache(tmp_path)
+    assert cache.get("ab12") is None
+    cache.put("ab12", [["warning"], ["line 1", "line 2"]])
+    assert cache.get("ab12") == [["warning"], ["line 1", "line 2"]]
+    assert (cache.hits, cache.misses) == (1, 1)
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["size"] > 0
+    assert cache.purge() == 1
+    assert cache.get("ab12") is None
+
+
+def test_eviction(tmp_path):
+    """The least recently used entries are removed first."""
+    cache = ResultCache(tmp_path, max_size=250)
+    for k in range(3):
+        cache.put(f"{k:02d}", "x" * 100)
+        os.utime(entry(cache, f"{k:02d}"), (k, k))
+    # The first entry is the least recently used.
+    assert cache.get("00") is None
+    assert cache.get("01") is not None
+    os.utime(entry(cache, "01"), (10, 10))
+    cache.put("03", "x" * 100)
+    assert cache.get("02") is None
+    assert cache.stats()["entries"] == 2
+
+
+def test_failed_write(monkeypatch, tmp_path):
+    """A value that cannot be stored leaves no temporary file behind."""
+    cache = ResultCache(tmp_path)
+
+    def fail(*_args):
+        msg = "disk full"
+        raise OSError(msg)
+
+    monkeypatch.setattr(Path, "replace", fail)
+    cache.put("ab12", ["value"])
+    assert list(tmp_path.rglob("*")) == [tmp_path / "ab"]
+    assert cache.get("ab12") is None
+
+
+def test_cached_output(tmp_path):
+    """Unchanged files give the same output without being processed."""
+    cache = ResultCache(tmp_path)
+    files = ["test/hyer.yaml", "test/unknown.yaml", "test/qi.yaml"]
+    kwargs = {"eng": True, "mat": False, "fea": False}
+    first = list(_map_files(files, 1, cache, **kwargs))
+    assert (cache.hits, cache.misses) == (0, 3)
+    for jobs in (1, 2):
+        assert list(_map_files(files, jobs, cache, **kwargs)) == first
+    assert cache.hits == 6
+    assert first == list(_map_files(files, 1, **kwargs))
@@ -0,0 +1,88 @@
+# file: test_optimize.py
+#
+# Tests for the stacking sequence optimizer.
+
+import sys
+
+import numpy as np
+
+sys.path.insert(1, ".")
+from lamprop.core.fiber import fiber
+from lamprop.core.laminate import laminate
+from lamprop.core.ply import ply_material
+from lamprop.core.resin import resin
+from lamprop.optimize import Goal, StackingProblem, optimize_stacking
+
+hf = fiber(233000, 0.2, -0.54e-6, 1.76, "Hyer's carbon fiber")
+hr = resin(4620, 0.36, 41.4e-6, 1.1, "Hyer's resin")
+pm = ply_material(hf, hr, 100, 0.5)
+
+
+def test_stacks():
+    """Genes are compacted and mirrored for symmetric problems."""
+    p = StackingProblem(
+        material=pm,
+        angles=[0, 45, -45, 90],
+        goals=[Goal(prop="Ex", maximize=True)],
+        max_plies=3,
+        symmetric=True,
+    )
+    stacks = p.stacks(np.array([[1, 4, 3], [4, 4, 0]]))
+    np.testing.assert_array_equal(
+        stacks, [[1, 3, 3, 1, -1, -1], [0, 0, -1, -1, -1, -1]]
+    )
+    cost, values = p.evaluate(np.array([[1, 4, 3]]))
+    ref = pm.laminate("ref", [45, 90, 90, 45])
+    assert np.isclose(values["Ex"][0], ref.Ex)
+    assert np.isclose(cost[0], -ref.Ex)
+
+
+def test_constraints():
+    """Unbalanced and too long runs of plies are penalized."""
+    p = StackingProblem(
+        material=pm,
+        angles=[0, 45, -45, 90],
+        goals=[Goal(prop="Ex", target=1.0, weight=0.0)],
+        max_plies=4,
+        balanced=True,
+        max_contiguous=2,
+        penalty=1.0,
+    )
+    cost, _ = p.evaluate(np.array([[1, 2, 0, 3], [1, 1, 0, 3], [0, 0, 0, 3]]))
+    np.testing.assert_allclose(cost, [0.0, 2.0, 1.0])
+
+
+def test_unmatched_angles():
+    """Angles without a mirror in the set are always unbalanced."""
+    for angles in ([0, -45, 90], [0, 30, 90]):
+        p = StackingProblem(
+            material=pm,
+            angles=angles,
+            goals=[Goal(prop="Ex", target=1.0, weight=0.0)],
+            max_plies=4,
+            balanced=True,
+            penalty=1.0,
+        )
+        cost, _ = p.evaluate(np.array([[1, 0, 2, 3], [1, 1, 0, 3], [0, 2, 3, 3]]))
+        np.testing.assert_allclose(cost, [1.0, 2.0, 0.0])
+
+
+def test_optimize():
+    """Find a laminate close to given targets."""
+    p = StackingProblem(
+        material=pm,
+        angles=[0, 45, -45, 90],
+        goals=[Goal(prop="Ex", target=48000), Goal(prop="Gxy", target=18000)],
+        min_plies=4,
+        max_plies=4,
+        symmetric=True,
+        balanced=True,
+    )
+    r = optimize_stacking(p, population=60, generations=30, seed=3)
+    assert len(r.angles) == 8
+    assert r.cost < 0.01
+    assert r.history[-1] <= r.history[0]
+    lam = laminate("best", [pm.lamina(a) for a in r.angles])
+    assert np.isclose(lam.Ex, r.properties["Ex"])
+    parallel = optimize_stacking(p, population=60, generations=30, seed=3, workers=2)
+    assert parallel.angles == r.angles
@@ -1,7 +1,9 @@
 """Compare output to reference output."""
 
+import csv
+
 from lamprop.io.parser import parse
-from lamprop.io.text import text_output
+from lamprop.io.text import polar_output, text_output
 
 
 def test_text_output():
@@ -12,3 +14,24 @@ def test_text_output():
         outlist += text_output(curlam, eng=True, mat=True, fea=True)
     assert len(outlist) > 0
     # Old reference comparison removed as format changed
+
+
+def test_polar_output():
+    """Test the directional property output."""
+    laminates = parse("test/hyer.yaml")
+    lines = polar_output(laminates[0], 30)
+    assert lines[0] == "laminate,angle,Ex,Ey,Gxy,nu_xy,nu_yx,alpha_x,alpha_y"
+    assert len(lines) == 13
+    assert lines[1].startswith(f"{laminates[0].name},0,")
+    assert len(polar_output(laminates[0], 90, header=False)) == 4
+
+
+def test_polar_output_quoting():
+    """Names with commas or quotes are quoted, so the columns stay aligned."""
+    lam = parse("test/hyer.yaml")[0]
+    name = 'a, "quoted" name'
+    lines = polar_output(lam.model_copy(update={"name": name}), 90)
+    rows = list(csv.reader(lines))
+    assert [len(row) for row in rows] == [9] * 5
+    assert [row[0] for row in rows[1:]] == [name] * 4
+    assert rows[1][1:] == next(csv.reader(polar_output(lam, 90)[1:2]))[1:]
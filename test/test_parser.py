@@ -3,13 +3,22 @@
 # Tests for YAML parser.
 
 import sys
+import types
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
 
 sys.path.insert(1, ".")
 from lamprop.core.fiber import fiber
 from lamprop.core.lamina import lamina
 from lamprop.core.resin import resin
 from lamprop.io.parser import (
+    info,
     parse,
+    parse_file,
+    parse_iter,
+    warn,
 )
 
 
@@ -99,3 +108,120 @@ def test_generic():
     assert len(la.layers) == 4
     assert 0.44 < la.thickness < 0.45
     assert la.Ex > 60000  # Updated assertion
+
+
+MATERIALS = """\
+fibers:
+  - {name: carbon, E1: 240000, nu12: 0.2, alpha1: -0.2e-6, rho: 1.76}
+resins:
+  - {name: epoxy, E: 3000, nu: 0.3, alpha: 60e-6, rho: 1.2}
+"""
+LAMINATES = """\
+laminates:
+  - name: first
+    resin: epoxy
+    layers: [{fiber: carbon, weight: 200, angle: 0}]
+  - name: second
+    resin: epoxy
+    layers: [{fiber: carbon, weight: 200, angle: 90}]
+"""
+
+
+def test_parse_iter():
+    """Test that parse_iter yields the same laminates as parse."""
+    stream = parse_iter("test/hyer.yaml")
+    assert isinstance(stream, types.GeneratorType)
+    laminates = list(stream)
+    messages = list(info)
+    assert [la.name for la in laminates] == [la.name for la in parse("test/hyer.yaml")]
+    assert messages == info
+    assert messages[-1] == f"Found {len(laminates)} laminates"
+
+
+def test_parse_iter_order(tmp_path):
+    """Laminates before the materials are built at the end of the file."""
+    path = tmp_path / "reversed.yaml"
+    path.write_text(LAMINATES + MATERIALS)
+    assert [la.name for la in parse_iter(path)] == ["first", "second"]
+    assert not warn
+
+
+def test_parse_iter_multi_document(tmp_path):
+    """Materials of earlier documents can be used in later ones."""
+    path = tmp_path / "multi.yaml"
+    path.write_text("---\n" + MATERIALS + "---\n" + LAMINATES + "---\n" + LAMINATES)
+    laminates = list(parse_iter(path, multi_document=True))
+    assert [la.name for la in laminates] == ["first", "second"] * 2
+    assert not warn
+    # Without multi_document, a file with several documents is an error.
+    assert not list(parse_iter(path))
+    assert warn
+
+
+@pytest.mark.parametrize("text", ["", "[1, 2]\n", "laminates:\n"])
+def test_parse_iter_empty(tmp_path, text):
+    """Files without laminates yield nothing."""
+    path = tmp_path / "empty.yaml"
+    path.write_text(text)
+    assert list(parse_iter(path)) == []
+    assert info[-1] == "Found 0 laminates"
+
+
+def test_parse_iter_errors(tmp_path):
+    """Laminates before a syntax error are still yielded."""
+    path = tmp_path / "broken.yaml"
+    path.write_text(MATERIALS + LAMINATES + "  - name: [third\n")
+    assert [la.name for la in parse_iter(path)] == ["first", "second"]
+    assert len(warn) == 1
+    assert not list(parse_iter(tmp_path / "missing.yaml"))
+    assert warn[0].startswith("Cannot read")
+
+
+def test_parse_strength(tmp_path):
+    """Strength allowables of a fiber are read from the YAML file."""
+    path = tmp_path / "strength.yaml"
+    fibers = """\
+fibers:
+  - name: carbon
+    E1: 240000
+    nu12: 0.2
+    alpha1: -0.2e-6
+    rho: 1.76
+    strength: {Xt: 2000, Xc: 1200, Yt: 50, Yc: 200, S: 70}
+"""
+    path.write_text(fibers + MATERIALS[MATERIALS.index("resins:") :] + LAMINATES)
+    laminates = list(parse_iter(path))
+    assert not warn
+    s = laminates[0].layers[0].fiber.strength
+    assert (s.Xt, s.Xc, s.Yt, s.Yc, s.S, s.S23) == (2000, 1200, 50, 200, 70, None)
+    # Without strength, the fiber has none.
+    path.write_text(MATERIALS + LAMINATES)
+    assert next(parse_iter(path)).layers[0].fiber.strength is None
+
+
+def test_parse_file():
+    """Test that parse_file keeps the diagnostics with the result."""
+    result = parse_file("test/unknown.yaml")
+    assert result.filename == "test/unknown.yaml"
+    assert result.warn
+    assert result.info[0] == 'Reading file "test/unknown.yaml".'
+    # The module level lists are left alone.
+    parse("test/hyer.yaml")
+    before = (list(info), list(warn))
+    parse_file("test/unknown.yaml")
+    assert (info, warn) == before
+
+
+def test_parse_threads():
+    """Test parsing many files concurrently from threads."""
+    files = sorted(str(p) for p in Path("test").glob("*.yaml")) * 8
+    expected = {f: parse_file(f) for f in set(files)}
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(parse_file, files))
+    for f, result in zip(files, results):
+        ref = expected[f]
+        assert result.filename == f
+        assert result.info == ref.info
+        assert result.warn == ref.warn
+        assert [la.name for la in result.laminates] == [la.name for la in ref.laminates]
+        assert [la.Ex for la in result.laminates] == [la.Ex for la in ref.laminates]
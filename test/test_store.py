@@ -0,0 +1,84 @@
+# file: test_store.py
+#
+# Tests for the memory-mapped laminate store.
+
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(1, ".")
+from lamprop.core.cache import cached_lamina
+from lamprop.core.fiber import fiber
+from lamprop.core.laminate import laminate
+from lamprop.core.resin import resin
+from lamprop.io import store
+from lamprop.io.store import LaminateStore, laminate_key, store_key, write_store
+
+hf = fiber(233000, 0.2, -0.54e-6, 1.76, "Hyer's carbon fiber")
+hr = resin(4620, 0.36, 41.4e-6, 1.1, "Hyer's resin")
+stacks = {"ud": [0, 0], "cp": [0, 90, 90, 0], "qi": [0, 45, -45, 90, 90, -45, 45, 0]}
+
+
+def laminates():
+    return {
+        (name, hf.name, hr.name, vf): laminate(
+            name, [cached_lamina(hf, hr, 200, a, vf) for a in angles]
+        )
+        for name, angles in stacks.items()
+        for vf in (0.5, 0.55, 0.6)
+    }
+
+
+def test_keys():
+    """Keys from tuples, angles and laminates agree."""
+    assert store_key("qi", "a", "b", 0.55000000001) == "qi|a|b|0.5500"
+    lam = laminates()["cp", hf.name, hr.name, 0.5]
+    assert laminate_key(lam) == store_key([0, 90, 90, 0], hf.name, hr.name, 0.5)
+
+
+def test_lookup(tmp_path):
+    """Records hold the laminate properties."""
+    lams = laminates()
+    path = tmp_path / "lam.store"
+    assert write_store(path, lams.items()) == 9
+    with LaminateStore(path) as db:
+        assert len(db) == 9
+        for key, lam in lams.items():
+            rec = db[key]
+            assert rec["Ex"] == lam.Ex
+            np.testing.assert_array_equal(rec["ABD"], lam.ABD)
+            np.testing.assert_array_equal(rec["C"], lam.C)
+        assert ("qi", hf.name, hr.name, 0.7) not in db
+        assert db.get("missing") is None
+        with pytest.raises(KeyError):
+            db["missing"]
+        keys = list(lams)[::-1]
+        recs = db.lookup(keys)
+        np.testing.assert_array_equal(recs["Gxy"], [lams[k].Gxy for k in keys])
+        assert sorted(db.keys()) == sorted(store_key(*k) for k in keys)
+
+
+def test_collisions(tmp_path, monkeypatch):
+    """Keys with the same hash are told apart by the stored key."""
+    monkeypatch.setattr(
+        store, "key_hash", lambda keys: np.zeros(len(list(keys)), dtype=np.uint64)
+    )
+    lams = list(laminates().values())
+    path = tmp_path / "lam.store"
+    write_store(path, lams)
+    db = LaminateStore(path)
+    for lam in lams:
+        assert db[laminate_key(lam)]["Ey"] == lam.Ey
+    assert "missing" not in db
+
+
+def test_invalid(tmp_path):
+    """Duplicate keys and foreign files are rejected."""
+    lam = next(iter(laminates().values()))
+    with pytest.raises(ValueError, match="duplicate keys"):
+        write_store(tmp_path / "x", [lam, lam])
+    other = tmp_path / "other"
+    other.write_bytes(b"not a store" * 10)
+    with pytest.raises(ValueError, match="not a lamprop store"):
+        LaminateStore(other)
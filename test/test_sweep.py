@@ -0,0 +1,94 @@
+# file: test_sweep.py
+#
+# Tests for parametric sweeps.
+
+import io
+import json
+import sys
+
+import pytest
+from pydantic import ValidationError
+
+sys.path.insert(1, ".")
+from lamprop.core.lamina import lamina
+from lamprop.core.laminate import laminate
+from lamprop.sweep import SweepSpec, evaluate_chunk, load_spec, run_sweep
+
+SPEC = """
+fibers:
+  - E1: 233000
+    nu12: 0.2
+    alpha1: -0.54e-6
+    rho: 1.76
+    name: "Hyer's carbon fiber"
+  - E1: 73000
+    nu12: 0.33
+    alpha1: 5.3e-6
+    rho: 2.60
+    name: "E-glass"
+resins:
+  - E: 4620
+    nu: 0.36
+    alpha: 41.4e-6
+    rho: 1.1
+    name: "Hyer's resin"
+stacks:
+  ud: [0, 0]
+  biax45: [45, -45, -45, 45]
+  triax: [0, 45, 90, -45, 0]
+weight: [200, 300]
+vf: {start: 0.5, stop: 0.7, step: 0.1}
+chunk_size: 7
+"""
+
+
+@pytest.fixture
+def spec(tmp_path):
+    path = tmp_path / "sweep.yaml"
+    path.write_text(SPEC)
+    return load_spec(path)
+
+
+def test_spec(spec):
+    """Ranges are expanded; invalid values are rejected."""
+    assert spec.vf == pytest.approx([0.5, 0.6, 0.7])
+    assert len(spec) == 3 * 2 * 1 * 2 * 3
+    data = spec.model_dump()
+    data["vf"] = [0.5, 1.2]
+    with pytest.raises(ValidationError):
+        SweepSpec(**data)
+    data["vf"] = 0.5
+    data["properties"] = ["Ex", "strength"]
+    with pytest.raises(ValidationError):
+        SweepSpec(**data)
+
+
+def test_chunk(spec):
+    """Every record matches a laminate made the ordinary way."""
+    fibers = {f.name: f for f in spec.fibers}
+    resins = {r.name: r for r in spec.resins}
+    records = evaluate_chunk(spec, 5, 30)
+    assert len(records) == 25
+    for rec in records:
+        layers = [
+            lamina(
+                fibers[rec["fiber"]], resins[rec["resin"]], rec["weight"], a, rec["vf"]
+            )
+            for a in spec.stacks[rec["stack"]]
+        ]
+        lam = laminate(rec["name"], layers)
+        for name in spec.properties:
+            assert rec[name] == pytest.approx(getattr(lam, name), rel=1e-10, abs=1e-20)
+
+
+def test_run(spec, tmp_path):
+    """The output is the same for any chunk size and number of workers."""
+    buf = io.StringIO()
+    assert run_sweep(spec, buf, chunk_size=100) == len(spec)
+    lines = buf.getvalue().splitlines()
+    assert [json.loads(ln)["name"] for ln in lines] == [
+        r["name"] for r in evaluate_chunk(spec, 0, len(spec))
+    ]
+    out = tmp_path / "sweep.jsonl"
+    run_sweep(spec, out, workers=2)
+    assert out.read_text() == buf.getvalue()
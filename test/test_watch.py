@@ -0,0 +1,162 @@
+# file: test_watch.py
+#
+# Tests for re-evaluating changed laminates in watch mode.
+
+import os
+import shutil
+import sys
+from pathlib import Path
+
+sys.path.insert(1, ".")
+from lamprop.cli.console import _file_lines
+from lamprop.io.watch import Watcher
+
+
+def edit(path, old, new, count=1):
+    """Replace text in a file and give it a new modification time."""
+    text = path.read_text()
+    assert old in text
+    path.write_text(text.replace(old, new, count))
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def test_first_poll():
+    """The first poll evaluates every file."""
+    files = ["test/hyer.yaml", "test/qi.yaml"]
+    w = Watcher(files)
+    events = w.poll()
+    assert [e.filename for e in events] == files
+    assert events[0].changed[0] == "unidirectional laminate"
+    expected = []
+    for f in files:
+        expected += _file_lines(f, eng=True, mat=False, fea=False)[1]
+    assert w.lines() == expected
+    assert w.poll() == []
+
+
+def test_changed_laminate(tmp_path):
+    """Only the edited laminate is recomputed."""
+    path = tmp_path / "hyer.yaml"
+    shutil.copy("test/hyer.yaml", path)
+    w = Watcher([path])
+    w.poll()
+    edit(path, "vf: 0.5", "vf: 0.55")
+    (event,) = w.poll()
+    assert event.changed == ["unidirectional laminate"]
+    assert event.removed == []
+    assert "** fiber volume fraction: 55%" in event.lines[3]
+    assert w.lines() == _file_lines(str(path), eng=True, mat=False, fea=False)[1]
+    # Saving without changes does nothing.
+    edit(path, "vf: 0.55", "vf: 0.55")
+    assert w.poll() == []
+
+
+def test_added_and_removed(tmp_path):
+    """Removed and added laminates are reported."""
+    path = tmp_path / "hyer.yaml"
+    shutil.copy("test/hyer.yaml", path)
+    w = Watcher([path])
+    w.poll()
+    text = path.read_text()
+    start = text.index("  - name: ", text.index("laminates:"))
+    first = text[start : text.index("  - name: ", start + 1)]
+    edit(path, first, "")
+    (event,) = w.poll()
+    assert event.changed == []
+    assert event.removed == ["unidirectional laminate"]
+    path.write_text(text + first.replace("unidirectional", "other"))
+    (event,) = w.poll()
+    assert event.changed == ["unidirectional laminate", "other laminate"]
+    assert w.lines() == _file_lines(str(path), eng=True, mat=False, fea=False)[1]
+
+
+def test_changed_material(tmp_path):
+    """The laminates that use a changed fiber are recomputed."""
+    path = tmp_path / "hyer.yaml"
+    shutil.copy("test/hyer.yaml", path)
+    w = Watcher([path])
+    w.poll()
+    edit(path, "E1: ", "E1: 1")
+    (event,) = w.poll()
+    assert event.changed
+    assert w.lines() == _file_lines(str(path), eng=True, mat=False, fea=False)[1]
+
+
+def test_broken_file(tmp_path):
+    """A file that cannot be read keeps its previous output."""
+    path = tmp_path / "hyer.yaml"
+    shutil.copy("test/hyer.yaml", path)
+    w = Watcher([path])
+    w.poll()
+    before = w.lines()
+    edit(path, "laminates:", "laminates: [")
+    (event,) = w.poll()
+    assert event.warn[0].startswith("Cannot read")
+    assert w.lines() == before
+    # Undoing the change restores the old file, so nothing changes.
+    edit(path, "laminates: [", "laminates:")
+    assert w.poll() == []
+    assert w.lines() == before
+    path.unlink()
+    (event,) = w.poll()
+    assert event.warn[0].startswith("Cannot read")
+
+
+ANCHORS = """\
+fibers:
+  - {name: carbon, E1: 240000, nu12: 0.2, alpha1: -0.2e-6, rho: 1.76}
+resins:
+  - {name: epoxy, E: 3000, nu: 0.3, alpha: 60e-6, rho: 1.2}
+laminates:
+  - name: first
+    resin: epoxy
+    layers: &plies
+      - {fiber: carbon, weight: 200, angle: 0}
+      - {fiber: carbon, weight: 200, angle: 90}
+  - name: middle
+    resin: epoxy
+    layers: [{fiber: carbon, weight: 300, angle: 0}]
+  - name: second
+    resin: epoxy
+    vf: 0.6
+    layers: *plies
+"""
+
+
+def test_anchors(tmp_path):
+    """Laminates that refer to a changed anchor are recomputed as well."""
+    path = tmp_path / "anchors.yaml"
+    path.write_text(ANCHORS)
+    w = Watcher([path])
+    w.poll()
+    edit(path, "weight: 200, angle: 0", "weight: 200, angle: 45")
+    (event,) = w.poll()
+    assert event.changed == ["first", "second"]
+    assert w.lines() == _file_lines(str(path), eng=True, mat=False, fea=False)[1]
+
+
+def test_anchor_characters(monkeypatch, tmp_path):
+    """Only real anchors and aliases make every change parse the whole file."""
+    path = tmp_path / "hyer.yaml"
+    text = Path("test/hyer.yaml").read_text()
+    text = text.replace("laminates:", "# *Not* an alias & no anchor\nlaminates:")
+    path.write_text(text.replace('"[0/90]s laminate"', '"0 & 90 *laminate*"'))
+    w = Watcher([path])
+    w.poll()
+    calls = []
+    monkeypatch.setattr(Watcher, "_update", lambda *args: calls.append(args))
+    edit(path, "vf: 0.5", "vf: 0.55")
+    (event,) = w.poll()
+    assert event.changed == ["unidirectional laminate"]
+    assert calls == []
+
+
+def test_invalid_definition(tmp_path):
+    """A laminate that is not a mapping gives a warning."""
+    path = tmp_path / "hyer.yaml"
+    text = Path("test/hyer.yaml").read_text()
+    path.write_text(text.replace("laminates:\n", "laminates:\n  - just text\n"))
+    (event,) = Watcher([path]).poll()
+    assert "Laminate definition is not a mapping" in event.warn
+    assert "unidirectional laminate" in event.changed
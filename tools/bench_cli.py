@@ -0,0 +1,55 @@
+"""Measure the speedup of processing many files with several jobs."""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, "src")
+sys.path.insert(0, "tools")
+
+from bench_parse import write_file
+
+from lamprop.cli.console import _map_files
+
+
+def run(files, jobs):
+    """Return the time to produce the FEA output of the files."""
+    start = time.perf_counter()
+    for _ in _map_files(files, jobs, eng=False, mat=False, fea=True, lazy=True):
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    """Process generated files with 1, 2, 4, ... jobs."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="?", type=int, default=64)
+    parser.add_argument("laminates", nargs="?", type=int, default=200)
+    parser.add_argument("--max-jobs", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    jobs = [1]
+    while jobs[-1] * 2 <= args.max_jobs:
+        jobs.append(jobs[-1] * 2)
+    if jobs[-1] != args.max_jobs:
+        jobs.append(args.max_jobs)
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for k in range(args.files):
+            path = Path(tmp) / f"file{k}.yaml"
+            write_file(path, args.laminates)
+            files.append(str(path))
+        print(f"{args.files} files of {args.laminates} laminates")
+        print(f"{os.cpu_count()} CPUs")
+        print("  jobs   time [s]   speedup")
+        base = None
+        for n in jobs:
+            t = run(files, n)
+            base = base or t
+            print(f"  {n:4d} {t:10.2f} {base / t:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Compare validated construction of Lamina and Laminate models with model_construct."""
+
+import sys
+import timeit
+
+sys.path.insert(0, "src")
+
+from lamprop.core.lamina import Lamina, lamina
+from lamprop.core.laminate import Laminate, laminate
+from lamprop.generic import fibers, resins
+
+
+def main():
+    """Time the creation of models from already computed values."""
+    fb, rs = fibers[1][1], resins[0][1]
+    layers = [lamina(fb, rs, 200, a, 0.5) for a in (0, 45, -45, 90)]
+    lam = laminate("bench", layers)
+    n = 20000
+    print("model      validated [µs]  model_construct [µs]")
+    for model, obj in ((Lamina, layers[1]), (Laminate, lam)):
+        values = dict(obj)
+        tv = timeit.timeit(lambda m=model, v=values: m(**v), number=n)
+        tm = timeit.timeit(lambda m=model, v=values: m.model_construct(**v), number=n)
+        print(f"{model.__name__:10} {tv / n * 1e6:14.2f} {tm / n * 1e6:21.2f}")
+    tl = timeit.timeit(lambda: lamina(fb, rs, 200, 30, 0.5), number=n)
+    print(f"lamina() in total: {tl / n * 1e6:.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
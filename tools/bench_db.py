@@ -0,0 +1,91 @@
+"""Compare writing and reading a laminate database as JSON, NPZ and Parquet."""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, "src")
+
+from lamprop.core.cache import cached_lamina
+from lamprop.core.laminate import laminate
+from lamprop.generic import fibers, resins
+from lamprop.io.db import laminate_db, read_db, write_db
+
+
+def make_laminates(count):
+    """Create count laminates from the generic fibers and resins."""
+    stacks = ([0, 0], [0, 90, 90, 0], [45, -45, -45, 45], [0, 45, 90, -45, 0])
+    rv = []
+    k = 0
+    while len(rv) < count:
+        fb = fibers[k % len(fibers)][1]
+        rs = resins[(k // len(fibers)) % len(resins)][1]
+        vf = 0.40 + 0.01 * ((k // 7) % 40)
+        angles = stacks[k % len(stacks)]
+        layers = [cached_lamina(fb, rs, 200, a, vf) for a in angles]
+        rv.append(laminate(f"lam{k}", layers))
+        k += 1
+    return rv
+
+
+def todict(lam):
+    """Convert a laminate to a dict, the way the example script does."""
+    sub = dict(vars(lam))
+    for name in ("ABD", "abd", "H", "h", "Nt", "C", "S"):
+        sub[name] = getattr(lam, name).tolist()
+    sub["layers"] = [
+        {
+            **vars(la),
+            "C": la.C.tolist(),
+            "fiber": vars(la.fiber),
+            "resin": vars(la.resin),
+        }
+        for la in lam.layers
+    ]
+    return sub
+
+
+def timed(func, *args):
+    """Return the result and run time of func."""
+    start = time.perf_counter()
+    rv = func(*args)
+    return rv, time.perf_counter() - start
+
+
+def main():
+    """Time writing and reading the database in every format."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("count", nargs="?", type=int, default=20000)
+    args = parser.parse_args()
+    lams = make_laminates(args.count)
+    print(f"{args.count} laminates")
+    print("  format     write [s]   read [s]   size [MB]")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        path = tmp / "db.json"
+        _, tw = timed(
+            lambda: path.write_text(
+                json.dumps({lam.name: todict(lam) for lam in lams}, indent=4)
+            )
+        )
+        _, tr = timed(lambda: json.loads(path.read_text()))
+        print(f"  json {tw:15.3f} {tr:10.3f} {path.stat().st_size / 1e6:11.1f}")
+        db, tb = timed(laminate_db, lams)
+        print(f"  (building the tables: {tb:.3f} s)")
+        for suffix in (".npz", ".parquet"):
+            try:
+                out, tw = timed(write_db, db, tmp / f"db{suffix}")
+            except ImportError:
+                print(f"  {suffix[1:]:8s} skipped, pyarrow is not installed")
+                continue
+            _, tr = timed(read_db, out)
+            files = [out] if out.is_file() else list(out.iterdir())
+            size = sum(f.stat().st_size for f in files)
+            print(f"  {suffix[1:]:8s} {tw:10.3f} {tr:10.3f} {size / 1e6:11.1f}")
+
+
+if __name__ == "__main__":
+    main()
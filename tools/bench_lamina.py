@@ -0,0 +1,38 @@
+"""Compare the speed of lamina() and lamina_batch()."""
+
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, "src")
+
+from lamprop.core.batch import lamina_batch
+from lamprop.core.lamina import lamina
+from lamprop.generic import fibers, resins
+
+
+def main():
+    """Time the creation of N laminae with both methods."""
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = np.random.default_rng(2025)
+    fl = [fibers[k][1] for k in rng.integers(0, len(fibers), n)]
+    rl = [resins[k][1] for k in rng.integers(0, len(resins), n)]
+    weights = rng.uniform(50, 600, n)
+    angles = rng.choice([-45, 0, 45, 90], n)
+    vfs = rng.uniform(0.3, 0.65, n)
+    start = time.perf_counter()
+    batch = lamina_batch(fl, rl, weights, angles, vfs)
+    tbatch = time.perf_counter() - start
+    start = time.perf_counter()
+    single = [lamina(*args) for args in zip(fl, rl, weights, angles, vfs)]
+    tsingle = time.perf_counter() - start
+    err = np.max(np.abs(batch.E2 - [la.E2 for la in single]) / batch.E2)
+    print(f"{n} laminae")
+    print(f"lamina():       {tsingle:.3f} s")
+    print(f"lamina_batch(): {tbatch:.3f} s ({tsingle / tbatch:.1f} times faster)")
+    print(f"max. relative difference in E2: {err:.2g}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Time laminate() for an increasing number of plies."""
+
+import sys
+import time
+
+sys.path.insert(0, "src")
+
+from lamprop.core.lamina import lamina
+from lamprop.core.laminate import laminate
+from lamprop.generic import fibers, resins
+
+
+def main():
+    """Time laminate() at 10, 100, 1000 and 10000 plies."""
+    fb, rs = fibers[1][1], resins[0][1]
+    angles = (0, 45, 90, -45)
+    plies = [lamina(fb, rs, 200, a, 0.5) for a in angles]
+    print("  plies   time [ms]   per ply [µs]")
+    for n in (10, 100, 1000, 10000):
+        layers = [plies[k % len(plies)] for k in range(n)]
+        repeat = max(1, 1000 // n)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            laminate("bench", layers)
+        dt = (time.perf_counter() - start) / repeat
+        print(f"{n:7d} {dt * 1e3:11.3f} {dt / n * 1e6:14.3f}")
+
+
+if __name__ == "__main__":
+    main()
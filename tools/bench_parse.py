@@ -0,0 +1,82 @@
+"""Compare the time and peak memory of parse and parse_iter on a large file."""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, "src")
+
+from lamprop.io.parser import parse, parse_iter
+
+HEADER = """\
+fibers:
+  - {name: carbon, E1: 240000, nu12: 0.2, alpha1: -0.2e-6, rho: 1.76}
+  - {name: glass, E1: 73000, nu12: 0.33, alpha1: 5.3e-6, rho: 2.60}
+resins:
+  - {name: epoxy, E: 3000, nu: 0.3, alpha: 60e-6, rho: 1.2}
+laminates:
+"""
+
+LAMINATE = """\
+  - name: lam{k}
+    resin: epoxy
+    vf: {vf:.2f}
+    symmetric: true
+    layers:
+      - {{fiber: {fiber}, weight: 200, angle: 0}}
+      - {{fiber: {fiber}, weight: 300, angle: 45}}
+      - {{fiber: {fiber}, weight: 300, angle: -45}}
+      - {{fiber: {fiber}, weight: 200, angle: 90}}
+"""
+
+
+def write_file(path, count):
+    """Write a lamprop file with count laminates."""
+    with Path(path).open("w", encoding="utf-8") as f:
+        f.write(HEADER)
+        for k in range(count):
+            fiber = "carbon" if k % 2 else "glass"
+            f.write(LAMINATE.format(k=k, vf=0.4 + 0.01 * (k % 30), fiber=fiber))
+
+
+def measure(func):
+    """Return the run time and the peak of the traced memory of func.
+
+    Tracing slows Python down a lot, so the time is measured separately.
+    """
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    """Parse a generated file as a list and as a stream."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("count", nargs="?", type=int, default=10000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "big.yaml"
+        write_file(path, args.count)
+        print(f"{args.count} laminates, {path.stat().st_size / 1e6:.1f} MB")
+        print("  method       time [s]   peak [MB]")
+        t, peak = measure(lambda: parse(path))
+        print(f"  parse      {t:10.2f} {peak / 1e6:11.1f}")
+
+        def stream():
+            for _ in parse_iter(path):
+                pass
+
+        t, peak = measure(stream)
+        print(f"  parse_iter {t:10.2f} {peak / 1e6:11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Measure the time watch mode needs to update a file after one edit."""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, "src")
+sys.path.insert(0, "tools")
+
+from bench_parse import write_file
+
+from lamprop.io.watch import Watcher
+
+
+def main():
+    """Edit one laminate in generated files of increasing size."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("counts", nargs="*", type=int, default=[200, 2000, 10000])
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "big.yaml"
+        print("  laminates   first [s]   edit [s]")
+        for count in args.counts:
+            write_file(path, count)
+            watcher = Watcher([path])
+            start = time.perf_counter()
+            watcher.poll()
+            first = time.perf_counter() - start
+            text = path.read_text().replace("name: lam7\n", "name: lam7a\n")
+            path.write_text(text)
+            st = path.stat()
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            start = time.perf_counter()
+            watcher.poll()
+            edit = time.perf_counter() - start
+            print(f"  {count:9d} {first:11.2f} {edit:10.3f}")
+
+
+if __name__ == "__main__":
+    main()